@@ -0,0 +1,44 @@
+"""
+The cache backend, picked with ``CACHE_URL`` in settings.py.
+
+Left unset, each process gets its own LocMemCache. That is fine for a
+single process, but the film search generation counter (see
+storylovers/search_cache.py) then lives in each process separately: a
+``bump_generation()`` from ``import_films``, a worker or another web
+process never reaches the others, which keep serving old autocomplete
+results. Any deployment with more than one process must point every
+process at the same shared cache:
+
+- ``redis://host:6379/0`` (or ``rediss://``) uses Django's RedisCache,
+  which needs the ``redis`` package
+- ``memcached://host:11211`` uses PyMemcacheCache, which needs ``pymemcache``
+- ``file:///var/tmp/cinevous-cache`` uses FileBasedCache, shared by the
+  processes of one host
+"""
+from urllib.parse import urlsplit
+
+
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+
+def cache_config(url):
+    """The ``CACHES['default']`` entry for ``url``, or a per-process LocMemCache if it is empty."""
+    if not url:
+        return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    parts = urlsplit(url)
+    try:
+        backend = CACHE_BACKENDS[parts.scheme]
+    except KeyError:
+        raise ValueError(f"Unknown CACHE_URL scheme {parts.scheme!r}; expected one of {sorted(CACHE_BACKENDS)}")
+    if parts.scheme == 'file':
+        location = parts.path
+    elif parts.scheme == 'memcached':
+        location = parts.netloc
+    else:
+        location = url
+    return {'BACKEND': backend, 'LOCATION': location}
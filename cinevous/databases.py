@@ -0,0 +1,97 @@
+"""
+Database profiles, picked with ``DB_PROFILE`` in settings.py.
+
+``sqlite`` (the default) runs every new connection through a set of
+PRAGMAs: WAL journaling so readers are not blocked by a writer,
+``synchronous=NORMAL`` (safe under WAL), a memory-mapped read window, a
+busy timeout instead of an immediate "database is locked", and
+``BEGIN IMMEDIATE`` transactions so a writer takes the lock up front
+rather than failing when it upgrades mid-transaction.
+
+``postgres`` reads its connection details from the environment and uses
+psycopg's connection pool, or, with ``DB_POOL=0``, persistent connections
+with health checks. Django does not allow both at once.
+
+Read replicas are listed in ``DB_REPLICAS`` (comma-separated SQLite
+paths, or Postgres hosts) and become ``replica_1``, ``replica_2``, ...;
+see cinevous/routers.py for how queries are sent to them.
+
+``python manage.py benchmark_db`` compares read/write throughput under
+concurrent writers for whichever profile is active.
+"""
+import os
+
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,  # negative means KiB, so 64MB
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_init_command(pragmas=None):
+    """The ``init_command`` Django runs on every new SQLite connection."""
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    return ' '.join(f'PRAGMA {name}={value};' for name, value in pragmas.items())
+
+
+def sqlite_database(path, env=os.environ):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.get('SQLITE_PATH', path),
+        'OPTIONS': {
+            'init_command': sqlite_init_command(),
+            'transaction_mode': 'IMMEDIATE',
+            # Seconds the sqlite3 module waits on a locked database; matches busy_timeout
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        },
+    }
+
+
+def postgres_database(env=os.environ):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('POSTGRES_DB', 'cinevous'),
+        'USER': env.get('POSTGRES_USER', 'cinevous'),
+        'PASSWORD': env.get('POSTGRES_PASSWORD', ''),
+        'HOST': env.get('POSTGRES_HOST', 'localhost'),
+        'PORT': env.get('POSTGRES_PORT', '5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if env.get('DB_POOL', '1') != '0':
+        # The pool owns connection reuse, so CONN_MAX_AGE must stay 0
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': int(env.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(env.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(env.get('DB_POOL_TIMEOUT', 10)),
+        }
+    else:
+        database['CONN_MAX_AGE'] = int(env.get('CONN_MAX_AGE', 600))
+    return database
+
+
+def database_profile(profile, sqlite_path, env=os.environ):
+    if profile == 'sqlite':
+        return sqlite_database(sqlite_path, env)
+    if profile == 'postgres':
+        return postgres_database(env)
+    raise ValueError(f"Unknown DB_PROFILE {profile!r}; use 'sqlite' or 'postgres'")
+
+
+def replica_databases(profile, env=os.environ):
+    """Settings for each replica listed in ``DB_REPLICAS``, keyed by alias."""
+    replicas = {}
+    for number, location in enumerate(filter(None, env.get('DB_REPLICAS', '').split(',')), start=1):
+        if profile == 'sqlite':
+            database = sqlite_database(location.strip(), {})
+        else:
+            database = postgres_database({**env, 'POSTGRES_HOST': location.strip()})
+        # Tests see the primary's test database through every replica
+        database['TEST'] = {'MIRROR': 'default'}
+        replicas[f'replica_{number}'] = database
+    return replicas
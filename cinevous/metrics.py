@@ -0,0 +1,199 @@
+"""
+Opt-in per-view request metrics.
+
+RequestMetricsMiddleware times every request, counts its SQL queries and
+their total duration, measures JSON encoding time and response size, and
+reports them in a ``Server-Timing`` header. The same numbers are folded
+into in-process histograms that ``metrics_view`` serves to staff in the
+Prometheus text format. Enable with ``REQUEST_METRICS=1``.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django import http
+from django.contrib.auth.decorators import user_passes_test
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    'request_duration_seconds': ("Total time spent handling the request.", DURATION_BUCKETS),
+    'db_queries': ("SQL queries executed per request.", QUERY_BUCKETS),
+    'db_duration_seconds': ("Time spent executing SQL per request.", DURATION_BUCKETS),
+    'serialization_seconds': ("Time spent encoding JSON per request.", DURATION_BUCKETS),
+    'response_size_bytes': ("Size of the response body.", SIZE_BUCKETS),
+}
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper() for the request.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Histograms keyed by (metric, view, method), shared by every thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, view, method, values):
+        with self.lock:
+            for metric, value in values.items():
+                key = (metric, view, method)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(METRICS[metric][1])
+                histogram.observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for metric, (help_text, buckets) in METRICS.items():
+                name = f'cinevous_{metric}'
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (key_metric, view, method), histogram in sorted(self.histograms.items()):
+                    if key_metric != metric:
+                        continue
+                    labels = f'view="{view}",method="{method}"'
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class TimedJSONEncoder(DjangoJSONEncoder):
+    """Adds its encoding time to the current request's stats, if any."""
+
+    def encode(self, o):
+        start = time.perf_counter()
+        try:
+            return super().encode(o)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.serialization_time += time.perf_counter() - start
+
+
+class JsonResponse(http.JsonResponse):
+    """JsonResponse whose encoding time is reported by RequestMetricsMiddleware."""
+
+    def __init__(self, data, encoder=TimedJSONEncoder, **kwargs):
+        super().__init__(data, encoder=encoder, **kwargs)
+
+
+class RequestMetricsMiddleware:
+    # Both modes, so async views under ASYNC_API stay on the event loop
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with self.wrap_connections(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        # Connections belong to the thread that runs the request's ORM
+        # calls, the one sync_to_async uses, so wrap them from there
+        wrappers = await sync_to_async(self.wrap_connections)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    @staticmethod
+    def wrap_connections(stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def finish(self, request, response, stats, start):
+        total = time.perf_counter() - start
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+            f'serialize;dur={stats.serialization_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        values = {
+            'request_duration_seconds': total,
+            'db_queries': stats.queries,
+            'db_duration_seconds': stats.db_time,
+            'serialization_seconds': stats.serialization_time,
+        }
+        if not response.streaming:
+            values['response_size_bytes'] = len(response.content)
+        registry.observe(view, request.method, values)
+        return response
+
+
+@user_passes_test(lambda user: user.is_staff)
+def metrics_view(request):
+    return http.HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
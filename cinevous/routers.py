@@ -0,0 +1,99 @@
+"""
+Primary/replica database routing.
+
+PrimaryReplicaRouter sends reads made while handling a safe (GET/HEAD)
+request to one of ``DATABASE_REPLICAS``; everything else goes to
+``default``. Once a request writes, its remaining reads stay on the
+primary, and ReplicaPinMiddleware sets a short-lived cookie so the same
+client's next few requests do too, covering replication lag after e.g.
+logging a film and reloading the diary. Reads outside a request
+(management commands, import workers, signals in threads) always use the
+primary. Enabled in settings.py when replicas are configured.
+"""
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+
+
+PIN_COOKIE = 'primary_pin'
+
+_request_state = contextvars.ContextVar('replica_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state.use_replica or not replicas():
+            return 'default'
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            # Read-after-write in the same request must see the write
+            state.wrote = True
+            state.use_replica = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaPinMiddleware:
+    # Both modes, so async views under ASYNC_API stay on the event loop
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        # The routing state is a contextvar, so the ORM calls an async view
+        # makes through sync_to_async see it too
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self.finish(state, response)
+
+    def start(self, request):
+        use_replica = request.method in ('GET', 'HEAD', 'OPTIONS') and PIN_COOKIE not in request.COOKIES
+        state = RoutingState(use_replica)
+        return state, _request_state.set(state)
+
+    def finish(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
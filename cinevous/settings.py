@@ -14,6 +14,9 @@ import os
 from dotenv import load_dotenv
 from pathlib import Path
 
+from cinevous.caches import cache_config
+from cinevous.databases import database_profile, replica_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 DIST_DIR = BASE_DIR / 'dist'
@@ -58,6 +61,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in per-view query count/latency metrics, served to staff at /metrics/
+if os.getenv('REQUEST_METRICS'):
+    MIDDLEWARE.insert(0, 'cinevous.metrics.RequestMetricsMiddleware')
+
 ROOT_URLCONF = 'cinevous.urls'
 
 # Vite settings
@@ -90,15 +97,42 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'cinevous.wsgi.application'
 
+ASGI_APPLICATION = 'cinevous.asgi.application'
+
+# Serve the diary and search endpoints with async views, for running under
+# an ASGI server: ASYNC_API=1 uvicorn cinevous.asgi:application --workers 4
+ASYNC_API = bool(os.getenv('ASYNC_API'))
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# DB_PROFILE=sqlite (WAL-tuned, the default) or postgres (pooled); see
+# cinevous/databases.py for the environment variables each one reads.
+DB_PROFILE = os.getenv('DB_PROFILE', 'sqlite')
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_profile(DB_PROFILE, BASE_DIR / 'db.sqlite3'),
+    **replica_databases(DB_PROFILE),
+}
+
+# Safe requests read from DB_REPLICAS; writes, and reads after a write,
+# stay on the primary (cinevous/routers.py).
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['cinevous.routers.PrimaryReplicaRouter']
+    MIDDLEWARE.insert(0, 'cinevous.routers.ReplicaPinMiddleware')
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# CACHE_URL=redis://..., memcached://... or file:///... (see
+# cinevous/caches.py). Unset means a per-process LocMemCache: film search
+# invalidation then only reaches the process that saved the film, so any
+# deployment with several processes needs a shared cache here.
+CACHES = {
+    'default': cache_config(os.getenv('CACHE_URL')),
 }
 
 
@@ -143,6 +177,8 @@ STATICFILES_DIRS = [
     BASE_DIR / 'dist',
 ]
 
+MEDIA_ROOT = BASE_DIR / 'media'
+
 LOGIN_URL = '/login/'
 
 LOGIN_REDIRECT_URL = '/app/'
@@ -152,3 +188,8 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
 
+
+# Diary imports: 'thread' runs them on an in-process pool, 'command' leaves
+# them for `python manage.py run_import_jobs`.
+DIARY_IMPORT_EXECUTOR = os.getenv('DIARY_IMPORT_EXECUTOR', 'thread')
+DIARY_IMPORT_WORKERS = 2
@@ -14,10 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from . import views
-from storylovers.views import FilmLogView, FilmView
+from .metrics import metrics_view
+from storylovers.views import (
+    DraftPickView, DraftView, FilmListEntryView, FilmListView, FilmLogView, FilmView, ImportJobView,
+    LeaderboardView, LeagueView, QuestView, RecommendationView, RubricRatingView, RubricView, StatsView,
+    TrendingView,
+)
+from storylovers.async_views import AsyncDraftEventsView
+
+if settings.ASYNC_API:
+    # Event-loop native diary and search endpoints for uvicorn/daphne
+    from storylovers.async_views import AsyncFilmLogView as FilmLogView, AsyncFilmView as FilmView
 
 urlpatterns = [
     path('', views.index, name='index'),
@@ -25,6 +36,26 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('app/', views.AppProtectedView.as_view(), name='app'),
     path('api/filmlogs/', FilmLogView.as_view(), name='film_log_api'),
+    path('api/filmlogs/<uuid:film_log_id>/', FilmLogView.as_view(), name='film_log_detail_api'),
+    path('api/filmlogs/<uuid:film_log_id>/ratings/', RubricRatingView.as_view(), name='rubric_rating_api'),
     path('api/films/', FilmView.as_view(), name='film_api'),
+    path('api/films/trending/', TrendingView.as_view(), name='trending_api'),
+    path('api/recommendations/', RecommendationView.as_view(), name='recommendation_api'),
+    path('api/stats/', StatsView.as_view(), name='stats_api'),
+    path('api/quests/', QuestView.as_view(), name='quest_api'),
+    path('api/imports/', ImportJobView.as_view(), name='import_api'),
+    path('api/imports/<uuid:job_id>/', ImportJobView.as_view(), name='import_job_api'),
+    path('api/rubrics/', RubricView.as_view(), name='rubric_api'),
+    path('api/rubrics/<int:rubric_id>/', RubricView.as_view(), name='rubric_detail_api'),
+    path('api/lists/', FilmListView.as_view(), name='film_list_api'),
+    path('api/lists/<int:list_id>/', FilmListView.as_view(), name='film_list_detail_api'),
+    path('api/lists/<int:list_id>/entries/', FilmListEntryView.as_view(), name='film_list_entry_api'),
+    path('api/lists/<int:list_id>/entries/<int:entry_id>/', FilmListEntryView.as_view(), name='film_list_entry_detail_api'),
+    path('api/leagues/', LeagueView.as_view(), name='league_api'),
+    path('api/leagues/<int:league_id>/leaderboard/', LeaderboardView.as_view(), name='leaderboard_api'),
+    path('api/leagues/<int:league_id>/draft/', DraftView.as_view(), name='draft_api'),
+    path('api/leagues/<int:league_id>/draft/picks/', DraftPickView.as_view(), name='draft_pick_api'),
+    path('api/leagues/<int:league_id>/draft/events/', AsyncDraftEventsView.as_view(), name='draft_events_api'),
+    path('metrics/', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
 ]
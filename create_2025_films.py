@@ -1,6 +1,9 @@
 """
 Script to create 20 new 2025 films in the database
 Run this script with: python manage.py shell < create_2025_films.py
+
+For real catalogs (CSV or TMDB JSONL exports) use the batched importer:
+python manage.py import_films <path> [--batch-size N]
 """
 
 from storylovers.models import Film
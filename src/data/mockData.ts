@@ -98,14 +98,14 @@ export const mockLists: List[] = [
     id: 1,
     title: "Best of 2023",
     description: "My favorite films from last year",
-    films: [1, 3],
+    filmCount: 2,
     createdAt: new Date(2024, 0, 15)
   },
   {
     id: 2,
     title: "Late Night Comfort Watches",
     description: "Films that feel like a warm blanket",
-    films: [4, 6],
+    filmCount: 2,
     createdAt: new Date(2024, 2, 8)
   }
 ]
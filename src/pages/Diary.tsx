@@ -3,6 +3,25 @@ import { mockRubrics } from '../data/mockData'
 import type { Film, Rubric } from '../types'
 import FilmLogModal from '../components/FilmLogModal'
 
+const DIARY_PAGE_SIZE = 50
+
+// Transform API data to match our Film type
+const toFilm = (filmLog: any): Film => ({
+  id: filmLog.id,
+  title: filmLog.film?.title || filmLog.title,
+  director: filmLog.film?.director || filmLog.director,
+  year: filmLog.film?.year || filmLog.year,
+  genre: filmLog.film?.genre || filmLog.genre,
+  country: filmLog.film?.country || filmLog.country,
+  decade: filmLog.film?.decade || filmLog.decade,
+  mood: filmLog.mood,
+  isNewDirector: filmLog.is_new_director,
+  rating: filmLog.rating,
+  review: filmLog.review,
+  loggedAt: new Date(filmLog.watched_at || filmLog.created_at),
+  rubricRatings: filmLog.rubric_ratings || {}
+})
+
 function Diary() {
   const [films, setFilms] = useState<Film[]>([])
   const [rubrics] = useState<Rubric[]>(mockRubrics)
@@ -10,54 +29,63 @@ function Diary() {
   const [editingFilm, setEditingFilm] = useState<Film | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   // Fetch film logs on component mount
   useEffect(() => {
     fetchFilmLogs()
   }, [])
 
-  const fetchFilmLogs = async () => {
-    try {
-      setLoading(true)
-      const response = await fetch('/api/filmlogs/', {
-        method: 'GET',
-        credentials: 'include', // Include auth cookies
-      })
+  // One page of the cursor-paginated diary, newest first
+  const fetchFilmLogPage = async (cursor: string | null) => {
+    const params = new URLSearchParams({ limit: String(DIARY_PAGE_SIZE) })
+    if (cursor) params.set('cursor', cursor)
+    const response = await fetch(`/api/filmlogs/?${params}`, {
+      method: 'GET',
+      credentials: 'include', // Include auth cookies
+    })
 
-      if (!response.ok) {
-        throw new Error('Failed to fetch film logs')
-      }
+    if (!response.ok) {
+      throw new Error('Failed to fetch film logs')
+    }
 
-      const data = await response.json()
-      
-      // Transform API data to match our Film type
-      const transformedFilms: Film[] = data.film_logs.map((filmLog: any) => ({
-        id: filmLog.id,
-        title: filmLog.film?.title || filmLog.title,
-        director: filmLog.film?.director || filmLog.director,
-        year: filmLog.film?.year || filmLog.year,
-        genre: filmLog.film?.genre || filmLog.genre,
-        country: filmLog.film?.country || filmLog.country,
-        decade: filmLog.film?.decade || filmLog.decade,
-        mood: filmLog.mood,
-        isNewDirector: filmLog.is_new_director,
-        rating: filmLog.rating,
-        review: filmLog.review,
-        loggedAt: new Date(filmLog.watched_at || filmLog.created_at),
-        rubricRatings: filmLog.rubric_ratings || {}
-      }))
+    const data = await response.json()
+    return { films: data.film_logs.map(toFilm), nextCursor: data.next_cursor as string | null }
+  }
 
-      setFilms(transformedFilms)
+  // Render the first page right away; older logs load on demand
+  const fetchFilmLogs = async () => {
+    try {
+      setLoading(true)
+      const page = await fetchFilmLogPage(null)
+      setFilms(page.films)
+      setNextCursor(page.nextCursor)
       setError(null)
     } catch (err) {
       console.error('Error fetching film logs:', err)
       setError('Failed to load film logs')
       setFilms([]) // Set empty array on error
+      setNextCursor(null)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    try {
+      setLoadingMore(true)
+      const page = await fetchFilmLogPage(nextCursor)
+      setFilms(current => [...current, ...page.films])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      console.error('Error fetching film logs:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const getStats = () => {
     const countries = new Set(films.map(f => f.country.split('/').map(c => c.trim())).flat())
     
@@ -465,6 +493,13 @@ function Diary() {
             </div>
           </div>
         ))}
+        {nextCursor && (
+          <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+            <button className="btn btn-secondary" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
         </div>
       )}
 
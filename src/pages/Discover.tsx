@@ -1,7 +1,41 @@
-import { useState } from 'react'
+import { useState, useEffect } from 'react'
+import type { RecommendedFilm, TrendingFilm } from '../types'
 
 function Discover() {
   const [searchQuery, setSearchQuery] = useState('')
+  const [popular, setPopular] = useState<TrendingFilm[]>([])
+  const [recommended, setRecommended] = useState<RecommendedFilm[]>([])
+
+  useEffect(() => {
+    fetchPopular()
+    fetchRecommended()
+  }, [])
+
+  const fetchPopular = async () => {
+    try {
+      const response = await fetch('/api/films/trending/?limit=6', { credentials: 'include' })
+      if (!response.ok) {
+        throw new Error('Failed to fetch trending films')
+      }
+      const data = await response.json()
+      setPopular(data.films)
+    } catch (err) {
+      console.error('Error fetching trending films:', err)
+    }
+  }
+
+  const fetchRecommended = async () => {
+    try {
+      const response = await fetch('/api/recommendations/?limit=4', { credentials: 'include' })
+      if (!response.ok) {
+        throw new Error('Failed to fetch recommendations')
+      }
+      const data = await response.json()
+      setRecommended(data.films)
+    } catch (err) {
+      console.error('Error fetching recommendations:', err)
+    }
+  }
 
   return (
     <div className="discover-page">
@@ -31,8 +65,8 @@ function Discover() {
       <section className="card">
         <h2>Popular This Week</h2>
         <div className="card-grid" style={{ marginTop: '1rem' }}>
-          {[1, 2, 3, 4, 5, 6].map(i => (
-            <div key={i} className="movie-card">
+          {popular.map(film => (
+            <div key={film.id} className="movie-card">
               <div 
                 style={{ 
                   backgroundColor: '#333', 
@@ -41,8 +75,12 @@ function Discover() {
                   marginBottom: '0.5rem'
                 }}
               ></div>
-              <h3 style={{ fontSize: '1rem' }}>Film Title {i}</h3>
-              <p style={{ color: '#888', fontSize: '0.9rem' }}>2024</p>
+              <h3 style={{ fontSize: '1rem' }}>{film.title}</h3>
+              <p style={{ color: '#888', fontSize: '0.9rem' }}>
+                {film.year}
+                {film.avg_rating !== null && ` · ★ ${film.avg_rating}`}
+                {` · ${film.log_count} logs`}
+              </p>
             </div>
           ))}
         </div>
@@ -54,8 +92,8 @@ function Discover() {
           Based on your viewing history and ratings
         </p>
         <div className="card-grid" style={{ marginTop: '1rem' }}>
-          {[1, 2, 3, 4].map(i => (
-            <div key={i} className="movie-card">
+          {recommended.map(film => (
+            <div key={film.id} className="movie-card">
               <div 
                 style={{ 
                   backgroundColor: '#333', 
@@ -64,8 +102,8 @@ function Discover() {
                   marginBottom: '0.5rem'
                 }}
               ></div>
-              <h3 style={{ fontSize: '1rem' }}>Recommended Film {i}</h3>
-              <p style={{ color: '#888', fontSize: '0.9rem' }}>2023</p>
+              <h3 style={{ fontSize: '1rem' }}>{film.title}</h3>
+              <p style={{ color: '#888', fontSize: '0.9rem' }}>{film.year}</p>
             </div>
           ))}
         </div>
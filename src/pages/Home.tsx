@@ -1,4 +1,26 @@
+import { useState, useEffect } from 'react'
+import type { TrendingFilm } from '../types'
+
 function Home() {
+  const [trending, setTrending] = useState<TrendingFilm[]>([])
+
+  useEffect(() => {
+    fetchTrending()
+  }, [])
+
+  const fetchTrending = async () => {
+    try {
+      const response = await fetch('/api/films/trending/?limit=3', { credentials: 'include' })
+      if (!response.ok) {
+        throw new Error('Failed to fetch trending films')
+      }
+      const data = await response.json()
+      setTrending(data.films)
+    } catch (err) {
+      console.error('Error fetching trending films:', err)
+    }
+  }
+
   return (
     <div className="home-page">
       <div className="page-header">
@@ -15,18 +37,12 @@ function Home() {
         <section className="card">
           <h2>Trending Now</h2>
           <div className="card-grid">
-            <div className="movie-card">
-              <div className="movie-poster" style={{ backgroundColor: '#333', height: '300px' }}></div>
-              <h3>Film Title</h3>
-            </div>
-            <div className="movie-card">
-              <div className="movie-poster" style={{ backgroundColor: '#333', height: '300px' }}></div>
-              <h3>Film Title</h3>
-            </div>
-            <div className="movie-card">
-              <div className="movie-poster" style={{ backgroundColor: '#333', height: '300px' }}></div>
-              <h3>Film Title</h3>
-            </div>
+            {trending.map(film => (
+              <div key={film.id} className="movie-card">
+                <div className="movie-poster" style={{ backgroundColor: '#333', height: '300px' }}></div>
+                <h3>{film.title}</h3>
+              </div>
+            ))}
           </div>
         </section>
 
@@ -1,12 +1,85 @@
-import { useState } from 'react'
-import { mockLists, mockFilms } from '../data/mockData'
-import type { List, Film } from '../types'
+import { useState, useEffect } from 'react'
+import type { List, ListEntry } from '../types'
+
+const ENTRIES_PAGE_SIZE = 50
+
+// Follow /api/lists/ next_cursor until every list summary is loaded
+async function fetchListSummaries(): Promise<List[]> {
+  const lists: List[] = []
+  let cursor: string | null = null
+  do {
+    const params = new URLSearchParams({ limit: '200' })
+    if (cursor) params.set('cursor', cursor)
+    const response = await fetch(`/api/lists/?${params}`, { credentials: 'include' })
+    if (!response.ok) {
+      throw new Error('Failed to fetch lists')
+    }
+    const data = await response.json()
+    lists.push(...data.lists.map((list: any) => ({
+      id: list.id,
+      title: list.title,
+      description: list.description,
+      filmCount: list.film_count,
+      createdAt: new Date(list.created_at)
+    })))
+    cursor = data.next_cursor
+  } while (cursor)
+  return lists
+}
+
+// One page of a list's entries, starting after cursor
+async function fetchEntriesPage(listId: number, cursor: string | null) {
+  const params = new URLSearchParams({ limit: String(ENTRIES_PAGE_SIZE) })
+  if (cursor) params.set('cursor', cursor)
+  const response = await fetch(`/api/lists/${listId}/?${params}`, { credentials: 'include' })
+  if (!response.ok) {
+    throw new Error('Failed to fetch list')
+  }
+  const data = await response.json()
+  return { entries: data.entries as ListEntry[], nextCursor: data.next_cursor as string | null }
+}
 
 function Lists() {
-  const [lists] = useState<List[]>(mockLists)
-  const [films] = useState<Film[]>(mockFilms)
+  const [lists, setLists] = useState<List[]>([])
+  const [selectedId, setSelectedId] = useState<number | null>(null)
+  const [entries, setEntries] = useState<ListEntry[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+
+  useEffect(() => {
+    fetchListSummaries()
+      .then(loaded => {
+        setLists(loaded)
+        if (loaded.length > 0) setSelectedId(loaded[0].id)
+      })
+      .catch(err => console.error('Error fetching lists:', err))
+  }, [])
 
-  const getFilmById = (id: number) => films.find(f => f.id === id)
+  // Only the list being shown loads its entries, one page at a time
+  useEffect(() => {
+    if (selectedId === null) return
+    let ignore = false
+    setEntries([])
+    setNextCursor(null)
+    fetchEntriesPage(selectedId, null)
+      .then(page => {
+        if (ignore) return
+        setEntries(page.entries)
+        setNextCursor(page.nextCursor)
+      })
+      .catch(err => console.error('Error fetching list entries:', err))
+    return () => { ignore = true }
+  }, [selectedId])
+
+  const loadMore = async () => {
+    if (selectedId === null || !nextCursor) return
+    try {
+      const page = await fetchEntriesPage(selectedId, nextCursor)
+      setEntries(current => [...current, ...page.entries])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      console.error('Error fetching list entries:', err)
+    }
+  }
 
   return (
     <div className="lists-page">
@@ -21,38 +94,49 @@ function Lists() {
 
       <div>
         {lists.map(list => (
-          <div key={list.id} className="card">
-            <div style={{ marginBottom: '1.5rem' }}>
+          <div
+            key={list.id}
+            className="card"
+            onClick={() => setSelectedId(list.id)}
+            style={{ cursor: list.id === selectedId ? 'default' : 'pointer' }}
+          >
+            <div style={{ marginBottom: list.id === selectedId ? '1.5rem' : 0 }}>
               <h3 style={{ marginBottom: '0.5rem' }}>{list.title}</h3>
-              <p style={{ 
-                fontSize: '0.9rem', 
+              <p style={{
+                fontSize: '0.9rem',
                 color: 'rgba(232, 228, 223, 0.5)',
                 fontFamily: "'DM Sans', sans-serif"
               }}>
                 {list.description}
               </p>
-              <p style={{ 
-                fontSize: '0.75rem', 
+              <p style={{
+                fontSize: '0.75rem',
                 color: 'rgba(232, 228, 223, 0.3)',
                 marginTop: '0.5rem',
                 fontFamily: "'DM Sans', sans-serif"
               }}>
-                Created {list.createdAt.toLocaleDateString('en-US', { month: 'long', year: 'numeric' })}
+                {list.filmCount} {list.filmCount === 1 ? 'film' : 'films'} • Created {list.createdAt.toLocaleDateString('en-US', { month: 'long', year: 'numeric' })}
               </p>
             </div>
 
-            <div className="film-grid">
-              {list.films.map(filmId => {
-                const film = getFilmById(filmId)
-                return film ? (
-                  <div key={film.id} className="film-card">
-                    <div className="film-poster"></div>
-                    <h3>{film.title}</h3>
-                    <p>{film.year} • {film.director}</p>
-                  </div>
-                ) : null
-              })}
-            </div>
+            {list.id === selectedId && (
+              <>
+                <div className="film-grid">
+                  {entries.map(({ id, film }) => (
+                    <div key={id} className="film-card">
+                      <div className="film-poster"></div>
+                      <h3>{film.title}</h3>
+                      <p>{film.year} • {film.director}</p>
+                    </div>
+                  ))}
+                </div>
+                {nextCursor && (
+                  <button className="btn btn-secondary" style={{ marginTop: '1.5rem' }} onClick={loadMore}>
+                    Load more
+                  </button>
+                )}
+              </>
+            )}
           </div>
         ))}
       </div>
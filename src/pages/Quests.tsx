@@ -1,38 +1,34 @@
+import { useState, useEffect } from 'react'
+
+interface Quest {
+  key: string
+  title: string
+  description: string
+  progress: number
+  goal: number
+  reward: string
+  unlocked_at: string | null
+}
+
 function Quests() {
-  const quests = [
-    {
-      id: 1,
-      title: "World Cinema Explorer",
-      description: "Watch films from 10 different countries",
-      progress: 5,
-      goal: 10,
-      reward: "Unlock international cinema badge"
-    },
-    {
-      id: 2,
-      title: "Decade Jumper",
-      description: "Watch at least one film from each decade (1920s-2020s)",
-      progress: 4,
-      goal: 10,
-      reward: "Unlock time traveler badge"
-    },
-    {
-      id: 3,
-      title: "Genre Master",
-      description: "Watch films across all major genres",
-      progress: 6,
-      goal: 8,
-      reward: "Unlock versatile viewer badge"
-    },
-    {
-      id: 4,
-      title: "New Directors",
-      description: "Discover 20 directors you've never watched before",
-      progress: 3,
-      goal: 20,
-      reward: "Unlock discovery badge"
+  const [quests, setQuests] = useState<Quest[]>([])
+
+  useEffect(() => {
+    fetchQuests()
+  }, [])
+
+  const fetchQuests = async () => {
+    try {
+      const response = await fetch('/api/quests/', { credentials: 'include' })
+      if (!response.ok) {
+        throw new Error('Failed to fetch quests')
+      }
+      const data = await response.json()
+      setQuests(data.quests)
+    } catch (err) {
+      console.error('Error fetching quests:', err)
     }
-  ]
+  }
 
   return (
     <div className="quests-page">
@@ -63,7 +59,7 @@ function Quests() {
           const percentage = (quest.progress / quest.goal) * 100
 
           return (
-            <div key={quest.id} className="card">
+            <div key={quest.key} className="card">
               <div style={{ marginBottom: '1.5rem' }}>
                 <h3 style={{ fontSize: '1.5rem', marginBottom: '0.5rem' }}>
                   {quest.title}
@@ -1,19 +1,82 @@
-import { useState } from 'react'
-import { mockRubrics } from '../data/mockData'
+import { useState, useEffect } from 'react'
 import type { Rubric } from '../types'
 import RubricModal from '../components/RubricModal'
 
+function toRubric(data: any): Rubric {
+  return {
+    id: data.id,
+    name: data.name,
+    description: data.description,
+    isDefault: data.is_default,
+    categories: data.categories.map((c: any) => ({ id: c.id, name: c.name, weight: c.weight }))
+  }
+}
+
+function toPayload(rubric: Omit<Rubric, 'id'>) {
+  return {
+    name: rubric.name,
+    description: rubric.description,
+    is_default: rubric.isDefault,
+    categories: rubric.categories.map((c, order) => ({ id: c.id, name: c.name, weight: c.weight, order }))
+  }
+}
+
+function getCsrfToken() {
+  const name = 'csrftoken';
+  const cookies = document.cookie.split(';');
+  for (const cookie of cookies) {
+    const [key, value] = cookie.trim().split('=');
+    if (key === name) return value;
+  }
+  return '';
+}
+
 function Rubrics() {
-  const [rubrics, setRubrics] = useState<Rubric[]>(mockRubrics)
+  const [rubrics, setRubrics] = useState<Rubric[]>([])
   const [showRubricModal, setShowRubricModal] = useState(false)
   const [editingRubric, setEditingRubric] = useState<Rubric | null>(null)
 
-  const handleCreateRubric = (rubricData: Omit<Rubric, 'id'>) => {
-    const newRubric: Rubric = {
-      ...rubricData,
-      id: Date.now()
+  useEffect(() => {
+    fetchRubrics()
+  }, [])
+
+  const fetchRubrics = async () => {
+    try {
+      const response = await fetch('/api/rubrics/', { credentials: 'include' })
+      if (!response.ok) {
+        throw new Error('Failed to fetch rubrics')
+      }
+      const data = await response.json()
+      setRubrics(data.rubrics.map(toRubric))
+    } catch (err) {
+      console.error('Error fetching rubrics:', err)
+    }
+  }
+
+  // Saves the rubric and all of its categories in one request
+  const saveRubric = async (rubricData: Omit<Rubric, 'id'>, id?: number) => {
+    const response = await fetch(id ? `/api/rubrics/${id}/` : '/api/rubrics/', {
+      method: id ? 'PUT' : 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': getCsrfToken(),
+      },
+      credentials: 'include',
+      body: JSON.stringify(toPayload(rubricData)),
+    })
+    const data = await response.json()
+    if (!response.ok) {
+      alert(data.error || 'Failed to save rubric')
+      return
+    }
+    // A new default clears the old one, so reload the list
+    if (rubricData.isDefault) {
+      await fetchRubrics()
+    } else if (id) {
+      setRubrics(rubrics.map(r => r.id === id ? toRubric(data) : r))
+    } else {
+      setRubrics([...rubrics, toRubric(data)])
     }
-    setRubrics([...rubrics, newRubric])
   }
 
   const handleEditRubric = (rubric: Rubric) => {
@@ -23,28 +86,31 @@ function Rubrics() {
 
   const handleSaveRubric = (rubricData: Omit<Rubric, 'id'>) => {
     if (editingRubric) {
-      setRubrics(rubrics.map(r => 
-        r.id === editingRubric.id 
-          ? { ...rubricData, id: editingRubric.id }
-          : r
-      ))
+      saveRubric(rubricData, editingRubric.id)
       setEditingRubric(null)
     } else {
-      handleCreateRubric(rubricData)
+      saveRubric(rubricData)
     }
   }
 
-  const handleDeleteRubric = (id: number) => {
+  const handleDeleteRubric = async (id: number) => {
     if (confirm('Are you sure you want to delete this rubric?')) {
-      setRubrics(rubrics.filter(r => r.id !== id))
+      const response = await fetch(`/api/rubrics/${id}/`, {
+        method: 'DELETE',
+        headers: { 'X-CSRFToken': getCsrfToken() },
+        credentials: 'include',
+      })
+      if (response.ok) {
+        setRubrics(rubrics.filter(r => r.id !== id))
+      }
     }
   }
 
   const handleSetDefaultRubric = (id: number) => {
-    setRubrics(rubrics.map(r => ({
-      ...r,
-      isDefault: r.id === id
-    })))
+    const rubric = rubrics.find(r => r.id === id)
+    if (rubric) {
+      saveRubric({ ...rubric, isDefault: true }, id)
+    }
   }
 
   return (
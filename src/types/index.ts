@@ -14,11 +14,43 @@ export interface Film {
   rubricRatings: { [rubricId: number]: { [categoryId: number]: number } }
 }
 
+export interface ListEntry {
+  id: number
+  position: number
+  film: {
+    id: number
+    title: string
+    year: number
+    director: string
+  }
+}
+
+export interface TrendingFilm {
+  id: number
+  title: string
+  year: number
+  director: string
+  genre: string
+  rank: number
+  week_count: number
+  log_count: number
+  avg_rating: number | null
+}
+
+export interface RecommendedFilm {
+  id: number
+  title: string
+  year: number
+  director: string
+  genre: string
+  score: number
+}
+
 export interface List {
   id: number
   title: string
   description: string
-  films: number[]
+  filmCount: number
   createdAt: Date
 }
 
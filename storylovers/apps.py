@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class StoryloversConfig(AppConfig):
     name = 'storylovers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,183 @@
+"""
+ASGI-native versions of the diary and film search endpoints.
+
+They mirror FilmLogView and FilmView but use the async ORM and cache APIs,
+so under uvicorn/daphne a worker serves many concurrent requests from one
+event loop. Routed in place of the sync views when ``ASYNC_API`` is set.
+
+AsyncDraftEventsView is async only: a draft-room long-poll that holds the
+request open on the event loop until the next pick instead of a thread.
+"""
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_protect
+
+from cinevous.metrics import JsonResponse
+from .drafts import scheduler, serialize_pick
+from .models import Draft, Film, FilmLog, LeaguePick, StoryLover
+from .pagination import InvalidCursor, akeyset_page, parse_limit
+from .search_cache import acached_search_films, aget_generation, etag_for, normalize_query
+from .views import (
+    DRAFT_POLL_TIMEOUT, EXPORT_CHUNK_SIZE, SEARCH_LIMIT, SEARCH_MAX_AGE, FilmLogView, method_not_allowed,
+    serialize_film_log,
+)
+
+
+class AsyncView(View):
+    # An async dispatch lets login_required and csrf_protect pick their
+    # async wrappers, which read the user with request.auser().
+    async def dispatch(self, request, *args, **kwargs):
+        return await super().dispatch(request, *args, **kwargs)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class AsyncFilmLogView(AsyncView):
+    async def get(self, request, film_log_id=None):
+        user = await request.auser()
+        story_lover = await StoryLover.objects.aget(user=user)
+        film_logs = FilmLog.objects.filter(story_lover=story_lover).select_related('film').with_weighted_score()
+        if film_log_id is not None:
+            log = await film_logs.filter(id=film_log_id).afirst()
+            if log is None:
+                return JsonResponse({'error': 'Film log not found.'}, status=404)
+            return JsonResponse(serialize_film_log(log), status=200)
+
+        if request.GET.get('format') == 'ndjson':
+            async def lines():
+                rows = film_logs.order_by('-watched_at', '-id').aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+                async for log in rows:
+                    yield json.dumps(serialize_film_log(log), cls=DjangoJSONEncoder) + '\n'
+
+            response = StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+            response['Content-Disposition'] = 'attachment; filename="film_logs.ndjson"'
+            return response
+
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            page, next_cursor = await akeyset_page(film_logs, 'watched_at', request.GET.get('cursor'), limit)
+        except (InvalidCursor, ValidationError, ValueError) as e:
+            logging.error("Invalid film log pagination parameters: %s", e)
+            return JsonResponse({'error': 'Invalid pagination parameters.'}, status=400)
+
+        logs_data = [serialize_film_log(log) for log in page]
+        return JsonResponse({'film_logs': logs_data, 'next_cursor': next_cursor}, status=200)
+
+    async def post(self, request, film_log_id=None):
+        if film_log_id is not None:
+            return method_not_allowed(request, ['GET', 'PUT', 'DELETE'])
+        user = await request.auser()
+        story_lover = await StoryLover.objects.aget(user=user)
+        data = json.loads(request.body)
+        if isinstance(data, dict) and 'entries' in data:
+            # One transaction around bulk writes; not worth splitting up
+            return await sync_to_async(FilmLogView().post_batch)(story_lover, data['entries'])
+
+        try:
+            film_id = data['film_id']
+            rating_num = data['rating']
+            review_text = data.get('review', '')
+            mood = data.get('mood', '')
+        except KeyError as e:
+            logging.error(f"Missing data in film log creation: {e}")
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+
+        try:
+            film = await Film.objects.aget(id=film_id)
+        except (Film.DoesNotExist, ValueError, TypeError):
+            logging.error("Film not found with ID: %s", film_id)
+            return JsonResponse({'error': 'Film not found.'}, status=404)
+
+        try:
+            rating = int(rating_num)
+            if rating < 1 or rating > 10:
+                raise ValueError("Rating out of bounds")
+        except (ValueError, TypeError) as e:
+            logging.error(f"Invalid rating value: {rating_num}. Error: {e}")
+            return JsonResponse({'error': 'Invalid rating value.'}, status=400)
+
+        new_film_log = await FilmLog.objects.acreate(
+            story_lover=story_lover,
+            film=film,
+            rating=rating,
+            review=review_text,
+            mood=mood
+        )
+        return JsonResponse({'status': 'success', 'id': new_film_log.id, 'watched_at': new_film_log.watched_at}, status=201)
+
+    # Edits and deletes cascade through several dependent writes in one
+    # transaction, so they run on the sync path in a thread.
+    async def put(self, request, film_log_id=None):
+        if film_log_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        user = await request.auser()
+        return await sync_to_async(FilmLogView().update_log)(user, film_log_id, request.body)
+
+    async def delete(self, request, film_log_id=None):
+        if film_log_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        user = await request.auser()
+        return await sync_to_async(FilmLogView().delete_log)(user, film_log_id)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class AsyncFilmView(AsyncView):
+    async def get(self, request):
+        q = request.GET.get('q', '')
+        if len(q) < 2:
+            return JsonResponse([], safe=False, status=200)
+
+        key = normalize_query(q)
+        generation = await aget_generation()
+        try:
+            response_data = await acached_search_films(key, generation, limit=SEARCH_LIMIT)
+        except Exception as e:
+            logging.error("Error searching films: %s", e)
+            return JsonResponse({'error': 'Error searching films.'}, status=500)
+        etag = etag_for(generation, key, SEARCH_LIMIT, response_data)
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse({'films': response_data}, status=200)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=SEARCH_MAX_AGE)
+        return response
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class AsyncDraftEventsView(AsyncView):
+    async def get(self, request, league_id):
+        """
+        Long-poll for picks after ``?after=<pick_number>``. Answers at once
+        if there are any, otherwise waits for the next pick or the timeout
+        and answers with whatever there is then (possibly nothing).
+        """
+        user = await request.auser()
+        try:
+            after = int(request.GET.get('after') or 0)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid pick number.'}, status=400)
+        try:
+            draft = await Draft.objects.aget(league_id=league_id, league__members__story_lover__user=user)
+        except Draft.DoesNotExist:
+            return JsonResponse({'error': 'Draft not found.'}, status=404)
+
+        picks = await self.picks_after(league_id, after)
+        if not picks and draft.status == Draft.LIVE:
+            if await scheduler.wait(league_id, draft.version, DRAFT_POLL_TIMEOUT):
+                await draft.arefresh_from_db()
+                picks = await self.picks_after(league_id, after)
+        return JsonResponse({**draft.as_dict(), 'picks': picks}, status=200)
+
+    async def picks_after(self, league_id, after):
+        picks = LeaguePick.objects.filter(league_id=league_id, pick_number__gt=after).select_related('fantasy_film')
+        return [serialize_pick(pick) async for pick in picks]
@@ -0,0 +1,307 @@
+"""
+Synthetic-data benchmarks for the storylovers API.
+
+``seed`` bulk-generates films, users and logs at a given scale, bypassing
+model save() hooks, and then rebuilds the derived tables for the one
+story_lover the benchmarks log in as. ``run_benchmarks`` times the diary,
+logging and search endpoints plus weighted score reads, and
+``compare_to_baseline`` flags regressions against a stored result. Driven
+by the ``benchmark_api`` management command.
+
+``concurrent_throughput`` runs writer and reader threads against the same
+database for a fixed time, to compare database profiles under write
+contention (``benchmark_db`` command).
+"""
+import json
+import random
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .management.commands.backfill_seen_history import Command as SeenHistory
+from .management.commands.backfill_stats_rollups import Command as StatsRollups
+from .models import (
+    Film, FilmLog, FilmLogScore, Rubric, RubricCategory, RubricRating, StoryLover,
+)
+from .pagination import keyset_page
+from .search_cache import bump_generation
+
+
+SCALES = {
+    'tiny': {'films': 200, 'users': 5, 'logs': 1000},
+    'small': {'films': 1000, 'users': 100, 'logs': 10000},
+    'medium': {'films': 10000, 'users': 1000, 'logs': 100000},
+    'large': {'films': 100000, 'users': 10000, 'logs': 5000000},
+}
+
+BATCH_SIZE = 5000
+WORDS = [
+    'night', 'river', 'silent', 'summer', 'city', 'ghost', 'garden', 'last', 'red', 'winter',
+    'lost', 'house', 'dream', 'blue', 'empire', 'shadow', 'glass', 'wild', 'paper', 'moon',
+]
+GENRES = ['Drama', 'Comedy', 'Thriller', 'Horror', 'Romance', 'Documentary', 'Animation', 'Action']
+COUNTRIES = ['USA', 'France', 'Japan', 'Korea', 'Italy', 'Mexico', 'India', 'Sweden']
+
+
+def _batched(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(films, users, logs, rng=None):
+    """
+    Bulk-generate a synthetic catalog and diaries. Returns the StoryLover
+    used for the benchmarks, which gets a tenth of all logs.
+    """
+    rng = rng or random.Random(42)
+    password = make_password(None)
+
+    def film_rows():
+        for i in range(films):
+            year = rng.randint(1920, 2025)
+            yield Film(
+                title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+                director=f"Director {rng.randint(0, max(films // 8, 1))}",
+                year=year,
+                decade=Film.decade_for(year),
+                genre=rng.choice(GENRES),
+                country=rng.choice(COUNTRIES),
+            )
+
+    for batch in _batched(film_rows()):
+        Film.objects.bulk_create(batch)
+
+    start = User.objects.count()
+    for batch in _batched(
+        User(username=f'bench{start + i}', password=password) for i in range(users)
+    ):
+        User.objects.bulk_create(batch)
+    new_users = User.objects.filter(username__startswith='bench').order_by('id')
+    for batch in _batched(
+        StoryLover(user=user, display_name=user.username)
+        for user in new_users.filter(story_lover__isnull=True).iterator()
+    ):
+        StoryLover.objects.bulk_create(batch)
+
+    story_lover_ids = list(StoryLover.objects.order_by('created_at', 'id').values_list('id', flat=True))
+    film_ids = list(Film.objects.values_list('id', flat=True))
+    heavy_user = story_lover_ids[0]
+    now = timezone.now()
+
+    def log_rows():
+        for i in range(logs):
+            owner = heavy_user if i % 10 == 0 else rng.choice(story_lover_ids)
+            yield FilmLog(
+                story_lover_id=owner,
+                film_id=rng.choice(film_ids),
+                rating=rng.randint(1, 10),
+                mood=rng.choice(FilmLog.MOOD_CHOICES)[0],
+                watched_at=now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 5)),
+            )
+
+    for batch in _batched(log_rows()):
+        FilmLog.objects.bulk_create(batch)
+
+    story_lover = StoryLover.objects.get(id=heavy_user)
+    _seed_rubric_ratings(story_lover, rng)
+
+    # bulk_create skipped the save() hooks; rebuild what the benchmarked
+    # requests read for this user.
+    SeenHistory.rebuild(story_lover)
+    StatsRollups.rebuild(story_lover)
+    return story_lover
+
+
+def _seed_rubric_ratings(story_lover, rng, rated_logs=500):
+    rubric, _ = Rubric.objects.get_or_create(story_lover=story_lover, name='Benchmark')
+    categories = [
+        RubricCategory.objects.get_or_create(rubric=rubric, name=name, defaults={'weight': weight})[0]
+        for name, weight in [('Direction', 30), ('Acting', 30), ('Story', 20), ('Craft', 20)]
+    ]
+    log_ids = list(
+        FilmLog.objects.filter(story_lover=story_lover, rubric_ratings__isnull=True)
+        .order_by('-watched_at').values_list('id', flat=True)[:rated_logs]
+    )
+    RubricRating.objects.bulk_create([
+        RubricRating(film_log_id=log_id, category=category, rating=rng.randint(1, 10))
+        for log_id in log_ids for category in categories
+    ])
+    FilmLogScore.recompute(log_ids)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def measure(operation, iterations):
+    """Time ``operation`` and report latency percentiles, queries and peak memory."""
+    operation()  # warm up caches and connections
+
+    timings, queries = [], []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(ctx.captured_queries))
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'queries': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(story_lover, iterations=50, rng=None):
+    rng = rng or random.Random(7)
+    client = Client()
+    client.force_login(story_lover.user)
+    film_ids = list(Film.objects.values_list('id', flat=True)[:1000])
+    prefixes = [f"{a[:3]} {b[:2]}" for a in WORDS for b in WORDS]
+
+    def diary_get():
+        client.get('/api/filmlogs/', {'limit': 50})
+
+    def diary_post():
+        client.post(
+            '/api/filmlogs/',
+            json.dumps({'film_id': rng.choice(film_ids), 'rating': rng.randint(1, 10)}),
+            content_type='application/json',
+        )
+
+    def film_search():
+        # Invalidate both cache levels so the search itself is what gets timed
+        bump_generation()
+        client.get('/api/films/', {'q': rng.choice(prefixes)})
+
+    def weighted_scores():
+        logs = FilmLog.objects.filter(story_lover=story_lover).with_weighted_score()[:50]
+        [log.weighted_score for log in logs]
+
+    return {
+        'diary_get': measure(diary_get, iterations),
+        'diary_post': measure(diary_post, iterations),
+        'film_search': measure(film_search, iterations),
+        'weighted_score': measure(weighted_scores, iterations),
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Return a list of regressions: any p95 more than ``tolerance`` slower
+    than the baseline, or any increase in query count.
+    """
+    regressions = []
+    for scale, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            previous = baseline.get(scale, {}).get(name)
+            if previous is None:
+                continue
+            if current['queries'] > previous['queries']:
+                regressions.append(
+                    f"{scale}/{name}: {current['queries']} queries (baseline {previous['queries']})"
+                )
+            if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{scale}/{name}: p95 {current['p95_ms']}ms (baseline {previous['p95_ms']}ms)"
+                )
+    return regressions
+
+
+def _latency_report(operations, timings, errors, duration):
+    timings.sort()
+    return {
+        'ops_per_second': round(operations / duration, 1),
+        'p50_ms': round(percentile(timings, 50) or 0, 3),
+        'p95_ms': round(percentile(timings, 95) or 0, 3),
+        'errors': errors,
+    }
+
+
+def concurrent_throughput(writers=4, readers=4, duration=5.0, rng_seed=11):
+    """
+    Run ``writers`` threads logging films and ``readers`` threads paging
+    diaries against the current database for ``duration`` seconds. Needs
+    data from ``seed`` and a database every thread can open (a file, not a
+    per-connection in-memory SQLite database).
+    """
+    story_lover_ids = list(StoryLover.objects.values_list('id', flat=True))
+    film_ids = list(Film.objects.values_list('id', flat=True)[:1000])
+    results = {'write': [], 'read': []}
+    lock = threading.Lock()
+    deadline = [None]
+
+    def start_clock():
+        deadline[0] = time.perf_counter() + duration
+
+    start_barrier = threading.Barrier(writers + readers, action=start_clock)
+
+    def worker(kind, seed_offset):
+        rng = random.Random(rng_seed + seed_offset)
+        timings, errors = [], 0
+        try:
+            start_barrier.wait()
+            while time.perf_counter() < deadline[0]:
+                story_lover_id = rng.choice(story_lover_ids)
+                start = time.perf_counter()
+                try:
+                    if kind == 'write':
+                        FilmLog.objects.create(
+                            story_lover_id=story_lover_id,
+                            film_id=rng.choice(film_ids),
+                            rating=rng.randint(1, 10),
+                        )
+                    else:
+                        keyset_page(
+                            FilmLog.objects.filter(story_lover_id=story_lover_id).select_related('film'),
+                            'watched_at', None, 50,
+                        )
+                except OperationalError:
+                    # "database is locked" on SQLite without enough busy timeout
+                    errors += 1
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connections.close_all()
+            with lock:
+                results[kind].append((timings, errors))
+
+    threads = [threading.Thread(target=worker, args=('write', i)) for i in range(writers)]
+    threads += [threading.Thread(target=worker, args=('read', writers + i)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {'vendor': connection.vendor, 'writers': writers, 'readers': readers}
+    for kind, runs in results.items():
+        timings = [timing for run_timings, _ in runs for timing in run_timings]
+        errors = sum(run_errors for _, run_errors in runs)
+        report[kind] = _latency_report(len(timings), timings, errors, duration)
+    return report
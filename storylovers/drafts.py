@@ -0,0 +1,155 @@
+"""
+League draft rooms.
+
+Picks are committed optimistically: ``make_pick`` checks the turn against
+the Draft row it read, then advances it with
+``UPDATE ... WHERE version = <read version>``. If another pick got in
+first the update matches nothing and the pick is rejected as stale, so no
+``select_for_update`` round trip or lock wait is needed.
+
+``scheduler`` only wakes long-polling clients (``AsyncDraftEventsView``)
+when a pick is committed in this process; it remembers each draft's
+latest version so a waiter that arrives late returns at once. The turn
+order, current pick and picks are always read from the database. Waiters
+in other worker processes are not woken early; they see the pick when
+their poll times out and re-reads the database.
+"""
+import asyncio
+import random
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Draft, League, LeaguePick
+
+
+class PickRejected(ValueError):
+    pass
+
+
+class StaleDraft(PickRejected):
+    """The draft moved on (another pick was committed) since it was read."""
+
+
+class DraftScheduler:
+    """Per-process long-poll wake-ups, shared by every thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = {}
+        self.waiters = {}
+
+    def publish(self, draft):
+        with self.lock:
+            self.versions[draft.league_id] = draft.version
+            waiters = self.waiters.pop(draft.league_id, set())
+        for loop, event in waiters:
+            # Called from sync request threads; the waiters live in event loops.
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, league_id, version, timeout):
+        """
+        Wait until ``league_id``'s draft moves past ``version``; returns
+        False on timeout. Returns at once if a publish already did, so a
+        pick committed between the caller's read and this call is not missed.
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.lock:
+            if self.versions.get(league_id, version) > version:
+                return True
+            self.waiters.setdefault(league_id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self.lock:
+                self.waiters.get(league_id, set()).discard(waiter)
+
+    def clear(self):
+        with self.lock:
+            self.versions.clear()
+            self.waiters.clear()
+
+
+scheduler = DraftScheduler()
+
+
+def start_draft(league, rounds=5, rng=None):
+    """Open (or restart) ``league``'s draft with a shuffled snake order."""
+    order = list(league.members.order_by('id').values_list('id', flat=True))
+    if len(order) < 2:
+        raise PickRejected("A draft needs at least two members.")
+    (rng or random).shuffle(order)
+    with transaction.atomic():
+        LeaguePick.objects.filter(league=league).delete()
+        draft, _ = Draft.objects.get_or_create(league=league)
+        draft.status = Draft.LIVE
+        draft.order = order
+        draft.rounds = rounds
+        draft.current_pick = 1
+        draft.version += 1
+        draft.started_at = timezone.now()
+        draft.finished_at = None
+        draft.save()
+        League.objects.filter(pk=league.pk).update(draft_complete=False)
+    transaction.on_commit(lambda: scheduler.publish(draft))
+    return draft
+
+
+def make_pick(draft, member, fantasy_film, expected_version=None):
+    """
+    Commit ``member``'s pick of ``fantasy_film`` in ``draft`` as read by the
+    caller. Raises StaleDraft if the draft has moved on since then (or since
+    ``expected_version``, if the client sent one), PickRejected otherwise.
+    """
+    if expected_version is not None and expected_version != draft.version:
+        raise StaleDraft("The draft has moved on; refresh and try again.")
+    if draft.status != Draft.LIVE:
+        raise PickRejected("The draft is not open.")
+    if draft.member_for_pick(draft.current_pick) != member.id:
+        raise PickRejected("It is not your turn.")
+    if fantasy_film.season != draft.league.season:
+        raise PickRejected("That film is not in this season.")
+
+    pick_number = draft.current_pick
+    finished = pick_number >= draft.total_picks
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            advanced = Draft.objects.filter(pk=draft.pk, version=draft.version).update(
+                version=F('version') + 1,
+                current_pick=F('current_pick') + 1,
+                status=Draft.DONE if finished else Draft.LIVE,
+                finished_at=now if finished else None,
+            )
+            if not advanced:
+                raise StaleDraft("The draft has moved on; refresh and try again.")
+            if LeaguePick.objects.filter(league_id=draft.league_id, fantasy_film=fantasy_film).exists():
+                raise PickRejected("That film has already been drafted.")
+            pick = LeaguePick.objects.create(
+                league_id=draft.league_id, member=member, fantasy_film=fantasy_film, pick_number=pick_number,
+            )
+            if finished:
+                League.objects.filter(pk=draft.league_id).update(draft_complete=True)
+    except IntegrityError:
+        raise StaleDraft("The draft has moved on; refresh and try again.")
+
+    draft.version += 1
+    draft.current_pick += 1
+    if finished:
+        draft.status, draft.finished_at = Draft.DONE, now
+    transaction.on_commit(lambda: scheduler.publish(draft))
+    return pick
+
+
+def serialize_pick(pick):
+    return {
+        'pick_number': pick.pick_number,
+        'member_id': pick.member_id,
+        'fantasy_film_id': pick.fantasy_film_id,
+        'title': pick.fantasy_film.title,
+    }
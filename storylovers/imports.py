@@ -0,0 +1,214 @@
+"""
+Background diary imports.
+
+An uploaded CSV (Letterboxd diary/watched export, or our own columns) is
+streamed in chunks: each chunk's films are matched with one query by
+tmdb_id or (title, year) and its logs are inserted with
+FilmLog.objects.create_batch. Jobs run either on a small in-process
+thread pool or via the ``run_import_jobs`` management command, depending
+on ``DIARY_IMPORT_EXECUTOR``.
+"""
+import csv
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Film, FilmLog, ImportJob
+
+
+CHUNK_SIZE = getattr(settings, 'DIARY_IMPORT_CHUNK_SIZE', 500)
+
+_executor = None
+
+
+def _column(row, *names):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ''):
+            return value.strip()
+    return ''
+
+
+def parse_rating(value, scale=1):
+    """
+    Map a rating onto FilmLog's 1-10 scale. Letterboxd exports half stars
+    (0.5-5) in their ``Rating`` column, which are read with ``scale=2``.
+    """
+    if not value:
+        return None
+    try:
+        rating = int((Decimal(value) * scale).to_integral_value())
+    except (InvalidOperation, OverflowError):
+        # OverflowError: int() of an infinite Decimal
+        raise ValueError(f"Invalid rating {value!r}")
+    if rating < 1 or rating > 10:
+        raise ValueError(f"Rating {value!r} out of range")
+    return rating
+
+
+def parse_watched_at(value):
+    if not value:
+        return timezone.now()
+    day = datetime.strptime(value[:10], '%Y-%m-%d').date()
+    return timezone.make_aware(datetime.combine(day, time(12, 0)))
+
+
+def parse_row(row):
+    """Pull the fields we import from one CSV row; raises ValueError if unusable."""
+    title = _column(row, 'Name', 'title', 'Title')
+    if not title:
+        raise ValueError("Missing title")
+    year = _column(row, 'Year', 'year')
+    tmdb_id = _column(row, 'tmdb_id', 'TMDb ID')
+    return {
+        'title': title,
+        'year': int(year) if year else None,
+        'tmdb_id': int(tmdb_id) if tmdb_id else None,
+        'rating': parse_rating(row['Rating'], scale=2) if 'Rating' in row else parse_rating(_column(row, 'rating')),
+        'review': _column(row, 'Review', 'review'),
+        'watched_at': parse_watched_at(_column(row, 'Watched Date', 'Date', 'watched_at')),
+    }
+
+
+def match_films(parsed):
+    """
+    Resolve a chunk of parsed rows to films with a single query, using
+    tmdb_id where present and the (title, year) index otherwise.
+    Returns lookups keyed by tmdb_id, (title, year) and title.
+    """
+    tmdb_ids = {row['tmdb_id'] for row in parsed if row['tmdb_id']}
+    titles = {row['title'] for row in parsed if not row['tmdb_id']}
+    by_tmdb, by_title_year, by_title = {}, {}, {}
+    if not tmdb_ids and not titles:
+        return by_tmdb, by_title_year, by_title
+
+    for film in Film.objects.filter(Q(tmdb_id__in=tmdb_ids) | Q(title__in=titles)).order_by('id'):
+        if film.tmdb_id in tmdb_ids:
+            by_tmdb[film.tmdb_id] = film
+        by_title_year.setdefault((film.title, film.year), film)
+        by_title.setdefault(film.title, film)
+    return by_tmdb, by_title_year, by_title
+
+
+def find_film(row, by_tmdb, by_title_year, by_title):
+    if row['tmdb_id']:
+        return by_tmdb.get(row['tmdb_id'])
+    if row['year']:
+        return by_title_year.get((row['title'], row['year']))
+    return by_title.get(row['title'])
+
+
+def _error(job, line, message):
+    if len(job.errors) < ImportJob.MAX_ERRORS:
+        job.errors.append({'line': line, 'error': message})
+
+
+def import_chunk(job, chunk):
+    """Import ``[(line_number, csv_row), ...]``; returns the number of logs created."""
+    parsed = []
+    for line, row in chunk:
+        try:
+            parsed.append((line, parse_row(row)))
+        except (ValueError, TypeError) as e:
+            _error(job, line, str(e))
+
+    lookups = match_films([row for _, row in parsed])
+    entries = []
+    for line, row in parsed:
+        film = find_film(row, *lookups)
+        if film is None:
+            _error(job, line, f"No film matching {row['title']!r} ({row['year'] or 'unknown year'})")
+            continue
+        entries.append({
+            'film': film,
+            'rating': row['rating'],
+            'review': row['review'],
+            'watched_at': row['watched_at'],
+        })
+
+    # Oldest first, so new-director and rewatch flags follow viewing order.
+    entries.sort(key=lambda entry: entry['watched_at'])
+    return len(FilmLog.objects.create_batch(job.story_lover, entries))
+
+
+def run_import(job):
+    """Process one claimed job from start to finish, saving progress per chunk."""
+    # Whatever escapes below, even an interrupted worker, the job must not
+    # be left RUNNING; chunk saves leave the stored status alone until then
+    job.status = ImportJob.FAILED
+    try:
+        job.started_at = timezone.now()
+        job.save(update_fields=['started_at'])
+        with job.file.open('rb') as raw:
+            text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+            # Count CSV records, not physical lines: a quoted review can
+            # span several lines. DictReader skips blank rows, so skip them too.
+            job.total_rows = max(sum(1 for row in csv.reader(text) if row) - 1, 0)
+            job.save(update_fields=['total_rows'])
+            text.seek(0)
+
+            chunk = []
+            reader = csv.DictReader(text)
+            # Errors point at the line each record starts on
+            line = 1
+            for row in reader:
+                chunk.append((line + 1, row))
+                line = reader.line_num
+                if len(chunk) >= CHUNK_SIZE:
+                    _finish_chunk(job, chunk)
+                    chunk = []
+            _finish_chunk(job, chunk)
+    except Exception as e:
+        logging.exception("Diary import %s failed", job.id)
+        _error(job, None, f"Import failed: {e}")
+    else:
+        job.status = ImportJob.DONE
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'errors', 'finished_at'])
+    return job
+
+
+def _finish_chunk(job, chunk):
+    if not chunk:
+        return
+    job.imported_rows += import_chunk(job, chunk)
+    job.processed_rows += len(chunk)
+    job.save(update_fields=['processed_rows', 'imported_rows', 'errors'])
+
+
+def claim(job_id):
+    """Atomically move a pending job to running; returns it, or None if taken."""
+    claimed = ImportJob.objects.filter(pk=job_id, status=ImportJob.PENDING).update(status=ImportJob.RUNNING)
+    if not claimed:
+        return None
+    return ImportJob.objects.select_related('story_lover').get(pk=job_id)
+
+
+def _run_in_thread(job_id):
+    try:
+        job = claim(job_id)
+        if job is not None:
+            run_import(job)
+    finally:
+        connections.close_all()
+
+
+def submit(job):
+    """Start ``job`` on the thread pool, unless imports run via run_import_jobs."""
+    global _executor
+    if getattr(settings, 'DIARY_IMPORT_EXECUTOR', 'thread') != 'thread':
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'DIARY_IMPORT_WORKERS', 2),
+            thread_name_prefix='diary-import',
+        )
+    _executor.submit(_run_in_thread, job.id)
@@ -0,0 +1,67 @@
+"""
+Fantasy league scoring.
+
+``score_phase`` computes every member's points for a phase, in any number
+of leagues, with one grouped aggregate over the picks x film stats join:
+points for the phase itself and the running total through it. Ranks are
+assigned from those rows in memory. The results replace that phase's
+LeaderboardEntry snapshot, so leaderboard reads never touch the picks.
+Driven by the ``score_leagues`` management command.
+"""
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import League, LeaderboardEntry, LeagueMember
+
+
+def standings(leagues, phase):
+    """
+    One row per member of ``leagues`` (a queryset or ids) with ``points``
+    for ``phase`` and ``total_points`` through it, best first per league.
+    """
+    through = League.phases_through(phase)
+    return LeagueMember.objects.filter(league__in=leagues).values('id', 'league_id').annotate(
+        points=Coalesce(Sum(
+            'picks__fantasy_film__stats__points',
+            filter=Q(picks__fantasy_film__stats__phase=phase),
+        ), 0),
+        total_points=Coalesce(Sum(
+            'picks__fantasy_film__stats__points',
+            filter=Q(picks__fantasy_film__stats__phase__in=through),
+        ), 0),
+    ).order_by('league_id', '-total_points', 'id')
+
+
+def ranked(rows):
+    """Add competition ranks (1, 1, 3, ...) by total_points to rows sorted as standings() returns them."""
+    for _, league_rows in groupby(rows, key=lambda row: row['league_id']):
+        previous, rank = None, 0
+        for position, row in enumerate(league_rows, start=1):
+            if row['total_points'] != previous:
+                previous, rank = row['total_points'], position
+            row['rank'] = rank
+            yield row
+
+
+def score_phase(leagues, phase, batch_size=1000):
+    """Rebuild the ``phase`` leaderboard of every league in ``leagues``; returns the row count."""
+    if phase not in League.PHASES:
+        raise ValueError(f"Unknown phase {phase!r}")
+    entries = [
+        LeaderboardEntry(
+            league_id=row['league_id'],
+            phase=phase,
+            member_id=row['id'],
+            points=row['points'],
+            total_points=row['total_points'],
+            rank=row['rank'],
+        )
+        for row in ranked(standings(leagues, phase))
+    ]
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(league__in=leagues, phase=phase).delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from storylovers.models import FilmLog, QuestProgress, StoryLover
+
+
+class Command(BaseCommand):
+    help = "Rebuild QuestProgress counters from FilmLog history, keeping quests already unlocked."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--story-lover', dest='story_lover_ids', action='append', default=[],
+            help="Only rebuild for this StoryLover id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        story_lovers = StoryLover.objects.all()
+        if options['story_lover_ids']:
+            story_lovers = story_lovers.filter(id__in=options['story_lover_ids'])
+
+        total = 0
+        for story_lover in story_lovers.iterator():
+            self.rebuild(story_lover)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt quest progress for {total} story lovers."))
+
+    @staticmethod
+    def rebuild(story_lover):
+        with transaction.atomic():
+            previous = QuestProgress.objects.select_for_update().filter(story_lover=story_lover).first()
+            progress = QuestProgress(story_lover=story_lover, unlocked=previous.unlocked if previous else {})
+            if previous:
+                progress.pk = previous.pk
+            logs = FilmLog.objects.filter(story_lover=story_lover).select_related('film').order_by('watched_at')
+            for log in logs.iterator(chunk_size=2000):
+                progress.apply(log, log.film)
+            progress.save()
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from storylovers.models import FilmLog, SeenDirector, SeenFilm, StoryLover
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-story_lover seen-director and seen-film index from FilmLog history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--story-lover', dest='story_lover_ids', action='append', default=[],
+            help="Only rebuild for this StoryLover id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        story_lovers = StoryLover.objects.all()
+        if options['story_lover_ids']:
+            story_lovers = story_lovers.filter(id__in=options['story_lover_ids'])
+
+        total = 0
+        for story_lover in story_lovers.iterator():
+            self.rebuild(story_lover)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt seen history for {total} story lovers."))
+
+    @staticmethod
+    def rebuild(story_lover):
+        logs = FilmLog.objects.filter(story_lover=story_lover).order_by()
+        with transaction.atomic():
+            SeenDirector.objects.filter(story_lover=story_lover).delete()
+            SeenFilm.objects.filter(story_lover=story_lover).delete()
+            SeenDirector.objects.bulk_create([
+                SeenDirector(story_lover=story_lover, director=row['film__director'], log_count=row['n'])
+                for row in logs.values('film__director').annotate(n=Count('id'))
+            ])
+            SeenFilm.objects.bulk_create([
+                SeenFilm(story_lover=story_lover, film_id=row['film'], log_count=row['n'])
+                for row in logs.values('film').annotate(n=Count('id'))
+            ])
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from storylovers.models import FilmLog, StoryLover, UserStatsRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild UserStatsRollup rows from FilmLog history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--story-lover', dest='story_lover_ids', action='append', default=[],
+            help="Only rebuild for this StoryLover id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        story_lovers = StoryLover.objects.all()
+        if options['story_lover_ids']:
+            story_lovers = story_lovers.filter(id__in=options['story_lover_ids'])
+
+        total = 0
+        for story_lover in story_lovers.iterator():
+            self.rebuild(story_lover)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats rollups for {total} story lovers."))
+
+    @staticmethod
+    def rebuild(story_lover):
+        rollups = {}
+        logs = FilmLog.objects.filter(story_lover=story_lover).select_related('film').order_by()
+        for log in logs.iterator(chunk_size=2000):
+            for year, month in UserStatsRollup.periods(log.watched_at):
+                rollup = rollups.get((year, month))
+                if rollup is None:
+                    rollup = rollups[(year, month)] = UserStatsRollup(
+                        story_lover=story_lover, year=year, month=month
+                    )
+                rollup.apply(log, log.film)
+
+        with transaction.atomic():
+            UserStatsRollup.objects.filter(story_lover=story_lover).delete()
+            UserStatsRollup.objects.bulk_create(rollups.values())
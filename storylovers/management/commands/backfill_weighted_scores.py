@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from storylovers.models import FilmLog, FilmLogScore
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized FilmLogScore rows from RubricRating history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of film logs rescored per aggregate query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        log_ids = FilmLog.objects.filter(rubric_ratings__isnull=False).distinct().order_by('id').values_list('id', flat=True)
+
+        batch, logs, scores = [], 0, 0
+        for log_id in log_ids.iterator(chunk_size=batch_size):
+            batch.append(log_id)
+            if len(batch) == batch_size:
+                scores += len(FilmLogScore.recompute(batch))
+                logs += len(batch)
+                batch = []
+        if batch:
+            scores += len(FilmLogScore.recompute(batch))
+            logs += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rescored {logs} film logs ({scores} rubric scores)."))
@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from storylovers.benchmark import SCALES, compare_to_baseline, run_benchmarks, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic data into a throwaway database at each scale, time the storylovers "
+        "API and report latency percentiles, query counts and peak memory as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', dest='scales', action='append', choices=sorted(SCALES),
+            help="Preset scale to run (may be repeated). Defaults to small.",
+        )
+        parser.add_argument('--films', type=int, help="Override the preset film count.")
+        parser.add_argument('--users', type=int, help="Override the preset user count.")
+        parser.add_argument('--logs', type=int, help="Override the preset log count.")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--output', help="Write the JSON results to this file.")
+        parser.add_argument('--baseline', help="JSON results to compare against; regressions fail the run.")
+        parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed p95 slowdown (0.25 = 25%%).")
+
+    def handle(self, *args, **options):
+        results = {}
+        setup_test_environment()
+        try:
+            for scale in options['scales'] or ['small']:
+                sizes = {
+                    key: options[key] if options[key] is not None else value
+                    for key, value in SCALES[scale].items()
+                }
+                self.stderr.write(f"Seeding {scale}: {sizes}")
+                # A fresh test database per scale keeps real data untouched.
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+                try:
+                    story_lover = seed(**sizes)
+                    results[scale] = run_benchmarks(story_lover, iterations=options['iterations'])
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+        finally:
+            teardown_test_environment()
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
+
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                baseline = json.load(handle)
+            regressions = compare_to_baseline(results, baseline, options['tolerance'])
+            if regressions:
+                raise CommandError("Performance regressions:\n" + '\n'.join(regressions))
+            self.stderr.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from storylovers.benchmark import SCALES, concurrent_throughput, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and measure read/write throughput while several threads "
+        "log films concurrently, for the active DB_PROFILE. On SQLite the run is repeated "
+        "without the profile's PRAGMAs for comparison. Local use only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='tiny')
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5.0, help="Seconds per run.")
+        parser.add_argument('--output', help="Write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        if connection.vendor == 'sqlite':
+            # Threads need a shared file; the default test database is in-memory.
+            test_name = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+            settings_dict.setdefault('TEST', {})['NAME'] = test_name
+            variants = {'tuned': settings_dict['OPTIONS'], 'untuned': {}}
+        else:
+            variants = {'tuned': settings_dict['OPTIONS']}
+
+        results = {}
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        original_options = settings_dict['OPTIONS']
+        try:
+            self.stderr.write(f"Seeding {options['scale']}: {SCALES[options['scale']]}")
+            seed(**SCALES[options['scale']])
+            for variant, db_options in variants.items():
+                connection.close()
+                settings_dict['OPTIONS'] = db_options
+                if connection.vendor == 'sqlite' and variant == 'untuned':
+                    with connection.cursor() as cursor:
+                        cursor.execute('PRAGMA journal_mode=DELETE')
+                self.stderr.write(f"Running {variant} for {options['duration']}s")
+                results[variant] = concurrent_throughput(
+                    writers=options['writers'], readers=options['readers'], duration=options['duration'],
+                )
+        finally:
+            connection.close()
+            settings_dict['OPTIONS'] = original_options
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
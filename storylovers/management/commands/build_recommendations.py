@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from storylovers.recommendations import BLOCK_SIZE, NEIGHBOURS, build_neighbours
+
+
+class Command(BaseCommand):
+    help = "Rebuild each film's most similar films from FilmLog ratings, for the recommendations endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--neighbours', type=int, default=NEIGHBOURS, help="Neighbours to keep per film.")
+        parser.add_argument(
+            '--block-size', type=int, default=BLOCK_SIZE,
+            help="Films whose similarities are computed per sparse product; bounds memory use.",
+        )
+
+    def handle(self, *args, **options):
+        stored = build_neighbours(k=options['neighbours'], block_size=options['block_size'])
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} film neighbours."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from storylovers.trending import TRENDING_SIZE, compute_trending
+
+
+class Command(BaseCommand):
+    help = "Rank trending films from the last week of hourly log counts. Run periodically, e.g. every 15 minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=TRENDING_SIZE, help="Number of films to rank.")
+
+    def handle(self, *args, **options):
+        ranked = compute_trending(size=options['size'])
+        self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} trending films."))
@@ -0,0 +1,150 @@
+import csv
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from storylovers.models import Film, FilmLog
+from storylovers.search_cache import bump_generation
+
+
+TMDB_POSTER_BASE = 'https://image.tmdb.org/t/p/w1280'
+UPDATE_FIELDS = ['title', 'director', 'year', 'genre', 'country', 'decade', 'poster_url', 'updated_at']
+
+
+def _names(value):
+    """TMDB lists come as dicts with a name, plain strings, or one joined string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.replace('|', ',').split(',') if part.strip()]
+    return [item['name'] if isinstance(item, dict) else str(item) for item in value]
+
+
+def jsonl_rows(handle):
+    """Yield the object on each non-blank JSONL line, or None for a line that is not a JSON object."""
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+            continue
+        yield row if isinstance(row, dict) else None
+
+
+def film_from_row(row):
+    """
+    Build an unsaved Film from a CSV row or TMDB JSON object, or return None
+    if it lacks a title or a positive tmdb_id and year. Accepts both our own column names
+    and the TMDB movie payload (id, release_date, genres, credits, ...).
+    """
+    tmdb_id = row.get('tmdb_id') or row.get('id')
+    title = row.get('title') or row.get('original_title')
+    year = row.get('year') or (row.get('release_date') or '')[:4]
+    try:
+        tmdb_id, year = int(tmdb_id), int(year)
+    except (TypeError, ValueError):
+        return None
+    if not title or tmdb_id <= 0 or year < 0:
+        return None
+
+    director = row.get('director')
+    if not director:
+        crew = (row.get('credits') or {}).get('crew', [])
+        director = ', '.join(member['name'] for member in crew if member.get('job') == 'Director')
+
+    genres = _names(row.get('genre') or row.get('genres'))
+    countries = _names(row.get('country') or row.get('production_countries'))
+    poster_url = row.get('poster_url') or ''
+    if not poster_url and row.get('poster_path'):
+        poster_url = TMDB_POSTER_BASE + row['poster_path']
+
+    return Film(
+        tmdb_id=tmdb_id,
+        title=title[:255],
+        director=(director or '')[:255],
+        year=year,
+        genre=(genres[0] if genres else '')[:100],
+        country='/'.join(countries)[:100],
+        decade=Film.decade_for(year),
+        poster_url=poster_url,
+    )
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or JSONL (TMDB export) film catalog into Film with batched upserts on tmdb_id."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file; .gz files are decompressed on the fly.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.removesuffix('.gz').endswith('.csv') else 'jsonl')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            handle = opener(path, 'rt', encoding='utf-8', newline='')
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        started = time.monotonic()
+        imported = skipped = 0
+        # Keyed by tmdb_id so duplicates within a batch collapse to the
+        # last row; an upsert may not touch the same row twice.
+        batch = {}
+        with handle:
+            rows = csv.DictReader(handle) if fmt == 'csv' else jsonl_rows(handle)
+            for row in rows:
+                # A malformed line is skipped like a row missing its tmdb_id
+                film = film_from_row(row) if row is not None else None
+                if film is None:
+                    skipped += 1
+                    continue
+                batch[film.tmdb_id] = film
+                if len(batch) >= batch_size:
+                    imported += self.flush(batch)
+                    self.report(imported, skipped, started)
+            imported += self.flush(batch)
+
+        transaction.on_commit(bump_generation)
+        self.report(imported, skipped, started, final=True)
+
+    def flush(self, batch):
+        if not batch:
+            return 0
+        with transaction.atomic():
+            # The upsert skips Film.save, so logged films whose director,
+            # genre, country or decade changes get their logs' derived data
+            # re-keyed here, as a save would
+            logged = Film.objects.select_for_update().filter(
+                Exists(FilmLog.objects.filter(film=OuterRef('pk'))), tmdb_id__in=batch,
+            ).only('id', 'tmdb_id', *Film.CATALOG_FIELDS)
+            moved = [(film, batch[film.tmdb_id]) for film in logged]
+            moved = [(before, after) for before, after in moved if before.catalog_values() != after.catalog_values()]
+            Film.objects.bulk_create(
+                batch.values(),
+                update_conflicts=True,
+                unique_fields=['tmdb_id'],
+                update_fields=UPDATE_FIELDS,
+            )
+            for before, after in moved:
+                after.pk = before.pk
+                FilmLog.move_film_catalog(before, after)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    def report(self, imported, skipped, started, final=False):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        message = f"{imported} films upserted, {skipped} skipped ({imported / elapsed:.0f} rows/s)"
+        self.stdout.write(self.style.SUCCESS(message) if final else message)
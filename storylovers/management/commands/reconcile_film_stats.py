@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from storylovers.models import Film
+
+
+class Command(BaseCommand):
+    help = "Rebuild each film's log count, rating totals and histogram from FilmLog, fixing any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--film', dest='film_ids', action='append', type=int, default=[],
+            help="Only reconcile this Film id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        films = Film.objects.all()
+        if options['film_ids']:
+            films = films.filter(id__in=options['film_ids'])
+
+        with transaction.atomic():
+            drifted = Film.rebuild_log_stats(films)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {drifted} films with drifted stats."))
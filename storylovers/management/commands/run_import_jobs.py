@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from storylovers.imports import claim, run_import
+from storylovers.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Process pending diary import jobs. Runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit once no pending jobs are left.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to wait when idle.")
+
+    def handle(self, *args, **options):
+        while True:
+            pending = ImportJob.objects.filter(status=ImportJob.PENDING).order_by('created_at').values_list('id', flat=True)
+            job_ids = list(pending[:10])
+            for job_id in job_ids:
+                job = claim(job_id)
+                if job is None:
+                    continue  # Another worker got there first
+                run_import(job)
+                self.stdout.write(
+                    f"Import {job.id}: {job.status}, {job.imported_rows}/{job.total_rows} rows imported"
+                )
+            if not job_ids:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
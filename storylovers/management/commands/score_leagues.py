@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from storylovers.leagues import score_phase
+from storylovers.models import League
+
+
+class Command(BaseCommand):
+    help = "Score a phase for every league in a season and store the leaderboard snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', type=int, required=True)
+        parser.add_argument(
+            '--phase', choices=League.PHASES,
+            help="Phase to score. Defaults to each league's current phase.",
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.filter(season=options['season'])
+        if options['phase']:
+            batches = {options['phase']: leagues}
+        else:
+            batches = {
+                phase: leagues.filter(current_phase=phase)
+                for phase in League.PHASES
+            }
+
+        total = 0
+        for phase, phase_leagues in batches.items():
+            total += score_phase(phase_leagues.values('id'), phase)
+        self.stdout.write(self.style.SUCCESS(f"Stored {total} leaderboard entries."))
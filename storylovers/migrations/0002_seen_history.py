@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeenDirector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('director', models.CharField(max_length=255)),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('story_lover', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seen_directors', to='storylovers.storylover')),
+            ],
+            options={
+                'unique_together': {('story_lover', 'director')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SeenFilm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='storylovers.film')),
+                ('story_lover', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seen_films', to='storylovers.storylover')),
+            ],
+            options={
+                'unique_together': {('story_lover', 'film')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-18 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0002_seen_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmLogScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('film_log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='storylovers.filmlog')),
+                ('rubric', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='storylovers.rubric')),
+            ],
+            options={
+                'unique_together': {('film_log', 'rubric')},
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE storylovers_film_fts USING fts5(
+        title, director, country, genre,
+        content='storylovers_film', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER storylovers_film_fts_ai AFTER INSERT ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(rowid, title, director, country, genre)
+        VALUES (new.id, new.title, new.director, new.country, new.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER storylovers_film_fts_ad AFTER DELETE ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(storylovers_film_fts, rowid, title, director, country, genre)
+        VALUES ('delete', old.id, old.title, old.director, old.country, old.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER storylovers_film_fts_au AFTER UPDATE ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(storylovers_film_fts, rowid, title, director, country, genre)
+        VALUES ('delete', old.id, old.title, old.director, old.country, old.genre);
+        INSERT INTO storylovers_film_fts(rowid, title, director, country, genre)
+        VALUES (new.id, new.title, new.director, new.country, new.genre);
+    END
+    """,
+    "INSERT INTO storylovers_film_fts(storylovers_film_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_au",
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_ad",
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_ai",
+    "DROP TABLE IF EXISTS storylovers_film_fts",
+]
+
+# The tsvector expression must match storylovers.search.PG_SEARCH_VECTOR.
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX storylovers_film_search_idx ON storylovers_film USING gin ((
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(director, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(country, '') || ' ' || coalesce(genre, '')), 'C')
+    ))
+    """,
+    "CREATE INDEX storylovers_film_title_trgm_idx ON storylovers_film USING gin (title gin_trgm_ops)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS storylovers_film_title_trgm_idx",
+    "DROP INDEX IF EXISTS storylovers_film_search_idx",
+]
+
+
+def run(statements_by_vendor):
+    def apply(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0003_filmlogscore'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
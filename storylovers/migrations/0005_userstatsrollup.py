@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 16:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0004_film_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('film_count', models.PositiveIntegerField(default=0)),
+                ('rated_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('new_director_count', models.PositiveIntegerField(default=0)),
+                ('rewatch_count', models.PositiveIntegerField(default=0)),
+                ('genres', models.JSONField(default=dict)),
+                ('decades', models.JSONField(default=dict)),
+                ('countries', models.JSONField(default=dict)),
+                ('directors', models.JSONField(default=dict)),
+                ('story_lover', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats_rollups', to='storylovers.storylover')),
+            ],
+            options={
+                'unique_together': {('story_lover', 'year', 'month')},
+            },
+        ),
+    ]
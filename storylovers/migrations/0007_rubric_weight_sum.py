@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 19:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_weight_sums(apps, schema_editor):
+    Rubric = apps.get_model('storylovers', 'Rubric')
+    RubricCategory = apps.get_model('storylovers', 'RubricCategory')
+    totals = RubricCategory.objects.filter(rubric=models.OuterRef('pk')).values('rubric').annotate(
+        total=models.Sum('weight')
+    ).values('total')
+    Rubric.objects.update(weight_sum=Coalesce(models.Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rubric',
+            name='weight_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_weight_sums, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-18 19:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0007_rubric_weight_sum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmList',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('story_lover', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='film_lists', to='storylovers.storylover')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FilmListEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.BigIntegerField()),
+                ('note', models.TextField(blank=True)),
+                ('added_at', models.DateTimeField(auto_now_add=True)),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='list_entries', to='storylovers.film')),
+                ('film_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='storylovers.filmlist')),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['film_list', 'position'], name='storylovers_film_li_4365cc_idx')],
+                'unique_together': {('film_list', 'film')},
+            },
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 6.0 on 2026-10-18 20:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0008_film_lists'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FantasyFilm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('director', models.CharField(blank=True, max_length=200)),
+                ('genre', models.CharField(blank=True, max_length=100)),
+                ('release_date', models.DateField(blank=True, null=True)),
+                ('hype', models.PositiveIntegerField(default=0)),
+                ('film', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='storylovers.film')),
+            ],
+            options={
+                'ordering': ['release_date', 'title'],
+                'unique_together': {('season', 'title')},
+            },
+        ),
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('code', models.CharField(max_length=12, unique=True)),
+                ('season', models.PositiveIntegerField()),
+                ('current_phase', models.CharField(choices=[('q1', 'q1'), ('q2', 'q2'), ('q3', 'q3'), ('q4', 'q4'), ('globes', 'globes'), ('oscars', 'oscars'), ('complete', 'complete')], default='q1', max_length=10)),
+                ('draft_complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='owned_leagues', to='storylovers.storylover')),
+            ],
+            options={
+                'ordering': ['-season', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeagueMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='storylovers.league')),
+                ('story_lover', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='league_memberships', to='storylovers.storylover')),
+            ],
+            options={
+                'unique_together': {('league', 'story_lover')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FantasyFilmStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(choices=[('q1', 'q1'), ('q2', 'q2'), ('q3', 'q3'), ('q4', 'q4'), ('globes', 'globes'), ('oscars', 'oscars')], max_length=10)),
+                ('points', models.IntegerField(default=0)),
+                ('fantasy_film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='storylovers.fantasyfilm')),
+            ],
+            options={
+                'unique_together': {('fantasy_film', 'phase')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.CharField(choices=[('q1', 'q1'), ('q2', 'q2'), ('q3', 'q3'), ('q4', 'q4'), ('globes', 'globes'), ('oscars', 'oscars')], max_length=10)),
+                ('points', models.IntegerField()),
+                ('total_points', models.IntegerField()),
+                ('rank', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='storylovers.league')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='storylovers.leaguemember')),
+            ],
+            options={
+                'ordering': ['rank', 'member_id'],
+                'indexes': [models.Index(fields=['league', 'phase', 'rank'], name='storylovers_league__2ad51d_idx')],
+                'unique_together': {('league', 'phase', 'member')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaguePick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pick_number', models.PositiveIntegerField()),
+                ('picked_at', models.DateTimeField(auto_now_add=True)),
+                ('fantasy_film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='picks', to='storylovers.fantasyfilm')),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='picks', to='storylovers.league')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='picks', to='storylovers.leaguemember')),
+            ],
+            options={
+                'ordering': ['pick_number'],
+                'unique_together': {('league', 'member', 'fantasy_film'), ('league', 'pick_number')},
+            },
+        ),
+    ]
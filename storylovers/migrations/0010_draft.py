@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 20:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0009_leagues'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Draft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('live', 'Live'), ('done', 'Done')], default='pending', max_length=10)),
+                ('order', models.JSONField(default=list)),
+                ('rounds', models.PositiveIntegerField(default=5)),
+                ('current_pick', models.PositiveIntegerField(default=1)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('league', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='draft', to='storylovers.league')),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0010_draft'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('countries', models.JSONField(default=dict)),
+                ('decades', models.JSONField(default=dict)),
+                ('genres', models.JSONField(default=dict)),
+                ('new_director_count', models.PositiveIntegerField(default=0)),
+                ('unlocked', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('story_lover', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='quest_progress', to='storylovers.storylover')),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0011_quest_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingFilm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(unique=True)),
+                ('score', models.FloatField()),
+                ('week_count', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('film', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='storylovers.film')),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='storylovers.film')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='storylovers_hour_406a09_idx')],
+                'unique_together': {('film', 'hour')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-18 16:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0012_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity', models.FloatField()),
+                ('film', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='storylovers.film')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='storylovers.film')),
+            ],
+            options={
+                'unique_together': {('film', 'neighbour')},
+            },
+        ),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 6.0 on 2026-10-18 17:40
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+# Adding NOT NULL columns makes SQLite rebuild storylovers_film, which drops
+# the FTS triggers from 0004_film_search_index. Recreate them, with the update
+# trigger limited to the indexed columns so log stat updates skip the index.
+SQLITE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_ai",
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_ad",
+    "DROP TRIGGER IF EXISTS storylovers_film_fts_au",
+    """
+    CREATE TRIGGER storylovers_film_fts_ai AFTER INSERT ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(rowid, title, director, country, genre)
+        VALUES (new.id, new.title, new.director, new.country, new.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER storylovers_film_fts_ad AFTER DELETE ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(storylovers_film_fts, rowid, title, director, country, genre)
+        VALUES ('delete', old.id, old.title, old.director, old.country, old.genre);
+    END
+    """,
+    """
+    CREATE TRIGGER storylovers_film_fts_au AFTER UPDATE OF title, director, country, genre
+    ON storylovers_film BEGIN
+        INSERT INTO storylovers_film_fts(storylovers_film_fts, rowid, title, director, country, genre)
+        VALUES ('delete', old.id, old.title, old.director, old.country, old.genre);
+        INSERT INTO storylovers_film_fts(rowid, title, director, country, genre)
+        VALUES (new.id, new.title, new.director, new.country, new.genre);
+    END
+    """,
+    "INSERT INTO storylovers_film_fts(storylovers_film_fts) VALUES ('rebuild')",
+]
+
+HISTOGRAM_FIELDS = [f'ratings_{rating}' for rating in range(1, 11)]
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in SQLITE_TRIGGERS:
+            schema_editor.execute(sql)
+
+
+def fill_log_stats(apps, schema_editor):
+    Film = apps.get_model('storylovers', 'Film')
+    FilmLog = apps.get_model('storylovers', 'FilmLog')
+    totals = FilmLog.objects.values('film_id').annotate(
+        log_count=models.Count('id'),
+        rating_count=models.Count('rating'),
+        rating_sum=Coalesce(models.Sum('rating'), 0),
+        **{f'ratings_{rating}': models.Count('id', filter=models.Q(rating=rating)) for rating in range(1, 11)},
+    ).order_by()
+    films = [Film(id=row.pop('film_id'), **row) for row in totals.iterator()]
+    Film.objects.bulk_update(films, ['log_count', 'rating_count', 'rating_sum', *HISTOGRAM_FIELDS], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storylovers', '0013_film_neighbours'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after the column removals rebuild the table again
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name='film',
+            name='log_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_10',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_6',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_7',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_8',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='film',
+            name='ratings_9',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_log_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,13 @@
+import copy
 import uuid
-from django.db import models
+from collections import Counter, defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from django.db import models, router, transaction
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 
 
 class StoryLover(models.Model):
@@ -27,6 +33,22 @@ class StoryLover(models.Model):
         return self.display_name
 
 
+def save_kwargs_without(instance, excluded, kwargs):
+    """
+    The ``save()`` kwargs for updating ``instance`` without writing the
+    ``excluded`` fields, which other writers keep current with UPDATEs of
+    F() expressions. A full save of an instance loaded before those
+    UPDATEs would otherwise write its stale values back over them. Inserts,
+    including copies into another database, still write every field.
+    """
+    using = kwargs.get('using') or router.db_for_write(type(instance), instance=instance)
+    if instance._state.adding or kwargs.get('force_insert') or using != instance._state.db:
+        return kwargs
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None:
+        update_fields = [field.name for field in instance._meta.concrete_fields if not field.primary_key]
+    return {**kwargs, 'update_fields': [name for name in update_fields if name not in excluded]}
+
 
 class Film(models.Model):
     """
@@ -41,16 +63,38 @@ class Film(models.Model):
     decade = models.CharField(max_length=10, blank=True)  # e.g., "2020s"
     tmdb_id = models.PositiveIntegerField(null=True, blank=True, unique=True)
     poster_url = models.URLField(blank=True)
+
+    # Community stats over every story_lover's logs, kept current by
+    # update_log_stats and rebuilt by the reconcile_film_stats command
+    log_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    ratings_1 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_2 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_3 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_4 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_5 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_6 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_7 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_8 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_9 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_10 = models.PositiveIntegerField(default=0, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    HISTOGRAM_FIELDS = [f'ratings_{rating}' for rating in range(1, 11)]
+    LOG_STATS_FIELDS = ['log_count', 'rating_count', 'rating_sum', *HISTOGRAM_FIELDS]
+    # Fields the seen-director index, rollups and quests of its logs are keyed by
+    CATALOG_FIELDS = ['director', 'genre', 'country', 'decade']
+
     class Meta:
         ordering = ['-year', 'title']
         indexes = [
             models.Index(fields=['title']),
             models.Index(fields=['director']),
             models.Index(fields=['year']),
+            models.Index(fields=['title', 'year']),
         ]
 
     def __str__(self):
@@ -59,8 +103,114 @@ class Film(models.Model):
     def save(self, *args, **kwargs):
         # Auto-populate decade from year
         if self.year:
-            self.decade = f"{(self.year // 10) * 10}s"
-        super().save(*args, **kwargs)
+            self.decade = self.decade_for(self.year)
+        # Only update_log_stats and rebuild_log_stats write the stats
+        kwargs = save_kwargs_without(self, self.LOG_STATS_FIELDS, kwargs)
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or (update_fields is not None and not set(self.CATALOG_FIELDS) & set(update_fields)):
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            # Locking the row also reads it from the primary
+            before = Film.objects.select_for_update().only('id', *self.CATALOG_FIELDS).filter(pk=self.pk).first()
+            super().save(*args, **kwargs)
+            if before is not None and before.catalog_values() != self.catalog_values():
+                FilmLog.move_film_catalog(before, self)
+
+    def catalog_values(self):
+        return tuple(getattr(self, field) for field in self.CATALOG_FIELDS)
+
+    @staticmethod
+    def decade_for(year):
+        return f"{(year // 10) * 10}s"
+
+    @property
+    def avg_rating(self):
+        return round(self.rating_sum / self.rating_count, 1) if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        return [getattr(self, field) for field in self.HISTOGRAM_FIELDS]
+
+    @classmethod
+    def update_log_stats(cls, changes):
+        """
+        Apply ``(film_id, rating, sign)`` changes to the community stats:
+        sign=1 counts a log, sign=-1 uncounts one, so an edit is the old
+        values out and the new ones in. One UPDATE of F() expressions for
+        all films, so concurrent writers never lose a count.
+        """
+        deltas = defaultdict(Counter)
+        for film_id, rating, sign in changes:
+            delta = deltas[film_id]
+            delta['log_count'] += sign
+            if rating is not None:
+                delta['rating_count'] += sign
+                delta['rating_sum'] += sign * rating
+                delta[f'ratings_{rating}'] += sign
+        updates = defaultdict(list)
+        for film_id, delta in deltas.items():
+            for field, change in delta.items():
+                if change:
+                    updates[field].append(models.When(pk=film_id, then=Greatest(
+                        models.F(field) + change, 0, output_field=models.PositiveIntegerField(),
+                    )))
+        if updates:
+            cls.objects.filter(pk__in=deltas).update(**{
+                field: models.Case(*whens, default=models.F(field)) for field, whens in updates.items()
+            })
+
+    @classmethod
+    def rebuild_log_stats(cls, films=None, chunk_size=2000):
+        """
+        Recompute the community stats of ``films`` (a queryset, default
+        all) from their logs, a chunk of films at a time, and write the
+        ones that drifted; returns how many did. Must run in a transaction:
+        each chunk is locked before its logs are counted, so a log written
+        meanwhile is either counted here or has its update_log_stats delta
+        applied on top of the rebuilt row once the lock is released.
+        """
+        films = (cls.objects.all() if films is None else films).only('id', *cls.LOG_STATS_FIELDS).order_by('pk')
+        empty = dict.fromkeys(cls.LOG_STATS_FIELDS, 0)
+        drifted = 0
+        last_pk = 0
+        while True:
+            chunk = list(films.select_for_update().filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                return drifted
+            last_pk = chunk[-1].pk
+            totals = {
+                row.pop('film_id'): row
+                for row in FilmLog.objects.filter(film_id__in=[film.pk for film in chunk]).values('film_id').annotate(
+                    log_count=models.Count('id'),
+                    rating_count=models.Count('rating'),
+                    rating_sum=Coalesce(models.Sum('rating'), 0),
+                    **{
+                        f'ratings_{rating}': models.Count('id', filter=models.Q(rating=rating))
+                        for rating in range(1, 11)
+                    },
+                ).order_by()
+            }
+            changed = []
+            for film in chunk:
+                expected = totals.get(film.id, empty)
+                if any(getattr(film, field) != value for field, value in expected.items()):
+                    for field, value in expected.items():
+                        setattr(film, field, value)
+                    changed.append(film)
+            cls.objects.bulk_update(changed, cls.LOG_STATS_FIELDS, batch_size=500)
+            drifted += len(changed)
+
+
+class RubricQuerySet(models.QuerySet):
+    def with_total_weight(self):
+        """
+        Annotate each rubric with ``total_weight_value`` summed from its
+        categories in the same query, bypassing the stored ``weight_sum``.
+        """
+        return self.annotate(
+            total_weight_value=Coalesce(models.Sum('categories__weight'), 0)
+        )
 
 
 class Rubric(models.Model):
@@ -72,7 +222,12 @@ class Rubric(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     is_default = models.BooleanField(default=False)
-    
+    # Sum of the categories' weights, kept current by the RubricCategory
+    # signals so listings can show validity without an aggregate per rubric.
+    weight_sum = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = RubricQuerySet.as_manager()
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -84,14 +239,92 @@ class Rubric(models.Model):
         return f"{self.name} ({self.story_lover.display_name})"
 
     def save(self, *args, **kwargs):
-        # Ensure only one default rubric per story_lover
+        # Ensure only one default rubric per story_lover. Leave this one out,
+        # so it is not switched off and straight back on.
         if self.is_default:
-            Rubric.objects.filter(story_lover=self.story_lover, is_default=True).update(is_default=False)
-        super().save(*args, **kwargs)
+            Rubric.objects.filter(
+                story_lover=self.story_lover, is_default=True
+            ).exclude(pk=self.pk).update(is_default=False)
+        # Only the RubricCategory signals, recompute_weight_sums and
+        # save_with_categories write weight_sum
+        super().save(*args, **save_kwargs_without(self, ['weight_sum'], kwargs))
+
+    def save_with_categories(self, categories):
+        """
+        Save this rubric and replace its categories in one transaction.
+
+        ``categories`` are dicts of ``name``, ``weight`` and optionally
+        ``order`` and ``id``; an ``id`` of an existing category updates it,
+        anything else is created, and categories left out are deleted.
+        Weights are validated in memory, including the 100% total, before
+        anything is written; raises ValidationError otherwise.
+        """
+        existing = {category.id: category for category in self.categories.all()} if self.pk else {}
+        to_create, to_update, reweighted, names = [], [], [], set()
+        for order, data in enumerate(categories):
+            category = existing.get(data.get('id'))
+            if category is None:
+                category = RubricCategory(rubric=self)
+                to_create.append(category)
+            else:
+                to_update.append(category)
+            old_weight = category.weight
+            category.name = data.get('name', '')
+            category.weight = data.get('weight')
+            category.order = data.get('order', order)
+            category.clean_fields(exclude=['rubric'])
+            if category.pk and category.weight != old_weight:
+                reweighted.append(category.pk)
+            if category.name in names:
+                raise ValidationError(f"Duplicate category {category.name!r}.")
+            names.add(category.name)
+
+        total = sum(category.weight for category in [*to_create, *to_update])
+        if total != 100:
+            raise ValidationError(f"Category weights must total 100, not {total}.")
+
+        kept = {category.id for category in to_update}
+        removed = [pk for pk in existing if pk not in kept]
+        with transaction.atomic():
+            # Deleted first so their names can be reused; their signals
+            # recompute weight_sum, which is then written explicitly below.
+            if removed:
+                RubricCategory.objects.filter(pk__in=removed).delete()
+            self.weight_sum = total
+            adding = self._state.adding
+            self.save()
+            if not adding:
+                Rubric.objects.filter(pk=self.pk).update(weight_sum=total)
+            if to_update:
+                RubricCategory.objects.bulk_update(to_update, ['name', 'weight', 'order'])
+            if to_create:
+                RubricCategory.objects.bulk_create(to_create)
+            if reweighted:
+                # bulk_update skips the signal that rescores rated logs
+                FilmLogScore.recompute(
+                    RubricRating.objects.filter(category_id__in=reweighted).values('film_log_id')
+                )
+        self._prefetched_objects_cache = {'categories': sorted(to_update + to_create, key=lambda c: c.order)}
+        return self
 
     @property
     def total_weight(self):
-        return self.categories.aggregate(total=models.Sum('weight'))['total'] or 0
+        if hasattr(self, 'total_weight_value'):
+            return self.total_weight_value
+        return self.weight_sum
+
+    @classmethod
+    def recompute_weight_sums(cls, rubric_ids):
+        """
+        Refresh ``weight_sum`` for many rubrics with one UPDATE. Needed after
+        category writes that skip signals, such as bulk_create.
+        """
+        totals = RubricCategory.objects.filter(rubric=models.OuterRef('pk')).values('rubric').annotate(
+            total=models.Sum('weight')
+        ).values('total')
+        return cls.objects.filter(pk__in=rubric_ids).update(
+            weight_sum=Coalesce(models.Subquery(totals), 0)
+        )
 
     @property
     def is_valid(self):
@@ -118,6 +351,43 @@ class RubricCategory(models.Model):
         return f"{self.name} ({self.weight}%)"
 
 
+class FilmLogQuerySet(models.QuerySet):
+    def with_weighted_score(self):
+        """
+        Annotate each log with ``weighted_score_value`` in the same query, so
+        reading ``weighted_score`` over a list of logs costs no extra queries.
+        """
+        first_score = FilmLogScore.objects.filter(film_log=models.OuterRef('pk')).order_by('rubric_id')
+        return self.annotate(weighted_score_value=models.Subquery(first_score.values('score')[:1]))
+
+    def create_batch(self, story_lover, entries):
+        """
+        Log many films for one story_lover in a single transaction.
+
+        ``entries`` are dicts of FilmLog field values with ``film`` set to a
+        Film instance. The new-director and rewatch flags are computed in
+        memory against one read of the seen-history index, in entry order,
+        and the logs are inserted with a single bulk_create.
+        """
+        logs = [self.model(story_lover=story_lover, **entry) for entry in entries]
+        if not logs:
+            return logs
+        with transaction.atomic():
+            new_directors = SeenDirector.record_many(story_lover, [log.film.director for log in logs])
+            first_watches = SeenFilm.record_many(story_lover, [log.film_id for log in logs])
+            for log, is_new_director, first_watch in zip(logs, new_directors, first_watches):
+                log.is_new_director = is_new_director
+                log.is_rewatch = not first_watch
+            self.bulk_create(logs)
+            UserStatsRollup.record_many(story_lover.id, [(log, log.film) for log in logs])
+            QuestProgress.record_many(story_lover.id, [(log, log.film) for log in logs])
+            TrendingBucket.record_many([(log.film_id, log.watched_at) for log in logs])
+            Film.update_log_stats([(log.film_id, log.rating, 1) for log in logs])
+        for log in logs:
+            log._stored = log.tracked_values()
+        return logs
+
+
 class FilmLog(models.Model):
     """
     A story lover's log entry for a film they've watched.
@@ -152,13 +422,15 @@ class FilmLog(models.Model):
     mood = models.CharField(max_length=20, choices=MOOD_CHOICES, blank=True)
     
     # Tracking for stats
-    watched_at = models.DateTimeField(auto_now_add=True)
+    watched_at = models.DateTimeField(default=timezone.now)
     is_new_director = models.BooleanField(default=False)
     is_rewatch = models.BooleanField(default=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FilmLogQuerySet.as_manager()
+
     class Meta:
         ordering = ['-watched_at']
         indexes = [
@@ -169,51 +441,176 @@ class FilmLog(models.Model):
     def __str__(self):
         return f"{self.story_lover.display_name} - {self.film.title}"
 
+    # Fields the derived data (seen history, rollups, quests, trending and
+    # film stats) depends on; edits to them are applied to all of it.
+    TRACKED_FIELDS = ('film_id', 'rating', 'watched_at', 'is_new_director', 'is_rewatch')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        log = super().from_db(db, field_names, values)
+        if set(cls.TRACKED_FIELDS) <= log.__dict__.keys():
+            log._stored = log.tracked_values()
+        return log
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        stored = getattr(self, '_stored', None)
+        if stored is not None:
+            refreshed = None if fields is None else {self._meta.get_field(f).attname for f in fields}
+            self._stored = tuple(
+                getattr(self, field) if refreshed is None or field in refreshed else value
+                for field, value in zip(self.TRACKED_FIELDS, stored)
+            )
+        elif fields is None and set(self.TRACKED_FIELDS) <= self.__dict__.keys():
+            self._stored = self.tracked_values()
+
+    def tracked_values(self):
+        return tuple(getattr(self, field) for field in self.TRACKED_FIELDS)
+
+    def stored_version(self):
+        """A copy of this log as its last load or save left it in the database."""
+        if getattr(self, '_stored', None) is None:
+            return self
+        stored = copy.copy(self)
+        for field, value in zip(self.TRACKED_FIELDS, self._stored):
+            setattr(stored, field, value)
+        return stored
+
     def save(self, *args, **kwargs):
         # Check if this is a new entry (not yet in database)
         is_new = self._state.adding
         
         if is_new:
-            # Check if this is a new director for the story_lover
-            existing_directors = FilmLog.objects.filter(
-                story_lover=self.story_lover
-            ).values_list('film__director', flat=True).distinct()
-            self.is_new_director = self.film.director not in existing_directors
-            
-            # Check if rewatch
-            self.is_rewatch = FilmLog.objects.filter(
-                story_lover=self.story_lover, 
-                film=self.film
-            ).exists()
-        
-        super().save(*args, **kwargs)
+            with transaction.atomic():
+                # Bumping the seen-history counters tells us whether this is a
+                # new director or a rewatch without scanning the diary.
+                self.is_new_director = SeenDirector.record(self.story_lover, self.film.director)
+                self.is_rewatch = not SeenFilm.record(self.story_lover, self.film_id)
+                super().save(*args, **kwargs)
+                UserStatsRollup.record(self)
+                QuestProgress.record(self)
+                TrendingBucket.record(self)
+                Film.update_log_stats([(self.film_id, self.rating, 1)])
+            self._stored = self.tracked_values()
+            return
+
+        update_fields = kwargs.get('update_fields')
+        tracked = update_fields is None or {'film', *self.TRACKED_FIELDS} & set(update_fields)
+        if getattr(self, '_stored', None) in (None, self.tracked_values()) or not tracked:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            old = self.stored_version()
+            film_changed = old.film_id != self.film_id
+            if film_changed:
+                SeenDirector.forget(self.story_lover_id, old.film.director)
+                SeenFilm.forget(self.story_lover_id, old.film_id)
+                SeenDirector.record(self.story_lover, self.film.director)
+                SeenFilm.record(self.story_lover, self.film_id)
+            super().save(*args, **kwargs)
+            # Take the stored version out of everything derived and put this one in
+            UserStatsRollup.forget(old, film=old.film)
+            UserStatsRollup.record(self)
+            if film_changed or old.is_new_director != self.is_new_director:
+                QuestProgress.forget(old, film=old.film)
+                QuestProgress.record(self)
+            if film_changed or old.watched_at != self.watched_at:
+                TrendingBucket.forget(old)
+                TrendingBucket.record(self)
+            Film.update_log_stats([(old.film_id, old.rating, -1), (self.film_id, self.rating, 1)])
+            if film_changed:
+                # This log left one film and director and joined another, so
+                # the first log of each (this one included) may have changed
+                changed = FilmLog.refresh_flags(
+                    self.story_lover_id,
+                    film_ids=[old.film_id, self.film_id],
+                    directors={old.film.director, self.film.director},
+                )
+                for log in changed:
+                    if log.pk == self.pk:
+                        self.is_new_director, self.is_rewatch = log.is_new_director, log.is_rewatch
+        self._stored = self.tracked_values()
+
+    @classmethod
+    def move_film_catalog(cls, before, film):
+        """
+        Re-key the derived data of every log of ``film`` after its director,
+        genre, country or decade changed from those of ``before``: the
+        rollups and quest progress take each log out under the old values
+        and back in under the new ones, and a new director moves the logs'
+        seen-director counts and re-derives is_new_director for both
+        directors. Call inside the transaction that saved ``film``.
+        """
+        by_story_lover = defaultdict(list)
+        for log in cls.objects.filter(film_id=film.pk).order_by('created_at', 'id'):
+            by_story_lover[log.story_lover_id].append(log)
+        for story_lover_id, logs in by_story_lover.items():
+            UserStatsRollup.record_many(story_lover_id, [(log, before) for log in logs], sign=-1)
+            UserStatsRollup.record_many(story_lover_id, [(log, film) for log in logs])
+            QuestProgress.record_many(story_lover_id, [(log, before) for log in logs], sign=-1)
+            QuestProgress.record_many(story_lover_id, [(log, film) for log in logs])
+            if before.director != film.director:
+                for _ in logs:
+                    SeenDirector.forget(story_lover_id, before.director)
+                SeenDirector.record_many(StoryLover(pk=story_lover_id), [film.director] * len(logs))
+                cls.refresh_flags(story_lover_id, directors={before.director, film.director})
+
+    @classmethod
+    def refresh_flags(cls, story_lover_id, film_ids=(), directors=()):
+        """
+        Re-derive is_rewatch on a story_lover's logs of ``film_ids`` and
+        is_new_director on their logs of films by ``directors``: the first
+        of each in creation order, the order the flags are assigned in, is
+        the first watch or new director and the rest are not. Reads only
+        those logs through the (story_lover, film) index, writes only the
+        ones whose flags change and moves their rollups and quest progress
+        with them. Returns the changed logs.
+        """
+        groups = [('is_rewatch', models.Q(film_id=film_id), False) for film_id in film_ids]
+        # Resolve each director's films through the director index first: a
+        # join on film__director makes SQLite walk the whole diary instead
+        directed = defaultdict(list)
+        if directors:
+            for director, film_id in Film.objects.filter(director__in=directors).values_list('director', 'id'):
+                directed[director].append(film_id)
+        groups += [
+            ('is_new_director', models.Q(film_id__in=directed[director]), True)
+            for director in directors if directed[director]
+        ]
+        changed, previous = {}, {}
+        for flag, lookup, first_value in groups:
+            logs = cls.objects.filter(lookup, story_lover_id=story_lover_id).select_related('film').order_by(
+                'created_at', 'id'
+            )
+            for position, log in enumerate(logs):
+                log = changed.get(log.pk, log)
+                value = first_value if position == 0 else not first_value
+                if getattr(log, flag) != value:
+                    previous.setdefault(log.pk, copy.copy(log))
+                    changed[log.pk] = log
+                    setattr(log, flag, value)
+        if not changed:
+            return []
+
+        logs = list(changed.values())
+        old = [(previous[log.pk], log.film) for log in logs]
+        new = [(log, log.film) for log in logs]
+        cls.objects.bulk_update(logs, ['is_new_director', 'is_rewatch'])
+        UserStatsRollup.record_many(story_lover_id, old, sign=-1)
+        UserStatsRollup.record_many(story_lover_id, new)
+        QuestProgress.record_many(story_lover_id, old, sign=-1)
+        QuestProgress.record_many(story_lover_id, new)
+        for log in logs:
+            log._stored = log.tracked_values()
+        return logs
 
     @property
     def weighted_score(self):
-        """Calculate weighted score from rubric ratings."""
-        rubric_ratings = self.rubric_ratings.select_related('category__rubric').all()
-        
-        if not rubric_ratings:
-            return None
-        
-        # Group by rubric
-        rubric_scores = {}
-        for rr in rubric_ratings:
-            rubric_id = rr.category.rubric_id
-            if rubric_id not in rubric_scores:
-                rubric_scores[rubric_id] = {
-                    'total_weighted': 0,
-                    'total_weight': 0
-                }
-            rubric_scores[rubric_id]['total_weighted'] += rr.rating * rr.category.weight
-            rubric_scores[rubric_id]['total_weight'] += rr.category.weight
-        
-        # Return first rubric's score (or could return all)
-        for rubric_id, data in rubric_scores.items():
-            if data['total_weight'] > 0:
-                return round(data['total_weighted'] / data['total_weight'], 1)
-        
-        return None
+        """Weighted score from rubric ratings, read from the materialized FilmLogScore."""
+        if hasattr(self, 'weighted_score_value'):
+            return self.weighted_score_value
+        return self.scores.order_by('rubric_id').values_list('score', flat=True).first()
 
 
 class RubricRating(models.Model):
@@ -232,3 +629,804 @@ class RubricRating(models.Model):
 
     def __str__(self):
         return f"{self.film_log.film.title} - {self.category.name}: {self.rating}"
+
+    @classmethod
+    def record_many(cls, film_log, ratings):
+        """
+        Upsert ``[(category, rating), ...]`` for one log with a single
+        INSERT ... ON CONFLICT and rescore it in the same transaction.
+        Ratings are validated in memory first; returns the log's
+        FilmLogScore rows.
+        """
+        rows = [cls(film_log=film_log, category=category, rating=rating) for category, rating in ratings]
+        for row in rows:
+            row.clean_fields(exclude=['film_log', 'category'])
+        with transaction.atomic():
+            # bulk_create skips the post_save receiver, so rescore here
+            cls.objects.bulk_create(
+                rows, update_conflicts=True,
+                unique_fields=['film_log', 'category'], update_fields=['rating'],
+            )
+            return FilmLogScore.recompute([film_log.pk])
+
+
+class FilmLogScore(models.Model):
+    """
+    Materialized weighted score of a film log under one rubric.
+    Kept in sync by the RubricRating and RubricCategory signal receivers.
+    """
+    film_log = models.ForeignKey(FilmLog, on_delete=models.CASCADE, related_name='scores')
+    rubric = models.ForeignKey(Rubric, on_delete=models.CASCADE, related_name='scores')
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ['film_log', 'rubric']
+
+    def __str__(self):
+        return f"{self.film_log_id} - {self.rubric_id}: {self.score}"
+
+    @classmethod
+    def recompute(cls, film_log_ids):
+        """
+        Recompute the scores of many logs with one grouped aggregate over
+        their rubric ratings. ``film_log_ids`` may be a list or a queryset.
+        """
+        totals = RubricRating.objects.filter(film_log_id__in=film_log_ids).values(
+            'film_log_id', 'category__rubric_id'
+        ).annotate(
+            weighted=models.Sum(models.F('rating') * models.F('category__weight')),
+            weight=models.Sum('category__weight'),
+        ).order_by()
+        scores = [
+            cls(
+                film_log_id=row['film_log_id'],
+                rubric_id=row['category__rubric_id'],
+                score=round(row['weighted'] / row['weight'], 1),
+            )
+            for row in totals if row['weight']
+        ]
+        with transaction.atomic():
+            cls.objects.filter(film_log_id__in=film_log_ids).delete()
+            cls.objects.bulk_create(scores)
+        return scores
+
+
+class SeenCounter(models.Model):
+    """
+    Base for per-story_lover "have they logged this before" indexes: one row
+    per key with the number of logs for it, so checks are a single lookup.
+    """
+    key_field = None
+
+    log_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def record(cls, story_lover, key):
+        """Count one more log of ``key``. Returns True if it was unseen."""
+        updated = cls.objects.filter(
+            story_lover=story_lover, **{cls.key_field: key}
+        ).update(log_count=models.F('log_count') + 1)
+        if not updated:
+            cls.objects.create(story_lover=story_lover, log_count=1, **{cls.key_field: key})
+        return not updated
+
+    @classmethod
+    def record_many(cls, story_lover, keys):
+        """
+        Count one log per entry of ``keys``, in order, with one read and bulk
+        writes. Returns an "unseen" flag per entry. Call inside a transaction.
+        """
+        rows = {
+            getattr(row, cls.key_field): row
+            for row in cls.objects.select_for_update().filter(
+                story_lover=story_lover, **{f'{cls.key_field}__in': set(keys)}
+            )
+        }
+        existing = list(rows.values())
+        unseen = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = cls(story_lover=story_lover, log_count=0, **{cls.key_field: key})
+            unseen.append(row.log_count == 0)
+            row.log_count += 1
+        cls.objects.bulk_update(existing, ['log_count'])
+        cls.objects.bulk_create([row for row in rows.values() if row.pk is None])
+        return unseen
+
+    @classmethod
+    def forget(cls, story_lover_id, key):
+        """Count one less log of ``key``, dropping the row at zero."""
+        lookup = {'story_lover_id': story_lover_id, cls.key_field: key}
+        updated = cls.objects.filter(
+            log_count__gt=1, **lookup
+        ).update(log_count=models.F('log_count') - 1)
+        if not updated:
+            cls.objects.filter(**lookup).delete()
+
+
+class SeenDirector(SeenCounter):
+    """
+    Per-story_lover index of directors they have logged, used for
+    new-director checks.
+    """
+    key_field = 'director'
+
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='seen_directors')
+    director = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ['story_lover', 'director']
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} - {self.director} ({self.log_count})"
+
+
+class SeenFilm(SeenCounter):
+    """
+    Per-story_lover index of films they have logged, used for rewatch checks.
+    """
+    key_field = 'film_id'
+
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='seen_films')
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['story_lover', 'film']
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} - {self.film.title} ({self.log_count})"
+
+
+class UserStatsRollup(models.Model):
+    """
+    Precomputed diary stats for one story_lover and period, maintained
+    incrementally as logs are created and deleted.
+
+    ``month == 0`` is the whole year and ``year == 0`` is all time. The
+    per-value counters let distinct counts be decremented on delete.
+    """
+    WHOLE_PERIOD = 0
+    COUNTERS = ['genres', 'decades', 'countries', 'directors']
+
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='stats_rollups')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    film_count = models.PositiveIntegerField(default=0)
+    rated_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    new_director_count = models.PositiveIntegerField(default=0)
+    rewatch_count = models.PositiveIntegerField(default=0)
+    genres = models.JSONField(default=dict)
+    decades = models.JSONField(default=dict)
+    countries = models.JSONField(default=dict)
+    directors = models.JSONField(default=dict)
+
+    class Meta:
+        unique_together = ['story_lover', 'year', 'month']
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} - {self.year}/{self.month}: {self.film_count}"
+
+    @staticmethod
+    def counter_values(film):
+        return {
+            'genres': [film.genre] if film.genre else [],
+            'decades': [film.decade] if film.decade else [],
+            'countries': [c.strip() for c in film.country.split('/') if c.strip()],
+            'directors': [film.director] if film.director else [],
+        }
+
+    @staticmethod
+    def periods(watched_at):
+        return [
+            (watched_at.year, watched_at.month),
+            (watched_at.year, UserStatsRollup.WHOLE_PERIOD),
+            (UserStatsRollup.WHOLE_PERIOD, UserStatsRollup.WHOLE_PERIOD),
+        ]
+
+    def apply(self, log, film, sign=1):
+        """Add (sign=1) or remove (sign=-1) one log from this rollup."""
+        self.film_count = max(self.film_count + sign, 0)
+        if log.rating is not None:
+            self.rated_count = max(self.rated_count + sign, 0)
+            self.rating_sum = max(self.rating_sum + sign * log.rating, 0)
+        if log.is_new_director:
+            self.new_director_count = max(self.new_director_count + sign, 0)
+        if log.is_rewatch:
+            self.rewatch_count = max(self.rewatch_count + sign, 0)
+        for name, values in self.counter_values(film).items():
+            counter = getattr(self, name)
+            for value in values:
+                count = counter.get(value, 0) + sign
+                if count > 0:
+                    counter[value] = count
+                else:
+                    counter.pop(value, None)
+
+    @classmethod
+    def record(cls, log, sign=1, film=None):
+        """Apply one log to its month, year and all-time rollups in one transaction."""
+        cls.record_many(log.story_lover_id, [(log, film or log.film)], sign)
+
+    @classmethod
+    def record_many(cls, story_lover_id, logs_and_films, sign=1):
+        """Apply many ``(log, film)`` pairs of one story_lover with one read and bulk writes."""
+        periods = {period for log, _ in logs_and_films for period in cls.periods(log.watched_at)}
+        with transaction.atomic():
+            existing = {
+                (rollup.year, rollup.month): rollup
+                for rollup in cls.objects.select_for_update().filter(
+                    story_lover_id=story_lover_id,
+                    year__in={year for year, _ in periods},
+                    month__in={month for _, month in periods},
+                )
+            }
+            created = {}
+            for log, film in logs_and_films:
+                for year, month in cls.periods(log.watched_at):
+                    rollup = existing.get((year, month)) or created.get((year, month))
+                    if rollup is None:
+                        if sign < 0:
+                            # Nothing to remove from; also avoids recreating rows
+                            # while the story_lover is being cascade-deleted.
+                            continue
+                        rollup = created[(year, month)] = cls(
+                            story_lover_id=story_lover_id, year=year, month=month
+                        )
+                    rollup.apply(log, film, sign)
+            cls.objects.bulk_update(existing.values(), [
+                'film_count', 'rated_count', 'rating_sum', 'new_director_count', 'rewatch_count', *cls.COUNTERS,
+            ])
+            cls.objects.bulk_create(created.values())
+
+    @classmethod
+    def forget(cls, log, film=None):
+        cls.record(log, sign=-1, film=film)
+
+    def as_dict(self):
+        top_genres = sorted(self.genres.items(), key=lambda item: (-item[1], item[0]))[:5]
+        return {
+            'year': self.year,
+            'month': self.month,
+            'total_films': self.film_count,
+            'avg_rating': round(self.rating_sum / self.rated_count, 1) if self.rated_count else None,
+            'genres': len(self.genres),
+            'decades': len(self.decades),
+            'countries': len(self.countries),
+            'directors': len(self.directors),
+            'new_directors': self.new_director_count,
+            'rewatches': self.rewatch_count,
+            'genre_breakdown': [{'genre': genre, 'count': count} for genre, count in top_genres],
+        }
+
+
+class QuestProgress(models.Model):
+    """
+    A story_lover's quest progress, maintained incrementally as logs are
+    created and deleted so the quests page is a single-row read.
+
+    The country, decade and genre counters hold the number of logs per
+    value, so the distinct sets shrink correctly on delete. Quests unlock
+    in the same write that reaches their goal and stay unlocked.
+    """
+    QUESTS = [
+        {
+            'key': 'world_cinema_explorer',
+            'title': "World Cinema Explorer",
+            'description': "Watch films from 10 different countries",
+            'counter': 'countries',
+            'goal': 10,
+            'reward': "Unlock international cinema badge",
+        },
+        {
+            'key': 'decade_jumper',
+            'title': "Decade Jumper",
+            'description': "Watch at least one film from each decade (1920s-2020s)",
+            'counter': 'decades',
+            # Only these count, so a 1910s film is no step towards the goal
+            'values': [f'{decade}s' for decade in range(1920, 2030, 10)],
+            'goal': 11,
+            'reward': "Unlock time traveler badge",
+        },
+        {
+            'key': 'genre_master',
+            'title': "Genre Master",
+            'description': "Watch films across all major genres",
+            'counter': 'genres',
+            'goal': 8,
+            'reward': "Unlock versatile viewer badge",
+        },
+        {
+            'key': 'new_directors',
+            'title': "New Directors",
+            'description': "Discover 20 directors you've never watched before",
+            'counter': 'new_director_count',
+            'goal': 20,
+            'reward': "Unlock discovery badge",
+        },
+    ]
+    COUNTERS = ['countries', 'decades', 'genres']
+
+    story_lover = models.OneToOneField(StoryLover, on_delete=models.CASCADE, related_name='quest_progress')
+    countries = models.JSONField(default=dict)
+    decades = models.JSONField(default=dict)
+    genres = models.JSONField(default=dict)
+    new_director_count = models.PositiveIntegerField(default=0)
+    # Quest key -> ISO timestamp of the unlock
+    unlocked = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} - {len(self.unlocked)} quests unlocked"
+
+    def progress(self, quest):
+        value = getattr(self, quest['counter'])
+        if not isinstance(value, dict):
+            return value
+        return len(value.keys() & set(quest['values'])) if 'values' in quest else len(value)
+
+    def apply(self, log, film, sign=1):
+        """
+        Add (sign=1) or remove (sign=-1) one log and unlock any quest whose
+        goal is now reached. Returns the keys of newly unlocked quests.
+        """
+        if log.is_new_director:
+            self.new_director_count = max(self.new_director_count + sign, 0)
+        values = UserStatsRollup.counter_values(film)
+        for name in self.COUNTERS:
+            counter = getattr(self, name)
+            for value in values[name]:
+                count = counter.get(value, 0) + sign
+                if count > 0:
+                    counter[value] = count
+                else:
+                    counter.pop(value, None)
+
+        unlocked = []
+        for quest in self.QUESTS:
+            if quest['key'] not in self.unlocked and self.progress(quest) >= quest['goal']:
+                self.unlocked[quest['key']] = timezone.now().isoformat()
+                unlocked.append(quest['key'])
+        return unlocked
+
+    @classmethod
+    def record(cls, log, sign=1, film=None):
+        return cls.record_many(log.story_lover_id, [(log, film or log.film)], sign)
+
+    @classmethod
+    def record_many(cls, story_lover_id, logs_and_films, sign=1):
+        """
+        Apply many ``(log, film)`` pairs of one story_lover with one locked
+        read and one write. Returns the keys of newly unlocked quests.
+        """
+        with transaction.atomic():
+            progress = cls.objects.select_for_update().filter(story_lover_id=story_lover_id).first()
+            if progress is None:
+                if sign < 0:
+                    # Nothing to remove from, e.g. the story_lover is being cascade-deleted
+                    return []
+                progress = cls(story_lover_id=story_lover_id)
+            unlocked = []
+            for log, film in logs_and_films:
+                unlocked += progress.apply(log, film, sign)
+            progress.save()
+        return unlocked
+
+    @classmethod
+    def forget(cls, log, film=None):
+        cls.record(log, sign=-1, film=film)
+
+    def as_dict(self):
+        return {
+            'quests': [
+                {
+                    'key': quest['key'],
+                    'title': quest['title'],
+                    'description': quest['description'],
+                    'progress': min(self.progress(quest), quest['goal']),
+                    'goal': quest['goal'],
+                    'reward': quest['reward'],
+                    'unlocked_at': self.unlocked.get(quest['key']),
+                }
+                for quest in self.QUESTS
+            ],
+        }
+
+
+class TrendingBucket(models.Model):
+    """
+    Number of logs of a film watched within one UTC hour, maintained as
+    logs are created and deleted. Only the last ``RETENTION`` is counted,
+    so backdated diary imports skip it; compute_trending prunes old hours
+    and ranks films from the rest (see storylovers/trending.py).
+    """
+    RETENTION = timedelta(days=8)
+
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='+')
+    hour = models.DateTimeField()
+    log_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['film', 'hour']
+        indexes = [models.Index(fields=['hour'])]
+
+    def __str__(self):
+        return f"{self.film_id} @ {self.hour:%Y-%m-%d %H}:00: {self.log_count}"
+
+    @staticmethod
+    def hour_of(when):
+        return when.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def record(cls, log, sign=1):
+        cls.record_many([(log.film_id, log.watched_at)], sign)
+
+    @classmethod
+    def record_many(cls, film_times, sign=1):
+        """
+        Count (sign=1) or uncount (sign=-1) logs given as
+        ``(film_id, watched_at)`` pairs with one INSERT and one UPDATE.
+        """
+        cutoff = timezone.now() - cls.RETENTION
+        counts = Counter((film_id, cls.hour_of(when)) for film_id, when in film_times if when >= cutoff)
+        if not counts:
+            return
+        with transaction.atomic():
+            if sign > 0:
+                # Concurrent writers may insert the same bucket; whoever loses just increments it
+                cls.objects.bulk_create(
+                    [cls(film_id=film_id, hour=hour) for film_id, hour in counts], ignore_conflicts=True,
+                )
+            cls.objects.filter(
+                film_id__in={film_id for film_id, _ in counts}, hour__in={hour for _, hour in counts},
+            ).update(log_count=models.Case(
+                *[
+                    models.When(film_id=film_id, hour=hour, then=Greatest(
+                        models.F('log_count') + sign * count, 0, output_field=models.PositiveIntegerField(),
+                    ))
+                    for (film_id, hour), count in counts.items()
+                ],
+                default=models.F('log_count'),
+            ))
+
+    @classmethod
+    def forget(cls, log):
+        cls.record(log, sign=-1)
+
+
+class TrendingFilm(models.Model):
+    """
+    The current trending ranking, rebuilt from TrendingBucket rows by
+    the compute_trending command.
+    """
+    film = models.OneToOneField(Film, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveIntegerField(unique=True)
+    score = models.FloatField()
+    week_count = models.PositiveIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return f"#{self.rank} {self.film_id} ({self.score:.2f})"
+
+
+class FilmNeighbour(models.Model):
+    """
+    One of a film's most similar films by user ratings, precomputed by
+    the build_recommendations command (see storylovers/recommendations.py).
+    """
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='+')
+    similarity = models.FloatField()
+
+    class Meta:
+        unique_together = ['film', 'neighbour']
+
+    def __str__(self):
+        return f"{self.film_id} ~ {self.neighbour_id}: {self.similarity:.3f}"
+
+
+class ImportJob(models.Model):
+    """
+    A diary import (e.g. a Letterboxd diary.csv) processed in the background.
+    Clients poll it for progress instead of holding a request open.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+    MAX_ERRORS = 100
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='import_jobs')
+    file = models.FileField(upload_to='imports/')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    # Row-level problems (unmatched films, bad ratings), capped at MAX_ERRORS
+    errors = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} - {self.status} ({self.processed_rows}/{self.total_rows})"
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total_rows': self.total_rows,
+            'processed_rows': self.processed_rows,
+            'imported_rows': self.imported_rows,
+            'errors': self.errors,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class FilmList(models.Model):
+    """
+    A curated, ordered collection of films (e.g. "Late Night Comfort Watches").
+    """
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='film_lists')
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.title} ({self.story_lover.display_name})"
+
+    def end_position(self):
+        last = self.entries.aggregate(last=models.Max('position'))['last']
+        return (last or 0) + FilmListEntry.POSITION_STEP
+
+    def position_after(self, after=None, exclude=None):
+        """
+        A position between ``after`` (None for the start of the list) and
+        the entry that follows it, so inserting or moving an entry writes
+        only that row. Renumbers the list when the gap has run out.
+        """
+        entries = self.entries.exclude(pk=exclude) if exclude else self.entries.all()
+        lower = after.position if after is not None else 0
+        upper = entries.filter(position__gt=lower).order_by('position').values_list('position', flat=True).first()
+        if upper is None:
+            return lower + FilmListEntry.POSITION_STEP
+        if upper - lower < 2:
+            self.renumber()
+            if after is not None:
+                after.refresh_from_db(fields=['position'])
+            return self.position_after(after, exclude)
+        return (lower + upper) // 2
+
+    def renumber(self):
+        """Spread every entry back out to POSITION_STEP intervals."""
+        entries = list(self.entries.order_by('position', 'pk'))
+        for index, entry in enumerate(entries, start=1):
+            entry.position = index * FilmListEntry.POSITION_STEP
+        FilmListEntry.objects.bulk_update(entries, ['position'])
+
+
+class FilmListEntry(models.Model):
+    """
+    One film's place in a FilmList. Positions are sparse integers, so a
+    film can be placed between two others by taking the midpoint.
+    """
+    POSITION_STEP = 1024
+
+    film_list = models.ForeignKey(FilmList, on_delete=models.CASCADE, related_name='entries')
+    film = models.ForeignKey(Film, on_delete=models.CASCADE, related_name='list_entries')
+    position = models.BigIntegerField()
+    note = models.TextField(blank=True)
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['position']
+        unique_together = ['film_list', 'film']
+        indexes = [
+            models.Index(fields=['film_list', 'position']),
+        ]
+
+    def __str__(self):
+        return f"{self.film_list.title} #{self.position}: {self.film.title}"
+
+
+class League(models.Model):
+    """
+    A fantasy film league for one awards season. Members pick upcoming
+    films and score the points those films earn in each phase.
+    """
+    PHASES = ['q1', 'q2', 'q3', 'q4', 'globes', 'oscars']
+    COMPLETE = 'complete'
+    PHASE_CHOICES = [(phase, phase) for phase in PHASES] + [(COMPLETE, COMPLETE)]
+
+    name = models.CharField(max_length=200)
+    code = models.CharField(max_length=12, unique=True)
+    season = models.PositiveIntegerField()
+    owner = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='owned_leagues')
+    current_phase = models.CharField(max_length=10, choices=PHASE_CHOICES, default='q1')
+    draft_complete = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-season', 'name']
+
+    def __str__(self):
+        return f"{self.name} ({self.season})"
+
+    @classmethod
+    def phases_through(cls, phase):
+        """The phases up to and including ``phase``, for running totals."""
+        return cls.PHASES[:cls.PHASES.index(phase) + 1]
+
+
+class LeagueMember(models.Model):
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='members')
+    story_lover = models.ForeignKey(StoryLover, on_delete=models.CASCADE, related_name='league_memberships')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['league', 'story_lover']
+
+    def __str__(self):
+        return f"{self.story_lover.display_name} in {self.league.name}"
+
+
+class FantasyFilm(models.Model):
+    """
+    An upcoming release that can be drafted in a season's leagues, with
+    its points per phase in FantasyFilmStat.
+    """
+    season = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    director = models.CharField(max_length=200, blank=True)
+    genre = models.CharField(max_length=100, blank=True)
+    release_date = models.DateField(null=True, blank=True)
+    hype = models.PositiveIntegerField(default=0)
+    film = models.ForeignKey(Film, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        ordering = ['release_date', 'title']
+        unique_together = ['season', 'title']
+
+    def __str__(self):
+        return f"{self.title} ({self.season})"
+
+
+class FantasyFilmStat(models.Model):
+    fantasy_film = models.ForeignKey(FantasyFilm, on_delete=models.CASCADE, related_name='stats')
+    phase = models.CharField(max_length=10, choices=[(phase, phase) for phase in League.PHASES])
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['fantasy_film', 'phase']
+
+    def __str__(self):
+        return f"{self.fantasy_film.title} {self.phase}: {self.points}"
+
+
+class LeaguePick(models.Model):
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='picks')
+    member = models.ForeignKey(LeagueMember, on_delete=models.CASCADE, related_name='picks')
+    fantasy_film = models.ForeignKey(FantasyFilm, on_delete=models.CASCADE, related_name='picks')
+    pick_number = models.PositiveIntegerField()
+    picked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['pick_number']
+        unique_together = [['league', 'member', 'fantasy_film'], ['league', 'pick_number']]
+
+    def __str__(self):
+        return f"#{self.pick_number} {self.fantasy_film.title}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    A member's standing after one phase, written by leagues.score_phase so
+    reading a leaderboard is a single range scan on (league, phase, rank).
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='leaderboard')
+    phase = models.CharField(max_length=10, choices=[(phase, phase) for phase in League.PHASES])
+    member = models.ForeignKey(LeagueMember, on_delete=models.CASCADE, related_name='standings')
+    points = models.IntegerField()
+    total_points = models.IntegerField()
+    rank = models.PositiveIntegerField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['rank', 'member_id']
+        unique_together = ['league', 'phase', 'member']
+        indexes = [
+            models.Index(fields=['league', 'phase', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.league.name} {self.phase} #{self.rank}: {self.member_id}"
+
+    def as_dict(self):
+        return {
+            'member_id': self.member_id,
+            'name': self.member.story_lover.display_name,
+            'points': self.points,
+            'total_points': self.total_points,
+            'rank': self.rank,
+        }
+
+
+class Draft(models.Model):
+    """
+    A league's snake draft. ``version`` goes up with every state change and
+    picks are committed with a conditional UPDATE on it, so two requests
+    racing for the same turn cannot both succeed and no row locks are held.
+    """
+    PENDING = 'pending'
+    LIVE = 'live'
+    DONE = 'done'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (LIVE, 'Live'),
+        (DONE, 'Done'),
+    ]
+
+    league = models.OneToOneField(League, on_delete=models.CASCADE, related_name='draft')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    # LeagueMember ids in first-round order; even rounds run in reverse
+    order = models.JSONField(default=list)
+    rounds = models.PositiveIntegerField(default=5)
+    current_pick = models.PositiveIntegerField(default=1)
+    version = models.PositiveIntegerField(default=0)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.league.name} draft ({self.status}, pick {self.current_pick})"
+
+    @property
+    def total_picks(self):
+        return len(self.order) * self.rounds
+
+    def member_for_pick(self, pick_number):
+        """The LeagueMember id on the clock for ``pick_number`` (1-based)."""
+        round_index, slot = divmod(pick_number - 1, len(self.order))
+        if round_index % 2:
+            slot = len(self.order) - 1 - slot
+        return self.order[slot]
+
+    def as_dict(self):
+        return {
+            'league_id': self.league_id,
+            'status': self.status,
+            'order': self.order,
+            'rounds': self.rounds,
+            'current_pick': self.current_pick,
+            'on_the_clock': self.member_for_pick(self.current_pick) if self.status == self.LIVE else None,
+            'version': self.version,
+        }
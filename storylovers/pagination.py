@@ -0,0 +1,92 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a ``limit`` query parameter, clamped to ``1..maximum``."""
+    if raw in (None, ''):
+        return default
+    limit = int(raw)
+    if limit < 1:
+        raise ValueError("Limit must be positive")
+    return min(limit, maximum)
+
+
+def encode_cursor(*values):
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    Datetimes are stored as ISO strings, everything else with str().
+    """
+    parts = [v.isoformat() if isinstance(v, datetime) else str(v) for v in values]
+    raw = '|'.join(parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, count):
+    """Decode a cursor produced by encode_cursor into ``count`` string parts."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(str(e))
+    if len(parts) != count:
+        raise InvalidCursor("Malformed cursor")
+    return parts
+
+
+def keyset_queryset(queryset, field, cursor, limit, parse=datetime.fromisoformat, descending=True):
+    """
+    Order ``queryset`` by ``(field, pk)`` and seek past ``cursor``, fetching
+    one extra row so the caller can tell whether another page follows.
+
+    Seeking on the sort key instead of using OFFSET keeps every page an
+    index range scan, no matter how deep into the results it is.
+    """
+    direction, lookup = ('-', 'lt') if descending else ('', 'gt')
+    queryset = queryset.order_by(f'{direction}{field}', f'{direction}pk')
+    if cursor:
+        value, pk = decode_cursor(cursor, 2)
+        try:
+            value = parse(value)
+        except (TypeError, ValueError, ArithmeticError):
+            raise InvalidCursor("Malformed cursor")
+        queryset = queryset.filter(
+            Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'pk__{lookup}': pk})
+        )
+    return queryset[:limit + 1]
+
+
+def finish_page(rows, field, limit):
+    """Trim the look-ahead row and build the next cursor from the last row kept."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return rows, next_cursor
+
+
+def keyset_page(queryset, field, cursor, limit, **kwargs):
+    """
+    Return one page of ``queryset`` ordered by ``(field, pk)`` starting after
+    ``cursor``, plus the cursor for the next page (or None on the last page).
+    """
+    rows = list(keyset_queryset(queryset, field, cursor, limit, **kwargs))
+    return finish_page(rows, field, limit)
+
+
+async def akeyset_page(queryset, field, cursor, limit, **kwargs):
+    """Async keyset_page, fetching the page with ``async for``."""
+    rows = [row async for row in keyset_queryset(queryset, field, cursor, limit, **kwargs)]
+    return finish_page(rows, field, limit)
@@ -0,0 +1,142 @@
+"""
+Item-item film recommendations.
+
+``build_neighbours`` runs offline, from the ``build_recommendations``
+command. It streams every rated FilmLog into a sparse story_lover x film
+matrix and centres each row on that story_lover's mean rating. It then
+computes the adjusted cosine similarity of every pair of films with
+sparse matrix products, one block of films at a time. Each similarity is
+damped by ``co / (co + SHRINKAGE)``, where ``co`` is the number of
+story_lovers who rated both films, so pairs with only a couple of shared
+raters cannot reach the top. Each film's ``NEIGHBOURS`` most similar
+films replace the FilmNeighbour table.
+
+``recommend`` answers requests from those rows alone. It takes the
+story_lover's recent well-rated logs as seeds and merges the seeds'
+neighbour lists, weighting each seed by how much they liked it, then
+drops films they have already logged. That costs two indexed queries and
+no matrix work at request time.
+"""
+from array import array
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+
+from .models import FilmLog, FilmNeighbour, SeenFilm
+from .search import serialize_film
+
+
+BLOCK_SIZE = 1024
+NEIGHBOURS = 20
+SEED_LOGS = 20
+SEED_MIN_RATING = 7
+SHRINKAGE = 5
+
+
+def rating_matrix(chunk_size=5000):
+    """
+    The centred story_lover x film rating matrix (CSR) and the film id of
+    each column, built in one streaming pass over the rated logs. A
+    rewatched film counts once, with the mean of its ratings.
+    """
+    rows, cols, ratings = array('q'), array('q'), array('d')
+    story_lovers, films = {}, {}
+    logs = FilmLog.objects.filter(rating__isnull=False).values_list(
+        'story_lover_id', 'film_id', 'rating'
+    ).order_by()
+    for story_lover_id, film_id, rating in logs.iterator(chunk_size=chunk_size):
+        rows.append(story_lovers.setdefault(story_lover_id, len(story_lovers)))
+        cols.append(films.setdefault(film_id, len(films)))
+        ratings.append(rating)
+
+    shape = (len(story_lovers), len(films))
+    coords = (np.frombuffer(rows, dtype=np.int64), np.frombuffer(cols, dtype=np.int64))
+    ratings = np.frombuffer(ratings, dtype=np.float64)
+    # Both conversions sum duplicate entries into the same sparsity structure
+    matrix = sparse.csr_matrix((ratings, coords), shape=shape)
+    counts = sparse.csr_matrix((np.ones_like(ratings), coords), shape=shape)
+    matrix.sort_indices()
+    counts.sort_indices()
+    matrix.data /= counts.data
+
+    per_row = np.diff(matrix.indptr)
+    means = np.divide(
+        np.asarray(matrix.sum(axis=1)).ravel(), per_row, out=np.zeros(shape[0]), where=per_row > 0,
+    )
+    matrix.data -= np.repeat(means, per_row)
+    return matrix, list(films)
+
+
+def top_neighbours(matrix, k=NEIGHBOURS, block_size=BLOCK_SIZE):
+    """
+    Yield ``(film, neighbour, similarity)`` column indices of each film's
+    ``k`` most similar films, keeping positive similarities only.
+    """
+    columns = matrix.tocsc()
+    norms = np.sqrt(np.asarray(columns.multiply(columns).sum(axis=0)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = (columns @ sparse.diags(inverse)).tocsc()
+    normalized_t = normalized.T.tocsr()
+    rated = columns.copy()
+    rated.data[:] = 1.0
+    rated_t = rated.T.tocsr()
+
+    for start in range(0, columns.shape[1], block_size):
+        similarities = normalized_t[start:start + block_size] @ normalized
+        shared = rated_t[start:start + block_size] @ rated
+        shared.data = shared.data / (shared.data + SHRINKAGE)
+        block = similarities.multiply(shared).tocsr()
+        for offset in range(block.shape[0]):
+            film = start + offset
+            begin, end = block.indptr[offset], block.indptr[offset + 1]
+            neighbours, scores = block.indices[begin:end], block.data[begin:end]
+            keep = (neighbours != film) & (scores > 0)
+            neighbours, scores = neighbours[keep], scores[keep]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                neighbours, scores = neighbours[top], scores[top]
+            for neighbour, score in zip(neighbours.tolist(), scores.tolist()):
+                yield film, neighbour, min(score, 1.0)
+
+
+def build_neighbours(k=NEIGHBOURS, block_size=BLOCK_SIZE, batch_size=1000):
+    """Rebuild every film's FilmNeighbour rows from the current ratings; returns the row count."""
+    matrix, film_ids = rating_matrix()
+    rows = [
+        FilmNeighbour(film_id=film_ids[film], neighbour_id=film_ids[neighbour], similarity=similarity)
+        for film, neighbour, similarity in top_neighbours(matrix, k, block_size)
+    ] if film_ids else []
+    with transaction.atomic():
+        FilmNeighbour.objects.all().delete()
+        FilmNeighbour.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def recommend(story_lover, limit=10):
+    """
+    Films ``story_lover`` has not logged, ranked by the neighbour lists of
+    their recent logs rated at least SEED_MIN_RATING.
+    """
+    seeds = {}
+    recent = FilmLog.objects.filter(
+        story_lover=story_lover, rating__gte=SEED_MIN_RATING
+    ).order_by('-watched_at').values_list('film_id', 'rating')[:SEED_LOGS]
+    for film_id, rating in recent:
+        # A rewatch counts with its latest rating
+        seeds.setdefault(film_id, rating)
+    if not seeds:
+        return []
+
+    neighbours = FilmNeighbour.objects.filter(film_id__in=seeds).exclude(
+        neighbour_id__in=SeenFilm.objects.filter(story_lover=story_lover).values('film_id')
+    ).select_related('neighbour')
+    scores, films = defaultdict(float), {}
+    for row in neighbours:
+        # A 10 counts four times as much as a SEED_MIN_RATING of 7
+        scores[row.neighbour_id] += row.similarity * (seeds[row.film_id] - SEED_MIN_RATING + 1)
+        films[row.neighbour_id] = row.neighbour
+    ranked = sorted(scores, key=lambda film_id: (-scores[film_id], film_id))[:limit]
+    return [{**serialize_film(films[film_id]), 'score': round(scores[film_id], 3)} for film_id in ranked]
@@ -0,0 +1,105 @@
+"""
+Ranked prefix search over the film catalog.
+
+SQLite uses the ``storylovers_film_fts`` FTS5 table and PostgreSQL a GIN
+tsvector index plus a pg_trgm title index; both are created by migration
+0004_film_search_index (SQLite triggers recreated in 0014_film_log_stats)
+and kept in sync with storylovers_film at the database level, so
+Film.save, bulk_create and raw updates are all covered.
+Other backends fall back to a title ``icontains`` scan.
+"""
+import re
+
+from django.db import connections, router
+
+from .models import Film
+
+
+FTS_TABLE = 'storylovers_film_fts'
+
+# Must match the expression indexed in migration 0004_film_search_index.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(director, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(country, '') || ' ' || coalesce(genre, '')), 'C')"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(q):
+    """Split a raw query into lowercase word tokens, dropping punctuation."""
+    return _TOKEN_RE.findall(q.lower())
+
+
+def _sqlite_ids(connection, tokens, limit):
+    # Every token is a quoted prefix term, ANDed together; title matches
+    # weigh more than director, which weigh more than country and genre.
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    sql = (
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+        f"ORDER BY bm25({FTS_TABLE}, 10.0, 4.0, 1.0, 1.0) LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _postgresql_ids(connection, q, tokens, limit):
+    tsquery = ' & '.join(f'{token}:*' for token in tokens)
+    sql = (
+        f"SELECT id FROM storylovers_film "
+        f"WHERE ({PG_SEARCH_VECTOR}) @@ to_tsquery('simple', %s) "
+        f"ORDER BY ts_rank({PG_SEARCH_VECTOR}, to_tsquery('simple', %s)) DESC, "
+        f"similarity(title, %s) DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [tsquery, tsquery, q, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_films(q, limit=10):
+    """Return up to ``limit`` films matching every word prefix in ``q``, best first."""
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    # Raw SQL bypasses the router, so ask it which database to read from
+    using = router.db_for_read(Film)
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        ids = _sqlite_ids(connection, tokens, limit)
+    elif connection.vendor == 'postgresql':
+        ids = _postgresql_ids(connection, q, tokens, limit)
+    else:
+        return list(Film.objects.using(using).filter(title__icontains=q)[:limit])
+
+    films = Film.objects.using(using).in_bulk(ids)
+    return [films[pk] for pk in ids if pk in films]
+
+
+def serialize_film(film):
+    return {**serialize_catalog_film(film), **serialize_log_stats(film)}
+
+
+def serialize_catalog_film(film):
+    """The catalog fields of ``film``, which change only when the Film is saved."""
+    return {
+        'id': film.id,
+        'title': film.title,
+        'director': film.director,
+        'country': film.country,
+        'year': film.year,
+        'genre': film.genre,
+        'decade': film.decade,
+    }
+
+
+def serialize_log_stats(film):
+    """The community stats of ``film``, which change with every log."""
+    return {
+        'log_count': film.log_count,
+        'avg_rating': film.avg_rating,
+        'rating_count': film.rating_count,
+        'rating_histogram': film.rating_histogram,
+    }
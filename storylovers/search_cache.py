@@ -0,0 +1,147 @@
+"""
+Two-level cache for film autocomplete results.
+
+Results are keyed by the normalized query, so "Past  Li" and "past li"
+share an entry. Each process keeps a bounded LRU in front of Django's
+cache framework (locmem, file, Redis, ...), and both levels are keyed by
+a catalog generation number that is bumped whenever a Film is saved or
+deleted, which invalidates every entry at once.
+
+The generation lives in Django's cache, so a bump only reaches the
+processes that share it. With the default per-process LocMemCache, a
+bump from ``import_films`` or another worker is never seen by the web
+processes, which keep serving their old entries; set ``CACHE_URL`` to a
+shared cache (cinevous/caches.py) wherever more than one process runs.
+
+Entries hold the films' community stats as well, so a hit costs no
+query. Those change with every log without bumping the generation, so
+every entry expires ``FILM_SEARCH_CACHE_TIMEOUT`` seconds after it was
+built, which bounds how stale the counts can get; the ETag covers them.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .search import search_films, serialize_film, tokenize
+
+
+GENERATION_KEY = 'film_search:generation'
+LOCAL_CACHE_SIZE = getattr(settings, 'FILM_SEARCH_LOCAL_CACHE_SIZE', 2048)
+CACHE_TIMEOUT = getattr(settings, 'FILM_SEARCH_CACHE_TIMEOUT', 60)
+
+
+def normalize_query(q):
+    return ' '.join(tokenize(q))
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses a
+        # generation that stale local entries are still keyed by.
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+async def aget_generation():
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def etag_for(generation, key, limit, results=()):
+    stats = ';'.join(f"{film['id']}:{film['log_count']}:{film['rating_histogram']}" for film in results)
+    digest = hashlib.md5(f'{generation}:{limit}:{key}:{stats}'.encode()).hexdigest()
+    return f'"{digest}"'
+
+
+class LRUCache:
+    """A small thread-safe least-recently-used map with a fixed capacity."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_local = LRUCache(LOCAL_CACHE_SIZE)
+
+
+def _shared_key(generation, key, limit):
+    return 'film_search:' + etag_for(generation, key, limit).strip('"')
+
+
+def _fresh(entry):
+    return entry is not None and entry[0] > time.time()
+
+
+def _entry(films):
+    # Expiry travels with the entry, so a copy taken into the local cache
+    # expires with the shared one
+    return time.time() + CACHE_TIMEOUT, [serialize_film(film) for film in films]
+
+
+def cached_search_films(key, generation, limit=10):
+    """Serialized search results, stats included, for an already-normalized query ``key``."""
+    local_key = (generation, key, limit)
+    entry = _local.get(local_key)
+    if not _fresh(entry):
+        shared_key = _shared_key(generation, key, limit)
+        entry = cache.get(shared_key)
+        if not _fresh(entry):
+            entry = _entry(search_films(key, limit=limit))
+            cache.set(shared_key, entry, CACHE_TIMEOUT)
+        _local.put(local_key, entry)
+    return list(entry[1])
+
+
+async def acached_search_films(key, generation, limit=10):
+    """Async cached_search_films: local hits never leave the event loop."""
+    local_key = (generation, key, limit)
+    entry = _local.get(local_key)
+    if not _fresh(entry):
+        shared_key = _shared_key(generation, key, limit)
+        entry = await cache.aget(shared_key)
+        if not _fresh(entry):
+            entry = _entry(await sync_to_async(search_films)(key, limit=limit))
+            await cache.aset(shared_key, entry, CACHE_TIMEOUT)
+        _local.put(local_key, entry)
+    return list(entry[1])
+
+
+def clear_local_cache():
+    _local.clear()
@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    Film, FilmLog, FilmLogScore, QuestProgress, Rubric, RubricCategory, RubricRating, SeenDirector, SeenFilm,
+    TrendingBucket, UserStatsRollup,
+)
+from .search_cache import bump_generation
+
+
+@receiver(post_delete, sender=FilmLog)
+def forget_deleted_film_log(sender, instance, **kwargs):
+    """
+    Keep the seen-history index, rollups, quests, trending and film stats in
+    step with deleted logs, and pass a deleted first watch or new-director
+    log's flag on to the next log of that film or director.
+    """
+    log = instance.stored_version()
+    try:
+        film = log.film
+    except Film.DoesNotExist:
+        # The film itself is being deleted; its SeenFilm rows cascade with it
+        # and the director index, rollups and quests are repaired by the backfill commands.
+        return
+    SeenDirector.forget(log.story_lover_id, film.director)
+    SeenFilm.forget(log.story_lover_id, log.film_id)
+    UserStatsRollup.forget(log, film=film)
+    QuestProgress.forget(log, film=film)
+    TrendingBucket.forget(log)
+    Film.update_log_stats([(log.film_id, log.rating, -1)])
+    FilmLog.refresh_flags(
+        log.story_lover_id,
+        film_ids=[] if log.is_rewatch else [log.film_id],
+        directors=[film.director] if log.is_new_director else [],
+    )
+
+
+@receiver(post_save, sender=RubricRating)
+@receiver(post_delete, sender=RubricRating)
+def rescore_rated_film_log(sender, instance, **kwargs):
+    FilmLogScore.recompute([instance.film_log_id])
+
+
+@receiver(post_save, sender=RubricCategory)
+@receiver(post_delete, sender=RubricCategory)
+def update_rubric_weight_sum(sender, instance, **kwargs):
+    Rubric.recompute_weight_sums([instance.rubric_id])
+    if RubricCategory.rubric.is_cached(instance):
+        # Keep the caller's Rubric instance in step with the row
+        instance.rubric.refresh_from_db(fields=['weight_sum'])
+
+
+@receiver(post_save, sender=RubricCategory)
+def rescore_category_film_logs(sender, instance, created, **kwargs):
+    """A category's weight feeds every score that uses it."""
+    if created:
+        return
+    FilmLogScore.recompute(
+        RubricRating.objects.filter(category=instance).values('film_log_id')
+    )
+
+
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+def invalidate_film_search_cache(sender, **kwargs):
+    # After commit, or a search in between could cache the old catalog
+    # under the new generation
+    transaction.on_commit(bump_generation)
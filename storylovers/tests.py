@@ -1,10 +1,44 @@
-from django.test import TestCase
-from django.contrib.auth.models import User
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from unittest.mock import AsyncMock
+from uuid import UUID
+from django.conf import settings
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import AnonymousUser, User
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, router
+from django.db.models import Sum
+from django.utils import timezone
 from storylovers.models import (
-    StoryLover, Film, Rubric, RubricCategory, FilmLog, RubricRating
+    StoryLover, Film, Rubric, RubricCategory, FilmLog, RubricRating,
+    SeenDirector, SeenFilm, FilmLogScore, UserStatsRollup, ImportJob, FilmList, FilmListEntry,
+    League, LeagueMember, FantasyFilm, FantasyFilmStat, LeaguePick, LeaderboardEntry, Draft, QuestProgress,
+    TrendingBucket, TrendingFilm, FilmNeighbour,
 )
+from storylovers import benchmark, imports, search_cache
+from storylovers.leagues import score_phase
+from storylovers.recommendations import build_neighbours, recommend
+from asgiref.sync import sync_to_async
+from storylovers.async_views import AsyncDraftEventsView, AsyncFilmLogView, AsyncFilmView
+from storylovers.drafts import StaleDraft, make_pick, scheduler, start_draft
+from storylovers.search import search_films
+from storylovers.search_cache import get_generation
+from storylovers.trending import compute_trending
+from cinevous.caches import cache_config
+from cinevous.databases import database_profile, sqlite_database
+from cinevous.routers import PIN_COOKIE, ReplicaPinMiddleware
+from cinevous.metrics import JsonResponse, RequestMetricsMiddleware, registry
 
 
 class StoryLoverModelTest(TestCase):
@@ -548,3 +582,1826 @@ class RubricRatingModelTest(TestCase):
                 category=self.category,
                 rating=9
             )
+
+
+class FilmLogViewTest(TestCase):
+    """Tests for the diary API pagination and export"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.client.force_login(self.user)
+        self.logs = []
+        for i in range(5):
+            film = Film.objects.create(title=f'Film {i}', director=f'Director {i}', year=2020)
+            self.logs.append(FilmLog.objects.create(story_lover=self.story_lover, film=film, rating=7))
+
+    def test_cursor_pagination_walks_every_log_once(self):
+        """Test that following next_cursor returns every log newest first"""
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get('/api/filmlogs/', params).json()
+            self.assertLessEqual(len(data['film_logs']), 2)
+            seen.extend(log['id'] for log in data['film_logs'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        expected = FilmLog.objects.order_by('-watched_at', '-id').values_list('id', flat=True)
+        self.assertEqual(seen, [str(pk) for pk in expected])
+
+    def test_page_is_constant_query_count(self):
+        """Test that a page of logs is fetched without per-row queries"""
+        with self.assertNumQueries(4):  # session, user, story lover, page
+            self.client.get('/api/filmlogs/', {'limit': 5})
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        response = self.client.get('/api/filmlogs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_export_streams_all_logs(self):
+        """Test that the NDJSON export contains one line per log"""
+        response = self.client.get('/api/filmlogs/', {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['title'], 'Film 4')
+
+
+class SeenHistoryTest(TestCase):
+    """Tests for the seen-director and seen-film index"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        self.film1 = Film.objects.create(title='Film 1', director='Agnes Varda', year=1962)
+        self.film2 = Film.objects.create(title='Film 2', director='Agnes Varda', year=1985)
+
+    def test_counters_track_logs(self):
+        """Test that logging films maintains per-director and per-film counts"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film2)
+
+        seen = SeenDirector.objects.get(story_lover=self.story_lover, director='Agnes Varda')
+        self.assertEqual(seen.log_count, 3)
+        self.assertEqual(SeenFilm.objects.get(story_lover=self.story_lover, film=self.film1).log_count, 2)
+
+    def test_save_does_not_scan_history(self):
+        """Test that logging a film costs the same queries whatever the history size"""
+        def queries_for_rewatch():
+            with CaptureQueriesContext(connection) as ctx:
+                FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+            return len(ctx.captured_queries)
+
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        short_history = queries_for_rewatch()
+        for _ in range(10):
+            FilmLog.objects.create(story_lover=self.story_lover, film=self.film2)
+        self.assertEqual(queries_for_rewatch(), short_history)
+
+    def test_delete_makes_director_new_again(self):
+        """Test that deleting the only log of a director forgets them"""
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        log.delete()
+
+        self.assertFalse(SeenDirector.objects.filter(story_lover=self.story_lover).exists())
+        self.assertFalse(SeenFilm.objects.filter(story_lover=self.story_lover).exists())
+        log2 = FilmLog.objects.create(story_lover=self.story_lover, film=self.film2)
+        self.assertTrue(log2.is_new_director)
+
+    def test_delete_of_rewatch_keeps_film_seen(self):
+        """Test that deleting one of two logs of a film keeps it seen"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        rewatch = FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        rewatch.delete()
+
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        self.assertTrue(log.is_rewatch)
+        self.assertFalse(log.is_new_director)
+
+    def test_backfill_command_rebuilds_index(self):
+        """Test that backfill_seen_history recomputes counts from the diary"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film1)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film2)
+        SeenDirector.objects.all().delete()
+        SeenFilm.objects.all().delete()
+
+        call_command('backfill_seen_history', stdout=StringIO())
+
+        self.assertEqual(SeenDirector.objects.get(story_lover=self.story_lover).log_count, 2)
+        self.assertEqual(SeenFilm.objects.filter(story_lover=self.story_lover).count(), 2)
+
+
+class FilmLogScoreTest(TestCase):
+    """Tests for materialized weighted scores"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        rubric = Rubric.objects.create(story_lover=self.story_lover, name='Test Rubric')
+        self.cat1 = RubricCategory.objects.create(rubric=rubric, name='Direction', weight=40)
+        self.cat2 = RubricCategory.objects.create(rubric=rubric, name='Acting', weight=30)
+        self.film = Film.objects.create(title='Test Film', director='Director', year=2023)
+
+    def make_rated_log(self, direction=10, acting=8):
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.film)
+        RubricRating.objects.create(film_log=log, category=self.cat1, rating=direction)
+        RubricRating.objects.create(film_log=log, category=self.cat2, rating=acting)
+        return log
+
+    def test_score_stored_on_rating_save(self):
+        """Test that saving rubric ratings materializes the score"""
+        log = self.make_rated_log()
+        self.assertAlmostEqual(FilmLogScore.objects.get(film_log=log).score, 9.1, places=1)
+
+    def test_score_updated_on_rating_delete(self):
+        """Test that deleting a rating rescores the log"""
+        log = self.make_rated_log()
+        log.rubric_ratings.get(category=self.cat2).delete()
+        self.assertEqual(log.weighted_score, 10)
+
+    def test_score_updated_on_weight_change(self):
+        """Test that changing a category weight rescores its logs"""
+        log = self.make_rated_log()
+        self.cat2.weight = 40
+        self.cat2.save()
+        # (10 * 40 + 8 * 40) / 80 = 9.0
+        self.assertEqual(log.weighted_score, 9.0)
+
+    def test_with_weighted_score_avoids_n_plus_one(self):
+        """Test that annotated logs read their scores without extra queries"""
+        for _ in range(3):
+            self.make_rated_log()
+        with self.assertNumQueries(1):
+            scores = [log.weighted_score for log in FilmLog.objects.with_weighted_score()]
+        self.assertEqual(len(scores), 3)
+        self.assertAlmostEqual(scores[0], 9.1, places=1)
+
+    def test_backfill_command_rebuilds_scores(self):
+        """Test that backfill_weighted_scores recomputes missing scores"""
+        log = self.make_rated_log()
+        FilmLogScore.objects.all().delete()
+        call_command('backfill_weighted_scores', stdout=StringIO())
+        self.assertAlmostEqual(log.weighted_score, 9.1, places=1)
+
+
+class FilmSearchTest(TestCase):
+    """Tests for the film search index"""
+
+    def setUp(self):
+        self.past_lives = Film.objects.create(
+            title='Past Lives', director='Celine Song', year=2023, genre='Drama', country='USA/Korea'
+        )
+        self.materialists = Film.objects.create(
+            title='Materialists', director='Celine Song', year=2025, genre='Romance', country='USA'
+        )
+        self.songs = Film.objects.create(
+            title='Songs from the Second Floor', director='Roy Andersson', year=2000, country='Sweden'
+        )
+
+    def test_prefix_match_across_fields(self):
+        """Test that prefixes match title, director, country and genre"""
+        self.assertEqual(search_films('past li'), [self.past_lives])
+        self.assertCountEqual(search_films('celine'), [self.past_lives, self.materialists])
+        self.assertEqual(search_films('swed'), [self.songs])
+        self.assertEqual(search_films('romance'), [self.materialists])
+
+    def test_title_matches_rank_first(self):
+        """Test that a title match outranks a director match"""
+        results = search_films('song')
+        self.assertEqual(results[0], self.songs)
+        self.assertEqual(len(results), 3)
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that the index stays in sync with saved and deleted films"""
+        self.past_lives.title = 'Lives Past'
+        self.past_lives.save()
+        self.assertEqual(search_films('lives p'), [self.past_lives])
+
+        self.past_lives.delete()
+        self.assertEqual(search_films('lives'), [])
+
+    def test_punctuation_only_query(self):
+        """Test that a query with no words returns nothing"""
+        self.assertEqual(search_films('*"'), [])
+
+
+class FilmSearchCacheTest(TestCase):
+    """Tests for the cached film autocomplete endpoint"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        StoryLover.objects.create(user=user, display_name='Test')
+        self.client.force_login(user)
+        Film.objects.create(title='Past Lives', director='Celine Song', year=2023)
+
+    def test_normalized_queries_share_cache_entry(self):
+        """Test that a repeated query is answered without hitting the catalog"""
+        first = self.client.get('/api/films/', {'q': 'Past li'})
+        with self.assertNumQueries(2):  # session and user; the stats are cached too
+            second = self.client.get('/api/films/', {'q': '  past   LI'})
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_film_save_invalidates_results(self):
+        """Test that creating a film makes it searchable immediately"""
+        self.assertEqual(len(self.client.get('/api/films/', {'q': 'past'}).json()['films']), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Film.objects.create(title='Past Perfect', director='Someone', year=2020)
+        self.assertEqual(len(self.client.get('/api/films/', {'q': 'past'}).json()['films']), 2)
+
+    def test_invalidation_waits_for_commit(self):
+        """Test that the generation is bumped only once the film write commits"""
+        generation = get_generation()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Film.objects.create(title='Past Perfect', director='Someone', year=2020)
+            self.assertEqual(get_generation(), generation)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_conditional_request_returns_not_modified(self):
+        """Test that a matching If-None-Match gets a 304 with cache headers"""
+        response = self.client.get('/api/films/', {'q': 'past'})
+        self.assertIn('private', response['Cache-Control'])
+
+        cached = self.client.get('/api/films/', {'q': 'past'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_cache_url_selects_shared_backend(self):
+        """Test that CACHE_URL picks a shared backend and unset falls back to per-process locmem"""
+        self.assertEqual(cache_config(None)['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        redis = cache_config('redis://cache:6379/1')
+        self.assertEqual(redis['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(redis['LOCATION'], 'redis://cache:6379/1')
+        self.assertEqual(cache_config('memcached://cache:11211')['LOCATION'], 'cache:11211')
+        self.assertEqual(cache_config('file:///var/tmp/cinevous')['LOCATION'], '/var/tmp/cinevous')
+        with self.assertRaises(ValueError):
+            cache_config('mongodb://cache')
+
+
+class ImportFilmsCommandTest(TestCase):
+    """Tests for the import_films management command"""
+
+    def write(self, suffix, content):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        handle.write(content)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_csv_import_upserts_on_tmdb_id(self):
+        """Test that re-importing a CSV updates films instead of duplicating them"""
+        path = self.write('.csv', (
+            'tmdb_id,title,director,year,genre,country\n'
+            '666277,Past Lives,Celine Song,2023,Drama,USA/Korea\n'
+            '1,No Year,Someone,,Drama,USA\n'
+        ))
+        call_command('import_films', path, stdout=StringIO())
+        film = Film.objects.get(tmdb_id=666277)
+        self.assertEqual(film.decade, '2020s')
+        self.assertEqual(Film.objects.count(), 1)
+
+        path = self.write('.csv', 'tmdb_id,title,director,year\n666277,Past Lives (2023),Celine Song,2023\n')
+        call_command('import_films', path, '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(Film.objects.get(tmdb_id=666277).title, 'Past Lives (2023)')
+        self.assertEqual(Film.objects.count(), 1)
+
+    def test_tmdb_jsonl_import(self):
+        """Test that TMDB movie objects are mapped onto Film fields"""
+        row = {
+            'id': 129,
+            'title': 'Spirited Away',
+            'release_date': '2001-07-20',
+            'genres': [{'id': 16, 'name': 'Animation'}, {'id': 10751, 'name': 'Family'}],
+            'production_countries': [{'iso_3166_1': 'JP', 'name': 'Japan'}],
+            'credits': {'crew': [{'job': 'Director', 'name': 'Hayao Miyazaki'}]},
+            'poster_path': '/39wmItIWsg5sZMyRUHLkWBcuVCM.jpg',
+        }
+        path = self.write('.jsonl', json.dumps(row) + '\n')
+        out = StringIO()
+        call_command('import_films', path, stdout=out)
+
+        film = Film.objects.get(tmdb_id=129)
+        self.assertEqual(film.director, 'Hayao Miyazaki')
+        self.assertEqual(film.genre, 'Animation')
+        self.assertEqual(film.country, 'Japan')
+        self.assertEqual(film.decade, '2000s')
+        self.assertTrue(film.poster_url.endswith(row['poster_path']))
+        self.assertIn('rows/s', out.getvalue())
+        self.assertEqual(search_films('spirited'), [film])
+
+    def test_reimport_rekeys_logged_films(self):
+        """Test that an upsert changing a logged film's director moves its logs' derived data"""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        film = Film.objects.create(tmdb_id=666277, title='Past Lives', director='C. Song', year=2023)
+        FilmLog.objects.create(story_lover=story_lover, film=film, rating=9)
+
+        path = self.write('.csv', (
+            'tmdb_id,title,director,year\n'
+            '666277,Past Lives,Celine Song,2023\n'
+            '-5,Negative Id,Someone,2020\n'
+        ))
+        out = StringIO()
+        call_command('import_films', path, stdout=out)
+        self.assertIn('1 films upserted, 1 skipped', out.getvalue())
+        self.assertEqual(list(SeenDirector.objects.values_list('director', 'log_count')), [('Celine Song', 1)])
+        all_time = UserStatsRollup.objects.get(story_lover=story_lover, year=0, month=0)
+        self.assertEqual(all_time.directors, {'Celine Song': 1})
+
+    def test_malformed_jsonl_lines_are_skipped(self):
+        """Test that broken JSONL lines are counted as skipped instead of aborting the import"""
+        path = self.write('.jsonl', '\n'.join([
+            json.dumps({'id': 1, 'title': 'Before', 'release_date': '2001-01-01'}),
+            '{"id": 2, "title": "Trunc',
+            '[1, 2]',
+            json.dumps({'id': 3, 'title': 'After', 'release_date': '2002-01-01'}),
+        ]) + '\n')
+        out = StringIO()
+        call_command('import_films', path, stdout=out)
+        self.assertEqual(sorted(Film.objects.values_list('title', flat=True)), ['After', 'Before'])
+        self.assertIn('2 films upserted, 2 skipped', out.getvalue())
+
+
+class UserStatsRollupTest(TestCase):
+    """Tests for incrementally maintained stats rollups"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.drama = Film.objects.create(
+            title='Past Lives', director='Celine Song', year=2023, genre='Drama', country='USA/Korea'
+        )
+        self.comedy = Film.objects.create(
+            title='Anaconda', director='Tom Gormican', year=2025, genre='Comedy', country='USA'
+        )
+
+    def rollup(self, year, month):
+        return UserStatsRollup.objects.get(story_lover=self.story_lover, year=year, month=month)
+
+    def test_logs_update_month_year_and_all_time(self):
+        """Test that each log is counted in its month, year and all-time rollups"""
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.drama, rating=9)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.comedy, rating=6)
+
+        now = log.watched_at
+        for year, month in [(now.year, now.month), (now.year, 0), (0, 0)]:
+            stats = self.rollup(year, month).as_dict()
+            self.assertEqual(stats['total_films'], 2)
+            self.assertEqual(stats['avg_rating'], 7.5)
+            self.assertEqual(stats['countries'], 2)  # USA, Korea
+            self.assertEqual(stats['directors'], 2)
+            self.assertEqual(stats['new_directors'], 2)
+
+    def test_delete_decrements_distinct_counters(self):
+        """Test that deleting a log removes its values from the rollups"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.drama, rating=9)
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.comedy)
+        log.delete()
+
+        stats = self.rollup(0, 0).as_dict()
+        self.assertEqual(stats['total_films'], 1)
+        self.assertEqual(stats['genre_breakdown'], [{'genre': 'Drama', 'count': 1}])
+        self.assertEqual(stats['avg_rating'], 9.0)
+
+    def test_deleting_story_lover_cascades_cleanly(self):
+        """Test that cascading deletes do not recreate rollup rows"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.drama)
+        self.user.delete()
+        self.assertFalse(UserStatsRollup.objects.exists())
+
+    def test_backfill_command_matches_incremental_rollups(self):
+        """Test that backfill_stats_rollups rebuilds the same numbers"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.drama, rating=9)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.comedy, rating=6)
+        before = self.rollup(0, 0).as_dict()
+        UserStatsRollup.objects.all().delete()
+
+        call_command('backfill_stats_rollups', stdout=StringIO())
+        self.assertEqual(self.rollup(0, 0).as_dict(), before)
+
+    def test_stats_endpoint_reads_precomputed_rows(self):
+        """Test that /api/stats/ serves a year with a single rollup query"""
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.drama, rating=8)
+        self.client.force_login(self.user)
+
+        with self.assertNumQueries(4):  # session, user, story lover, rollups
+            data = self.client.get('/api/stats/', {'year': log.watched_at.year}).json()
+        self.assertEqual(data['year_totals']['total_films'], 1)
+        self.assertEqual(data['all_time']['total_films'], 1)
+        self.assertEqual(len(data['months']), 12)
+        self.assertEqual(data['months'][log.watched_at.month - 1]['total_films'], 1)
+
+
+class FilmLogBatchTest(TestCase):
+    """Tests for batch film log creation"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        self.client.force_login(user)
+        self.nolan1 = Film.objects.create(title='Memento', director='Christopher Nolan', year=2000)
+        self.nolan2 = Film.objects.create(title='Inception', director='Christopher Nolan', year=2010)
+        self.varda = Film.objects.create(title='Cleo from 5 to 7', director='Agnes Varda', year=1962)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.varda, rating=9)
+
+    def post(self, entries):
+        return self.client.post('/api/filmlogs/', json.dumps({'entries': entries}), content_type='application/json')
+
+    def test_batch_flags_match_sequential_logging(self):
+        """Test that flags are computed in entry order against existing history"""
+        response = self.post([
+            {'film_id': self.nolan1.id, 'rating': 8},
+            {'film_id': self.nolan2.id, 'rating': 9},
+            {'film_id': self.nolan1.id, 'rating': 7},
+            {'film_id': self.varda.id, 'rating': 10},
+        ])
+        self.assertEqual(response.status_code, 201)
+        ids = [item['id'] for item in response.json()['created']]
+        logs = FilmLog.objects.in_bulk(ids)
+        flags = [(logs[UUID(pk)].is_new_director, logs[UUID(pk)].is_rewatch) for pk in ids]
+        self.assertEqual(flags, [(True, False), (False, False), (False, True), (False, True)])
+
+        self.assertEqual(SeenDirector.objects.get(story_lover=self.story_lover, director='Christopher Nolan').log_count, 3)
+        self.assertEqual(UserStatsRollup.objects.get(story_lover=self.story_lover, year=0, month=0).film_count, 5)
+
+    def test_batch_reports_per_item_errors(self):
+        """Test that invalid entries are reported and valid ones still saved"""
+        response = self.post([
+            {'film_id': self.nolan1.id, 'rating': 8},
+            {'film_id': 9999, 'rating': 8},
+            {'film_id': self.nolan2.id, 'rating': 11},
+            {'rating': 5},
+        ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual([item['index'] for item in data['created']], [0])
+        self.assertEqual(data['errors'], [
+            {'index': 1, 'error': 'Film not found.'},
+            {'index': 2, 'error': 'Invalid rating value.'},
+            {'index': 3, 'error': 'Missing data.'},
+        ])
+
+    def test_batch_query_count_is_independent_of_size(self):
+        """Test that a batch costs the same queries for 2 or 20 entries"""
+        def queries_for(count):
+            entries = [{'film_id': self.nolan1.id, 'rating': 8}] * count
+            with CaptureQueriesContext(connection) as ctx:
+                self.post(entries)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_for(2), queries_for(20))
+
+
+@override_settings(DIARY_IMPORT_EXECUTOR='command', MEDIA_ROOT=tempfile.mkdtemp())
+class DiaryImportTest(TestCase):
+    """Tests for background Letterboxd diary imports"""
+
+    LETTERBOXD_CSV = (
+        'Date,Name,Year,Letterboxd URI,Rating,Rewatch,Tags,Watched Date\n'
+        '2024-01-02,Memento,2000,https://boxd.it/1,4.5,,,2024-01-01\n'
+        '2024-02-02,Inception,2010,https://boxd.it/2,3,,,2024-02-01\n'
+        '2024-03-02,Memento,2000,https://boxd.it/3,5,Yes,,2024-03-01\n'
+        '2024-04-02,Unknown Film,1999,https://boxd.it/4,2,,,2024-04-01\n'
+    )
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        self.client.force_login(user)
+        Film.objects.create(title='Memento', director='Christopher Nolan', year=2000)
+        Film.objects.create(title='Inception', director='Christopher Nolan', year=2010)
+
+    def upload(self, content=None, name='diary.csv'):
+        content = self.LETTERBOXD_CSV if content is None else content
+        upload = SimpleUploadedFile(name, content.encode(), content_type='text/csv')
+        return self.client.post('/api/imports/', {'file': upload})
+
+    def test_upload_creates_pending_job(self):
+        """Test that uploading returns 202 and leaves the job for a worker"""
+        response = self.upload()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], ImportJob.PENDING)
+        self.assertFalse(FilmLog.objects.exists())
+
+    def test_worker_imports_and_reports_progress(self):
+        """Test that run_import_jobs matches films and records progress"""
+        job_id = self.upload().json()['id']
+        call_command('run_import_jobs', '--once', stdout=StringIO())
+
+        data = self.client.get(f'/api/imports/{job_id}/').json()
+        self.assertEqual(data['status'], ImportJob.DONE)
+        self.assertEqual(data['total_rows'], 4)
+        self.assertEqual(data['processed_rows'], 4)
+        self.assertEqual(data['imported_rows'], 3)
+        self.assertEqual([error['line'] for error in data['errors']], [5])
+
+        logs = list(FilmLog.objects.order_by('watched_at'))
+        self.assertEqual([log.rating for log in logs], [9, 6, 10])
+        self.assertEqual([log.is_new_director for log in logs], [True, False, False])
+        self.assertEqual([log.is_rewatch for log in logs], [False, False, True])
+        self.assertEqual(logs[0].watched_at.date().isoformat(), '2024-01-01')
+
+    def test_multiline_reviews_count_as_one_row(self):
+        """Test that quoted reviews spanning lines count as one row each"""
+        job_id = self.upload(
+            'Date,Name,Year,Letterboxd URI,Rating,Rewatch,Review,Tags,Watched Date\n'
+            '2024-01-02,Memento,2000,https://boxd.it/1,4.5,,"Backwards.\n\nStill great.",,2024-01-01\n'
+            '2024-04-02,Unknown Film,1999,https://boxd.it/4,2,,"One\ntwo",,2024-04-01\n',
+            name='reviews.csv',
+        ).json()['id']
+        call_command('run_import_jobs', '--once', stdout=StringIO())
+
+        data = self.client.get(f'/api/imports/{job_id}/').json()
+        self.assertEqual((data['total_rows'], data['processed_rows'], data['imported_rows']), (2, 2, 1))
+        self.assertEqual([error['line'] for error in data['errors']], [5])
+        self.assertEqual(FilmLog.objects.get().review, 'Backwards.\n\nStill great.')
+
+    def test_unparseable_ratings_are_row_errors(self):
+        """Test that ratings such as Infinity or NaN fail their row, not the job"""
+        job_id = self.upload(
+            'Date,Name,Year,Letterboxd URI,Rating,Rewatch,Tags,Watched Date\n'
+            '2024-01-02,Memento,2000,https://boxd.it/1,Infinity,,,2024-01-01\n'
+            '2024-02-02,Inception,2010,https://boxd.it/2,NaN,,,2024-02-01\n'
+            '2024-03-02,Memento,2000,https://boxd.it/3,5,Yes,,2024-03-01\n'
+        ).json()['id']
+        call_command('run_import_jobs', '--once', stdout=StringIO())
+
+        data = self.client.get(f'/api/imports/{job_id}/').json()
+        self.assertEqual(data['status'], ImportJob.DONE)
+        self.assertEqual(data['imported_rows'], 1)
+        self.assertEqual([error['line'] for error in data['errors']], [2, 3])
+
+    def test_interrupted_job_is_marked_failed(self):
+        """Test that a worker interrupted mid-import does not leave the job running"""
+        job_id = self.upload().json()['id']
+        job = imports.claim(job_id)
+        with mock.patch('storylovers.imports.import_chunk', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                imports.run_import(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_other_users_cannot_poll_job(self):
+        """Test that a job is only visible to its owner"""
+        job_id = self.upload().json()['id']
+        other = User.objects.create_user(username='other', password='testpass123')
+        StoryLover.objects.create(user=other, display_name='Other')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(f'/api/imports/{job_id}/').status_code, 404)
+
+
+@override_settings(MIDDLEWARE=['cinevous.metrics.RequestMetricsMiddleware', *settings.MIDDLEWARE])
+class RequestMetricsTest(TestCase):
+    """Tests for the opt-in request metrics middleware"""
+
+    def setUp(self):
+        registry.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        StoryLover.objects.create(user=self.user, display_name='Test')
+        self.client.force_login(self.user)
+        Film.objects.create(title='Past Lives', director='Celine Song', year=2023)
+
+    def test_server_timing_header_reports_queries(self):
+        """Test that API responses carry db, serialize and total timings"""
+        response = self.client.get('/api/filmlogs/')
+        timing = response['Server-Timing']
+        self.assertIn('desc="4 queries"', timing)
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        """Test that non-staff users are redirected away from /metrics/"""
+        self.assertEqual(self.client.get('/metrics/').status_code, 302)
+
+    def test_metrics_endpoint_serves_prometheus_histograms(self):
+        """Test that observed requests appear as per-view histograms"""
+        self.client.get('/api/films/', {'q': 'past'})
+        self.user.is_staff = True
+        self.user.save()
+
+        body = self.client.get('/metrics/').content.decode()
+        self.assertIn('# TYPE cinevous_db_queries histogram', body)
+        self.assertIn('cinevous_db_queries_count{view="film_api",method="GET"} 1', body)
+        self.assertIn('cinevous_response_size_bytes_bucket{view="film_api",method="GET",le="+Inf"} 1', body)
+
+    async def test_async_requests_are_measured(self):
+        """Test that the middleware runs as a coroutine in front of async views and counts their queries"""
+        async def view(request):
+            return JsonResponse({'films': await Film.objects.acount()})
+
+        middleware = RequestMetricsMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = await middleware(AsyncRequestFactory().get('/api/films/'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+
+class BenchmarkHarnessTest(TestCase):
+    """Tests for the synthetic-data benchmark harness"""
+
+    def test_seed_and_run_at_tiny_scale(self):
+        """Test that seeding and timing produce a full report"""
+        story_lover = benchmark.seed(films=50, users=3, logs=200)
+        self.assertEqual(Film.objects.count(), 50)
+        self.assertEqual(FilmLog.objects.count(), 200)
+        self.assertEqual(
+            SeenFilm.objects.filter(story_lover=story_lover).aggregate(n=Sum('log_count'))['n'],
+            FilmLog.objects.filter(story_lover=story_lover).count(),
+        )
+
+        results = benchmark.run_benchmarks(story_lover, iterations=3)
+        self.assertEqual(set(results), {'diary_get', 'diary_post', 'film_search', 'weighted_score'})
+        for report in results.values():
+            self.assertLessEqual(report['p50_ms'], report['p99_ms'])
+            self.assertGreater(report['queries'], 0)
+
+    def test_compare_to_baseline_flags_regressions(self):
+        """Test that slower p95s and extra queries are reported"""
+        baseline = {'small': {'diary_get': {'p95_ms': 10.0, 'queries': 4}}}
+        self.assertEqual(benchmark.compare_to_baseline(
+            {'small': {'diary_get': {'p95_ms': 12.0, 'queries': 4}}}, baseline
+        ), [])
+        regressions = benchmark.compare_to_baseline(
+            {'small': {'diary_get': {'p95_ms': 20.0, 'queries': 5}}}, baseline
+        )
+        self.assertEqual(len(regressions), 2)
+
+
+class AsyncViewsTest(TestCase):
+    """Tests for the ASGI-native diary and search views"""
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.film = Film.objects.create(title='Past Lives', director='Celine Song', year=2023)
+
+    def authenticate(self, request):
+        async def auser():
+            return self.user
+        request.user = self.user
+        request.auser = auser
+        request._dont_enforce_csrf_checks = True
+        return request
+
+    async def test_async_post_then_paginated_get(self):
+        """Test that logs created async are listed by the async diary view"""
+        view = AsyncFilmLogView.as_view()
+        for rating in (7, 8, 9):
+            request = self.authenticate(self.factory.post(
+                '/api/filmlogs/', json.dumps({'film_id': self.film.id, 'rating': rating}),
+                content_type='application/json',
+            ))
+            self.assertEqual((await view(request)).status_code, 201)
+
+        response = await view(self.authenticate(self.factory.get('/api/filmlogs/', {'limit': 2})))
+        data = json.loads(response.content)
+        self.assertEqual([log['rating'] for log in data['film_logs']], [9, 8])
+        self.assertIsNotNone(data['next_cursor'])
+
+        response = await view(self.authenticate(
+            self.factory.get('/api/filmlogs/', {'limit': 2, 'cursor': data['next_cursor']})
+        ))
+        data = json.loads(response.content)
+        self.assertEqual([log['rating'] for log in data['film_logs']], [7])
+        self.assertIsNone(data['next_cursor'])
+
+    async def test_async_ndjson_export(self):
+        """Test that the async export streams every log"""
+        await FilmLog.objects.acreate(story_lover=self.story_lover, film=self.film)
+        response = await AsyncFilmLogView.as_view()(
+            self.authenticate(self.factory.get('/api/filmlogs/', {'format': 'ndjson'}))
+        )
+        lines = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(lines), 1)
+
+    async def test_async_search(self):
+        """Test that the async search view returns ranked results with an ETag"""
+        response = await AsyncFilmView.as_view()(
+            self.authenticate(self.factory.get('/api/films/', {'q': 'past'}))
+        )
+        self.assertEqual(json.loads(response.content)['films'][0]['title'], 'Past Lives')
+        self.assertTrue(response['ETag'])
+
+    async def test_anonymous_request_redirects(self):
+        """Test that login_required guards the async views"""
+        request = self.factory.get('/api/films/', {'q': 'past'})
+        request.auser = AsyncMock(return_value=AnonymousUser())
+        response = await AsyncFilmView.as_view()(request)
+        self.assertEqual(response.status_code, 302)
+
+
+class DatabaseProfileTest(TestCase):
+    """Tests for the environment-driven database profiles"""
+
+    def test_sqlite_pragmas_applied_to_connections(self):
+        """Test that new SQLite connections run the profile's PRAGMAs"""
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite profile only")
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_postgres_profile_pools_or_persists(self):
+        """Test that the postgres profile uses a pool, or persistent connections with DB_POOL=0"""
+        pooled = database_profile('postgres', None, {'POSTGRES_DB': 'films', 'DB_POOL_MAX_SIZE': '20'})
+        self.assertEqual(pooled['NAME'], 'films')
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool']['max_size'], 20)
+        self.assertTrue(pooled['CONN_HEALTH_CHECKS'])
+
+        persistent = database_profile('postgres', None, {'DB_POOL': '0'})
+        self.assertEqual(persistent['CONN_MAX_AGE'], 600)
+        self.assertNotIn('pool', persistent['OPTIONS'])
+
+    def test_unknown_profile_rejected(self):
+        """Test that a typo in DB_PROFILE fails loudly"""
+        with self.assertRaises(ValueError):
+            database_profile('mysql', None, {})
+
+
+@override_settings(
+    DATABASE_ROUTERS=['cinevous.routers.PrimaryReplicaRouter'],
+    DATABASE_REPLICAS=['replica'],
+    MIDDLEWARE=['cinevous.routers.ReplicaPinMiddleware', *settings.MIDDLEWARE],
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+)
+class ReadReplicaRoutingTest(TransactionTestCase):
+    """Tests for routing safe requests to a read replica"""
+
+    # Resolved in setUpClass, after the replica below is registered
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        # A second SQLite file stands in for a replica that has not caught up
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        replica = sqlite_database(os.path.join(cls.replica_dir.name, 'replica.sqlite3'), {})
+        connections.settings['replica'] = connections.configure_settings({
+            'default': connections.settings['default'], 'replica': replica,
+        })['replica']
+        call_command('migrate', database='replica', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.replica_dir.cleanup()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.film = Film.objects.create(title='Past Lives', director='Celine Song', year=2023)
+        for obj in (self.user, self.story_lover, self.film):
+            obj.save(using='replica')
+        self.client.force_login(self.user)
+
+    def test_safe_requests_read_from_replica(self):
+        """Test that the diary GET reads from the replica, which lacks a log only on the primary"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=8)
+        response = self.client.get('/api/filmlogs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['film_logs'], [])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        response = self.client.get('/api/films/', {'q': 'past'})
+        self.assertEqual(response.json()['films'][0]['title'], 'Past Lives')
+
+    def test_writes_pin_following_reads_to_primary(self):
+        """Test that a write pins the client to the primary for its next reads"""
+        response = self.client.post(
+            '/api/filmlogs/', json.dumps({'film_id': self.film.id, 'rating': 8}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertFalse(FilmLog.objects.using('replica').exists())
+
+        response = self.client.get('/api/filmlogs/')
+        self.assertEqual(len(response.json()['film_logs']), 1)
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test that commands and workers never read from a replica"""
+        self.assertEqual(router.db_for_read(Film), 'default')
+
+    async def test_async_requests_route_and_pin(self):
+        """Test that the middleware runs as a coroutine and routes async views' queries"""
+        await FilmLog.objects.acreate(story_lover=self.story_lover, film=self.film, rating=8)
+
+        async def view(request):
+            if request.method == 'POST':
+                await FilmLog.objects.acreate(story_lover=self.story_lover, film=self.film, rating=9)
+            return JsonResponse({'logs': await FilmLog.objects.acount()})
+
+        middleware = ReplicaPinMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = await middleware(AsyncRequestFactory().get('/api/filmlogs/'))
+        self.assertEqual(json.loads(response.content), {'logs': 0})
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        response = await middleware(AsyncRequestFactory().post('/api/filmlogs/'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+
+class RubricWeightSumTest(TestCase):
+    """Tests for the stored rubric weight totals"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=user, display_name='Test')
+        self.rubric = Rubric.objects.create(story_lover=self.story_lover, name='Standard')
+        self.direction = RubricCategory.objects.create(rubric=self.rubric, name='Direction', weight=50)
+        RubricCategory.objects.create(rubric=self.rubric, name='Acting', weight=50)
+
+    def test_weight_sum_follows_updates_and_deletes(self):
+        """Test that editing or deleting a category updates the stored total"""
+        self.assertEqual(Rubric.objects.get(pk=self.rubric.pk).weight_sum, 100)
+        self.direction.weight = 40
+        self.direction.save()
+        self.assertEqual(Rubric.objects.get(pk=self.rubric.pk).weight_sum, 90)
+        self.direction.delete()
+        self.assertEqual(Rubric.objects.get(pk=self.rubric.pk).weight_sum, 50)
+
+    def test_listing_validity_costs_one_query(self):
+        """Test that validity over a list of rubrics needs no per-rubric aggregate"""
+        for i in range(5):
+            Rubric.objects.create(story_lover=self.story_lover, name=f'Other {i}')
+        with self.assertNumQueries(1):
+            validity = {rubric.name: rubric.is_valid for rubric in Rubric.objects.filter(story_lover=self.story_lover)}
+        self.assertTrue(validity['Standard'])
+        self.assertFalse(validity['Other 0'])
+
+        with self.assertNumQueries(1):
+            totals = {rubric.name: rubric.total_weight for rubric in Rubric.objects.with_total_weight()}
+        self.assertEqual(totals, {'Standard': 100, **{f'Other {i}': 0 for i in range(5)}})
+
+    def test_stale_rubric_save_keeps_weight_sum(self):
+        """Test that saving a Rubric loaded before its categories keeps the stored total"""
+        other = Rubric.objects.create(story_lover=self.story_lover, name='Later')
+        stale = Rubric.objects.get(pk=other.pk)
+        RubricCategory.objects.create(rubric=other, name='Story', weight=100)
+
+        stale.is_default = True
+        stale.save()
+        stale = Rubric.objects.get(pk=other.pk)
+        self.assertTrue(stale.is_default)
+        self.assertTrue(stale.is_valid)
+
+    def test_recompute_after_bulk_create(self):
+        """Test that recompute_weight_sums catches up after writes that skip signals"""
+        other = Rubric.objects.create(story_lover=self.story_lover, name='Bulk')
+        RubricCategory.objects.bulk_create([
+            RubricCategory(rubric=other, name='Story', weight=30),
+            RubricCategory(rubric=other, name='Craft', weight=20),
+        ])
+        self.assertEqual(Rubric.recompute_weight_sums([other.pk]), 1)
+        other.refresh_from_db()
+        self.assertEqual(other.total_weight, 50)
+
+
+class RubricApiTest(TestCase):
+    """Tests for the rubric API"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.client.force_login(self.user)
+
+    def save(self, payload, rubric_id=None):
+        if rubric_id is None:
+            return self.client.post('/api/rubrics/', json.dumps(payload), content_type='application/json')
+        return self.client.put(f'/api/rubrics/{rubric_id}/', json.dumps(payload), content_type='application/json')
+
+    def rubric_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/rubrics/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['rubrics'], [q for q in ctx.captured_queries if 'storylovers_rubric' in q['sql']]
+
+    def test_listing_takes_two_queries_at_any_size(self):
+        """Test that rubrics and categories are fetched with two queries however many rubrics exist"""
+        for i in range(5):
+            self.save({'name': f'Rubric {i}', 'categories': [
+                {'name': 'Direction', 'weight': 50}, {'name': 'Acting', 'weight': 50},
+            ]})
+        rubrics, queries = self.rubric_queries()
+        self.assertEqual(len(rubrics), 5)
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all(rubric['is_valid'] for rubric in rubrics))
+        self.assertEqual([c['name'] for c in rubrics[0]['categories']], ['Direction', 'Acting'])
+
+    def test_create_and_switch_default(self):
+        """Test that creating a default rubric clears the previous default"""
+        first = self.save({'name': 'Standard', 'is_default': True, 'categories': [{'name': 'Story', 'weight': 50}, {'name': 'Craft', 'weight': 50}]})
+        self.assertEqual(first.status_code, 201)
+        second = self.save({'name': 'Fun', 'is_default': True, 'categories': [{'name': 'Fun', 'weight': 50}, {'name': 'Pace', 'weight': 50}]})
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(
+            list(Rubric.objects.filter(is_default=True).values_list('name', flat=True)), ['Fun']
+        )
+
+    def test_update_replaces_categories_atomically(self):
+        """Test that a PUT updates, adds and removes categories, or changes nothing if invalid"""
+        created = self.save({'name': 'Standard', 'categories': [
+            {'name': 'Direction', 'weight': 50}, {'name': 'Acting', 'weight': 50},
+        ]}).json()
+        direction = created['categories'][0]
+
+        invalid = self.save({'name': 'Standard', 'categories': [
+            {'id': direction['id'], 'name': 'Direction', 'weight': 50},
+        ]}, created['id'])
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(RubricCategory.objects.filter(rubric_id=created['id']).count(), 2)
+
+        response = self.save({'name': 'Standard', 'categories': [
+            {'id': direction['id'], 'name': 'Direction', 'weight': 40},
+            {'name': 'Story', 'weight': 30},
+            {'name': 'Craft', 'weight': 30},
+        ]}, created['id'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['name'] for c in response.json()['categories']], ['Direction', 'Story', 'Craft'])
+        self.assertEqual(RubricCategory.objects.get(name='Direction').id, direction['id'])
+        self.assertEqual(Rubric.objects.get(id=created['id']).weight_sum, 100)
+
+    def test_reweighting_rescores_rated_logs(self):
+        """Test that changing category weights updates stored weighted scores"""
+        created = self.save({'name': 'Standard', 'categories': [
+            {'name': 'Direction', 'weight': 50}, {'name': 'Acting', 'weight': 50},
+        ]}).json()
+        film = Film.objects.create(title='Aftersun', director='Charlotte Wells', year=2022)
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=film)
+        direction, acting = RubricCategory.objects.order_by('order')
+        RubricRating.objects.create(film_log=log, category=direction, rating=10)
+        RubricRating.objects.create(film_log=log, category=acting, rating=6)
+        self.assertEqual(log.weighted_score, 8.0)
+
+        self.save({'name': 'Standard', 'categories': [
+            {'id': direction.id, 'name': 'Direction', 'weight': 25},
+            {'id': acting.id, 'name': 'Acting', 'weight': 25},
+            {'name': 'Story', 'weight': 50},
+        ]}, created['id'])
+        self.assertEqual(FilmLogScore.objects.get(film_log=log).score, 8.0)
+        self.save({'name': 'Standard', 'categories': [
+            {'id': direction.id, 'name': 'Direction', 'weight': 50},
+            {'id': acting.id, 'name': 'Acting', 'weight': 20},
+            {'name': 'Story', 'weight': 30},
+        ]}, created['id'])
+        self.assertEqual(FilmLogScore.objects.get(film_log=log).score, round((10 * 50 + 6 * 20) / 70, 1))
+
+    def test_delete_rubric(self):
+        """Test that a rubric can be deleted, but only by its owner"""
+        created = self.save({'name': 'Standard', 'categories': [{'name': 'Story', 'weight': 50}, {'name': 'Craft', 'weight': 50}]}).json()
+        other = User.objects.create_user(username='other', password='testpass123')
+        StoryLover.objects.create(user=other, display_name='Other')
+        self.client.force_login(other)
+        self.assertEqual(self.client.delete(f'/api/rubrics/{created["id"]}/').status_code, 404)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.delete(f'/api/rubrics/{created["id"]}/').status_code, 200)
+        self.assertFalse(Rubric.objects.exists())
+
+    def test_methods_without_an_id_are_not_allowed(self):
+        """Test that PUT and DELETE on the collection and POST on a rubric return 405"""
+        created = self.save({'name': 'Standard', 'categories': [{'name': 'Story', 'weight': 50}, {'name': 'Craft', 'weight': 50}]}).json()
+        response = self.client.put('/api/rubrics/', json.dumps({'name': 'Renamed'}), content_type='application/json')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, POST')
+        self.assertEqual(self.client.delete('/api/rubrics/').status_code, 405)
+        response = self.client.post(f'/api/rubrics/{created["id"]}/', '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(Rubric.objects.get().name, 'Standard')
+
+
+class RubricRatingApiTest(TestCase):
+    """Tests for submitting every category rating of a log at once"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.rubric = Rubric.objects.create(story_lover=self.story_lover, name='Standard')
+        self.categories = [
+            RubricCategory.objects.create(rubric=self.rubric, name=name, weight=weight)
+            for name, weight in [('Direction', 30), ('Acting', 30), ('Story', 40)]
+        ]
+        film = Film.objects.create(title='Aftersun', director='Charlotte Wells', year=2022)
+        self.log = FilmLog.objects.create(story_lover=self.story_lover, film=film)
+        self.client.force_login(self.user)
+
+    def rate(self, ratings, film_log_id=None):
+        return self.client.post(
+            f'/api/filmlogs/{film_log_id or self.log.id}/ratings/',
+            json.dumps({'rubric_id': self.rubric.id, 'ratings': [
+                {'category_id': category.id, 'rating': rating} for category, rating in zip(self.categories, ratings)
+            ]}),
+            content_type='application/json',
+        )
+
+    def test_upsert_returns_weighted_score(self):
+        """Test that ratings are upserted in one statement and the new score is returned"""
+        response = self.rate([10, 6, 8])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['weighted_score'], 8.0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.rate([4, 4, 4])
+        self.assertEqual(response.json()['weighted_score'], 4.0)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "storylovers_rubricrating"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(RubricRating.objects.filter(film_log=self.log).count(), 3)
+        self.assertEqual(FilmLogScore.objects.get(film_log=self.log).score, 4.0)
+
+    def test_invalid_rating_saves_nothing(self):
+        """Test that one out-of-range rating rejects the whole submission"""
+        response = self.rate([10, 11, 8])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(RubricRating.objects.exists())
+
+    def test_other_users_logs_and_categories_rejected(self):
+        """Test that logs and rubrics of other users cannot be rated"""
+        other = User.objects.create_user(username='other', password='testpass123')
+        StoryLover.objects.create(user=other, display_name='Other')
+        self.client.force_login(other)
+        self.assertEqual(self.rate([5, 5, 5]).status_code, 404)
+
+        other_log = FilmLog.objects.create(story_lover=other.story_lover, film=self.log.film)
+        self.assertEqual(self.rate([5, 5, 5], other_log.id).status_code, 400)
+
+
+class FilmListApiTest(TestCase):
+    """Tests for curated lists and their ordering"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.films = Film.objects.bulk_create([
+            Film(title=f'Film {i}', director='Someone', year=2000 + i) for i in range(5)
+        ])
+        self.film_list = FilmList.objects.create(story_lover=self.story_lover, title='Comfort Watches')
+        self.client.force_login(self.user)
+
+    def add(self, film, **extra):
+        return self.client.post(
+            f'/api/lists/{self.film_list.id}/entries/',
+            json.dumps({'film_id': film.id, **extra}), content_type='application/json',
+        )
+
+    def titles(self):
+        return list(self.film_list.entries.values_list('film__title', flat=True))
+
+    def test_insert_and_move_write_one_row(self):
+        """Test that inserting or moving a film writes only that entry"""
+        first = self.add(self.films[0]).json()
+        self.add(self.films[1])
+        self.add(self.films[2])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.add(self.films[3], after=first['id']).status_code, 201)
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(self.titles(), ['Film 0', 'Film 3', 'Film 1', 'Film 2'])
+
+        last = self.film_list.entries.get(film=self.films[2])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f'/api/lists/{self.film_list.id}/entries/{last.id}/',
+                json.dumps({'after': None}), content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        writes = [q for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(self.titles(), ['Film 2', 'Film 0', 'Film 3', 'Film 1'])
+
+    def test_exhausted_gap_renumbers(self):
+        """Test that the list is respaced when two neighbours have no gap left"""
+        first = FilmListEntry.objects.create(film_list=self.film_list, film=self.films[0], position=1)
+        FilmListEntry.objects.create(film_list=self.film_list, film=self.films[1], position=2)
+        self.assertEqual(self.add(self.films[2], after=first.id).status_code, 201)
+        self.assertEqual(self.titles(), ['Film 0', 'Film 2', 'Film 1'])
+        positions = list(self.film_list.entries.values_list('position', flat=True))
+        self.assertEqual(positions[0], FilmListEntry.POSITION_STEP)
+        self.assertEqual(len(set(positions)), 3)
+
+    def test_detail_pages_take_bounded_queries(self):
+        """Test that a long list is paged by position with film data in the same query"""
+        films = Film.objects.bulk_create([Film(title=f'Long {i}', director='Someone', year=1990) for i in range(120)])
+        FilmListEntry.objects.bulk_create([
+            FilmListEntry(film_list=self.film_list, film=film, position=(i + 1) * FilmListEntry.POSITION_STEP)
+            for i, film in enumerate(films)
+        ])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/lists/{self.film_list.id}/', {'limit': 100})
+        data = response.json()
+        self.assertEqual(len(data['entries']), 100)
+        self.assertEqual(data['entries'][0]['film']['title'], 'Long 0')
+        list_queries = [q for q in ctx.captured_queries if 'storylovers_film' in q['sql']]
+        self.assertEqual(len(list_queries), 2)
+
+        response = self.client.get(f'/api/lists/{self.film_list.id}/', {'limit': 100, 'cursor': data['next_cursor']})
+        data = response.json()
+        self.assertEqual([e['film']['title'] for e in data['entries']], [f'Long {i}' for i in range(100, 120)])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_lists_are_private(self):
+        """Test that the index counts films and other users cannot see or change a list"""
+        self.add(self.films[0])
+        response = self.client.get('/api/lists/')
+        self.assertEqual(response.json()['lists'][0]['film_count'], 1)
+
+        other = User.objects.create_user(username='other', password='testpass123')
+        StoryLover.objects.create(user=other, display_name='Other')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get('/api/lists/').json()['lists'], [])
+        self.assertEqual(self.client.get(f'/api/lists/{self.film_list.id}/').status_code, 404)
+        self.assertEqual(self.add(self.films[1]).status_code, 404)
+
+    def test_methods_without_an_id_are_not_allowed(self):
+        """Test that list and entry methods missing their id, or given an extra one, return 405"""
+        entry = self.add(self.films[0]).json()
+        entries = f'/api/lists/{self.film_list.id}/entries/'
+        for response, allowed in (
+            (self.client.put('/api/lists/', '{}', content_type='application/json'), 'GET, POST'),
+            (self.client.delete('/api/lists/'), 'GET, POST'),
+            (self.client.post(f'/api/lists/{self.film_list.id}/', '{}', content_type='application/json'), 'GET, PUT, DELETE'),
+            (self.client.patch(entries, json.dumps({'after': None}), content_type='application/json'), 'POST'),
+            (self.client.delete(entries), 'POST'),
+            (self.client.post(f'{entries}{entry["id"]}/', '{}', content_type='application/json'), 'PATCH, DELETE'),
+        ):
+            self.assertEqual(response.status_code, 405)
+            self.assertEqual(response['Allow'], allowed)
+        self.assertEqual(self.titles(), ['Film 0'])
+
+    def test_invalid_payloads_are_rejected(self):
+        """Test that malformed list edits and entry positions return 400 and change nothing"""
+        detail = f'/api/lists/{self.film_list.id}/'
+        for body in ('[]', '"title"', json.dumps({'title': None}), json.dumps({'title': ''}),
+                     json.dumps({'title': 'x' * 201}), json.dumps({'description': 5})):
+            self.assertEqual(self.client.put(detail, body, content_type='application/json').status_code, 400, body)
+        for body in (json.dumps({'title': None}), json.dumps({'title': ['Comfort']})):
+            self.assertEqual(self.client.post('/api/lists/', body, content_type='application/json').status_code, 400, body)
+        self.assertEqual(FilmList.objects.get().title, 'Comfort Watches')
+
+        response = self.client.put(detail, json.dumps({'title': 'Rainy Days'}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FilmList.objects.get().title, 'Rainy Days')
+
+        for after in ('first', [1]):
+            self.assertEqual(self.add(self.films[0], after=after).status_code, 400)
+        self.assertEqual(self.titles(), [])
+
+
+class LeagueScoringTest(TestCase):
+    """Tests for fantasy league scoring and leaderboards"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'player{i}', password='testpass123') for i in range(3)]
+        self.story_lovers = [StoryLover.objects.create(user=user, display_name=user.username) for user in self.users]
+        self.league = League.objects.create(name='Cinephile Championship', code='CINE25', season=2025, owner=self.story_lovers[0])
+        self.members = [LeagueMember.objects.create(league=self.league, story_lover=sl) for sl in self.story_lovers]
+        self.films = [FantasyFilm.objects.create(season=2025, title=f'Contender {i}') for i in range(4)]
+        FantasyFilmStat.objects.bulk_create([
+            FantasyFilmStat(fantasy_film=film, phase=phase, points=points)
+            for film, stats in zip(self.films, [(10, 20), (5, 50), (30, 0), (0, 0)])
+            for phase, points in zip(['q1', 'q2'], stats)
+        ])
+        picks = [(0, 0), (0, 1), (1, 2), (1, 1)]  # member 2 picks nothing
+        LeaguePick.objects.bulk_create([
+            LeaguePick(league=self.league, member=self.members[m], fantasy_film=self.films[f], pick_number=n)
+            for n, (m, f) in enumerate(picks, start=1)
+        ])
+
+    def test_score_phase_in_one_aggregate(self):
+        """Test that a phase is scored for every member with a single SELECT"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(score_phase([self.league.id], 'q2'), 3)
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('SELECT')]), 1)
+
+        standings = {
+            entry.member_id: (entry.points, entry.total_points, entry.rank)
+            for entry in LeaderboardEntry.objects.filter(league=self.league, phase='q2')
+        }
+        self.assertEqual(standings, {
+            self.members[0].id: (70, 85, 1),
+            self.members[1].id: (50, 85, 1),
+            self.members[2].id: (0, 0, 3),
+        })
+
+        # Rescoring replaces the snapshot rather than adding to it
+        score_phase([self.league.id], 'q2')
+        self.assertEqual(LeaderboardEntry.objects.filter(league=self.league, phase='q2').count(), 3)
+
+    def test_leaderboard_endpoint_reads_snapshot(self):
+        """Test that the leaderboard pages through stored standings, for members only"""
+        call_command('score_leagues', season=2025, phase='q1', stdout=StringIO())
+        self.client.force_login(self.users[0])
+        response = self.client.get(f'/api/leagues/{self.league.id}/leaderboard/', {'phase': 'q1', 'limit': 2})
+        data = response.json()
+        self.assertEqual([row['total_points'] for row in data['standings']], [35, 15])
+        response = self.client.get(
+            f'/api/leagues/{self.league.id}/leaderboard/', {'phase': 'q1', 'cursor': data['next_cursor']}
+        )
+        self.assertEqual([row['name'] for row in response.json()['standings']], ['player2'])
+
+        outsider = User.objects.create_user(username='outsider', password='testpass123')
+        StoryLover.objects.create(user=outsider, display_name='Outsider')
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(f'/api/leagues/{self.league.id}/leaderboard/').status_code, 404)
+
+    def test_create_and_join_league(self):
+        """Test that a created league can be joined by its code"""
+        self.client.force_login(self.users[0])
+        created = self.client.post(
+            '/api/leagues/', json.dumps({'name': 'Office Pool', 'season': 2026}), content_type='application/json'
+        ).json()
+        self.client.force_login(self.users[1])
+        response = self.client.post(
+            '/api/leagues/', json.dumps({'code': created['code'].lower()}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        leagues = self.client.get('/api/leagues/').json()['leagues']
+        office = next(league for league in leagues if league['name'] == 'Office Pool')
+        self.assertEqual(office['member_count'], 2)
+
+
+class DraftRoomTest(TestCase):
+    """Tests for league drafts with optimistic pick commits"""
+
+    def setUp(self):
+        scheduler.clear()
+        self.users = [User.objects.create_user(username=f'player{i}', password='testpass123') for i in range(3)]
+        for user in self.users:
+            StoryLover.objects.create(user=user, display_name=user.username)
+        self.league = League.objects.create(name='Draft League', code='DRAFT1', season=2025, owner=self.users[0].story_lover)
+        self.members = {
+            member.id: member for member in
+            [LeagueMember.objects.create(league=self.league, story_lover=user.story_lover) for user in self.users]
+        }
+        self.films = [FantasyFilm.objects.create(season=2025, title=f'Contender {i}') for i in range(8)]
+
+    def tearDown(self):
+        scheduler.clear()
+
+    def pick(self, draft, film, **data):
+        member = self.members[draft['on_the_clock']]
+        self.client.force_login(member.story_lover.user)
+        return self.client.post(
+            f'/api/leagues/{self.league.id}/draft/picks/',
+            json.dumps({'fantasy_film_id': film.id, **data}), content_type='application/json',
+        )
+
+    def test_snake_draft_runs_to_completion(self):
+        """Test that turns snake each round and the last pick completes the draft"""
+        self.client.force_login(self.users[0])
+        draft = self.client.post(
+            f'/api/leagues/{self.league.id}/draft/', json.dumps({'rounds': 2}), content_type='application/json'
+        ).json()
+        first_round = [draft['order'][i] for i in range(3)]
+
+        clock = []
+        for film in self.films[:6]:
+            clock.append(draft['on_the_clock'])
+            response = self.pick(draft, film)
+            self.assertEqual(response.status_code, 201)
+            draft = response.json()['draft']
+        self.assertEqual(clock, first_round + first_round[::-1])
+        self.assertEqual(draft['status'], Draft.DONE)
+        self.assertTrue(League.objects.get(id=self.league.id).draft_complete)
+
+    def test_out_of_turn_and_duplicate_picks_rejected(self):
+        """Test that only the member on the clock can pick, and only undrafted films"""
+        draft = start_draft(self.league, rounds=2, rng=random.Random(3)).as_dict()
+        waiting = next(m for m in self.members.values() if m.id != draft['on_the_clock'])
+        self.client.force_login(waiting.story_lover.user)
+        response = self.client.post(
+            f'/api/leagues/{self.league.id}/draft/picks/',
+            json.dumps({'fantasy_film_id': self.films[0].id}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        draft = self.pick(draft, self.films[0]).json()['draft']
+        self.assertEqual(self.pick(draft, self.films[0]).status_code, 400)
+        self.assertEqual(Draft.objects.get(league=self.league).version, draft['version'])
+
+    def test_stale_version_conflicts(self):
+        """Test that two picks made against the same draft version cannot both commit"""
+        draft = start_draft(self.league, rounds=2, rng=random.Random(3))
+        member = self.members[draft.member_for_pick(1)]
+        stale = Draft.objects.select_related('league').get(pk=draft.pk)
+        make_pick(Draft.objects.select_related('league').get(pk=draft.pk), member, self.films[0])
+        with self.assertRaises(StaleDraft):
+            make_pick(stale, member, self.films[1])
+        self.assertEqual(LeaguePick.objects.filter(league=self.league).count(), 1)
+
+        response = self.pick(Draft.objects.get(pk=draft.pk).as_dict(), self.films[1], version=stale.version)
+        self.assertEqual(response.status_code, 409)
+
+    async def test_long_poll_wakes_on_pick(self):
+        """Test that a waiting events request returns as soon as a pick is published"""
+        draft = await sync_to_async(start_draft)(self.league, rounds=1, rng=random.Random(3))
+        draft = await Draft.objects.select_related('league').aget(pk=draft.pk)
+        member = self.members[draft.member_for_pick(1)]
+        request = AsyncRequestFactory().get(f'/api/leagues/{self.league.id}/draft/events/', {'after': 0})
+        request.user = self.users[0]
+        request.auser = AsyncMock(return_value=self.users[0])
+
+        poll = asyncio.ensure_future(AsyncDraftEventsView.as_view()(request, league_id=self.league.id))
+        await asyncio.sleep(0.1)
+        self.assertFalse(poll.done())
+
+        await sync_to_async(make_pick)(draft, member, self.films[0])
+        scheduler.publish(draft)  # on_commit callbacks do not run inside TestCase
+        response = await asyncio.wait_for(poll, timeout=5)
+        data = json.loads(response.content)
+        self.assertEqual([pick['title'] for pick in data['picks']], ['Contender 0'])
+        self.assertEqual(data['current_pick'], 2)
+
+
+class QuestProgressTest(TestCase):
+    """Tests for incrementally maintained quest progress"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.films = [
+            Film.objects.create(
+                title=f'Film {i}', director=f'Director {i}', year=1920 + 10 * i,
+                genre=f'Genre {i}', country=f'Country {i}',
+            )
+            for i in range(10)
+        ]
+
+    def quests(self):
+        progress = QuestProgress.objects.get(story_lover=self.story_lover)
+        return {quest['key']: quest for quest in progress.as_dict()['quests']}
+
+    def test_goal_unlocks_in_the_logging_write(self):
+        """Test that the log reaching a quest's goal unlocks it"""
+        for film in self.films[:9]:
+            FilmLog.objects.create(story_lover=self.story_lover, film=film)
+        quests = self.quests()
+        self.assertEqual(quests['world_cinema_explorer']['progress'], 9)
+        self.assertIsNone(quests['world_cinema_explorer']['unlocked_at'])
+        self.assertIsNotNone(quests['genre_master']['unlocked_at'])
+        self.assertEqual(quests['new_directors']['progress'], 9)
+
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.films[9])
+        quests = self.quests()
+        self.assertIsNotNone(quests['world_cinema_explorer']['unlocked_at'])
+        self.assertIsNone(quests['new_directors']['unlocked_at'])
+
+        # Decade Jumper wants every decade from the 1920s to the 2020s
+        self.assertEqual((quests['decade_jumper']['progress'], quests['decade_jumper']['goal']), (10, 11))
+        FilmLog.objects.create(story_lover=self.story_lover, film=Film.objects.create(
+            title='Silent', director='Someone', year=1915,
+        ))
+        self.assertEqual(self.quests()['decade_jumper']['progress'], 10)
+        FilmLog.objects.create(story_lover=self.story_lover, film=Film.objects.create(
+            title='Recent', director='Someone', year=2024,
+        ))
+        self.assertIsNotNone(self.quests()['decade_jumper']['unlocked_at'])
+
+    def test_batch_and_delete_keep_sets_in_step(self):
+        """Test that batch logs count like single ones and deletes shrink the sets"""
+        FilmLog.objects.create_batch(self.story_lover, [{'film': film} for film in self.films[:3]])
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.films[0])
+        self.assertEqual(self.quests()['world_cinema_explorer']['progress'], 3)
+
+        FilmLog.objects.filter(film=self.films[0]).first().delete()
+        self.assertEqual(self.quests()['world_cinema_explorer']['progress'], 3)
+        FilmLog.objects.filter(film=self.films[1]).first().delete()
+        quests = self.quests()
+        self.assertEqual(quests['world_cinema_explorer']['progress'], 2)
+        self.assertEqual(quests['genre_master']['progress'], 2)
+
+    def test_endpoint_reads_one_row(self):
+        """Test that the quests endpoint reads progress without touching the diary"""
+        for film in self.films[:4]:
+            FilmLog.objects.create(story_lover=self.story_lover, film=film)
+        self.client.login(username='testuser', password='testpass123')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/quests/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['quests'][0]['progress'], 4)
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if 'storylovers_questprogress' in q]), 1)
+        self.assertFalse([q for q in sql if 'storylovers_filmlog' in q])
+
+
+class TrendingTest(TestCase):
+    """Tests for hourly trending buckets and the precomputed ranking"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.steady = Film.objects.create(title='Steady', director='A', year=2020)
+        self.fresh = Film.objects.create(title='Fresh', director='B', year=2025)
+        self.now = timezone.now()
+
+    def log(self, film, ago=timedelta()):
+        return FilmLog.objects.create(story_lover=self.story_lover, film=film, watched_at=self.now - ago)
+
+    def test_logs_update_hourly_buckets(self):
+        """Test that recent logs are counted per film and hour, and deletes uncount them"""
+        self.log(self.steady)
+        log = self.log(self.steady)
+        FilmLog.objects.create_batch(self.story_lover, [{'film': self.steady, 'watched_at': self.now}])
+        self.log(self.steady, ago=timedelta(days=30))  # a backdated import is not trending
+
+        bucket = TrendingBucket.objects.get(film=self.steady)
+        self.assertEqual(bucket.hour, TrendingBucket.hour_of(self.now))
+        self.assertEqual(bucket.log_count, 3)
+        log.delete()
+        bucket.refresh_from_db()
+        self.assertEqual(bucket.log_count, 2)
+
+    def test_recent_logs_outrank_older_ones(self):
+        """Test that the ranking decays older logs and prunes expired buckets"""
+        for _ in range(3):
+            self.log(self.steady, ago=timedelta(days=5))
+        for _ in range(2):
+            self.log(self.fresh)
+        TrendingBucket.objects.create(film=self.fresh, hour=TrendingBucket.hour_of(self.now - timedelta(days=9)))
+
+        self.assertEqual(compute_trending(now=self.now), 2)
+        ranking = list(TrendingFilm.objects.values_list('film__title', 'week_count'))
+        self.assertEqual(ranking, [('Fresh', 2), ('Steady', 3)])
+        self.assertFalse(TrendingBucket.objects.filter(hour__lt=self.now - TrendingBucket.RETENTION).exists())
+
+    def test_endpoint_serves_cached_ranking(self):
+        """Test that the trending endpoint reads the ranking once and then from the cache"""
+        self.log(self.fresh)
+        compute_trending(now=self.now)
+        self.client.login(username='testuser', password='testpass123')
+
+        self.assertEqual(self.client.get('/api/films/trending/').json()['films'][0]['title'], 'Fresh')
+        self.log(self.steady)
+        self.log(self.steady)
+        with CaptureQueriesContext(connection) as queries:
+            films = self.client.get('/api/films/trending/').json()['films']
+        self.assertEqual([film['title'] for film in films], ['Fresh'])
+        self.assertFalse([q for q in queries.captured_queries if 'trending' in q['sql']])
+
+        compute_trending(now=self.now)
+        films = self.client.get('/api/films/trending/?limit=1').json()['films']
+        self.assertEqual([film['title'] for film in films], ['Steady'])
+
+
+class RecommendationTest(TestCase):
+    """Tests for precomputed item-item neighbours and recommendations"""
+
+    def setUp(self):
+        self.films = {
+            title: Film.objects.create(title=title, director=f'{title} Director', year=2000)
+            for title in ['Alpha', 'Beta', 'Gamma', 'Delta']
+        }
+        self.raters = []
+        for i in range(6):
+            user = User.objects.create_user(username=f'rater{i}', password='testpass123')
+            rater = StoryLover.objects.create(user=user, display_name=f'Rater {i}')
+            self.raters.append(rater)
+            # Everyone who loves Alpha loves Beta and dislikes Gamma
+            for title, rating in [('Alpha', 9), ('Beta', 8), ('Gamma', 2)]:
+                FilmLog.objects.create(story_lover=rater, film=self.films[title], rating=rating)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+
+    def neighbours(self, title):
+        return list(
+            FilmNeighbour.objects.filter(film=self.films[title])
+            .order_by('-similarity').values_list('neighbour__title', flat=True)
+        )
+
+    def test_build_keeps_positive_neighbours(self):
+        """Test that similarly rated films become neighbours and opposed ones do not"""
+        FilmLog.objects.create(story_lover=self.raters[0], film=self.films['Delta'], rating=9)
+        self.assertGreater(build_neighbours(k=1), 0)
+
+        self.assertEqual(self.neighbours('Alpha'), ['Beta'])
+        self.assertEqual(self.neighbours('Beta'), ['Alpha'])
+        self.assertEqual(self.neighbours('Gamma'), [])
+        similarity = FilmNeighbour.objects.get(film=self.films['Alpha']).similarity
+        self.assertTrue(0 < similarity <= 1)
+
+    def test_recommends_unseen_neighbours_of_liked_films(self):
+        """Test that recommendations merge the neighbours of well-rated logs, minus seen films"""
+        build_neighbours()
+        self.assertEqual(recommend(self.story_lover), [])
+
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.films['Alpha'], rating=10)
+        self.assertEqual([film['title'] for film in recommend(self.story_lover)], ['Beta'])
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.films['Beta'], rating=4)
+        self.assertEqual(recommend(self.story_lover), [])
+
+    def test_endpoint_reads_stored_neighbours(self):
+        """Test that the recommendations endpoint answers from two queries over stored rows"""
+        build_neighbours()
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.films['Alpha'], rating=9)
+        self.client.login(username='testuser', password='testpass123')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/recommendations/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([film['title'] for film in response.json()['films']], ['Beta'])
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if 'storylovers_filmlog' in q or 'neighbour' in q]), 2)
+
+
+class FilmLogStatsTest(TestCase):
+    """Tests for the denormalized per-film community stats"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.film = Film.objects.create(title='Past Lives', director='Celine Song', year=2023, country='USA')
+        self.other = Film.objects.create(title='Materialists', director='Celine Song', year=2025)
+
+    def stats(self, film):
+        film.refresh_from_db()
+        return film.log_count, film.rating_count, film.avg_rating
+
+    def test_writes_keep_stats_current(self):
+        """Test that created, batched, edited and deleted logs update the film's stats"""
+        log = FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=9)
+        FilmLog.objects.create_batch(self.story_lover, [{'film': self.film, 'rating': 6}, {'film': self.film}])
+        self.assertEqual(self.stats(self.film), (3, 2, 7.5))
+        self.assertEqual(self.film.rating_histogram, [0, 0, 0, 0, 0, 1, 0, 0, 1, 0])
+
+        log = FilmLog.objects.get(pk=log.pk)
+        log.rating = 7
+        log.save()
+        self.assertEqual(self.stats(self.film), (3, 2, 6.5))
+        log.film = self.other
+        log.save()
+        self.assertEqual(self.stats(self.film), (2, 1, 6.0))
+        self.assertEqual(self.stats(self.other), (1, 1, 7.0))
+
+        FilmLog.objects.get(pk=log.pk).delete()
+        self.assertEqual(self.stats(self.other), (0, 0, None))
+        self.assertEqual(self.other.rating_histogram, [0] * 10)
+
+    def test_stale_film_save_keeps_stats(self):
+        """Test that saving a Film loaded before its logs does not reset its stats"""
+        stale = Film.objects.get(pk=self.film.pk)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=8)
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=6)
+
+        stale.title = 'Past Lives (2023)'
+        stale.save()
+        self.assertEqual(self.stats(self.film), (2, 2, 7.0))
+        self.assertEqual(self.film.rating_sum, 14)
+        self.assertEqual(self.film.title, 'Past Lives (2023)')
+
+    def test_reconcile_command_fixes_drift(self):
+        """Test that the reconcile command rebuilds drifted stats from the logs"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=8)
+        FilmLog.objects.filter(film=self.film).update(rating=4)  # bypasses save()
+        Film.objects.filter(pk=self.other.pk).update(log_count=5)
+
+        out = StringIO()
+        call_command('reconcile_film_stats', stdout=out)
+        self.assertIn('Reconciled 2 films', out.getvalue())
+        self.assertEqual(self.stats(self.film), (1, 1, 4.0))
+        self.assertEqual(self.film.ratings_4, 1)
+        self.assertEqual(self.stats(self.other), (0, 0, None))
+
+        # Chunk by chunk, every film is still visited
+        Film.objects.update(log_count=9)
+        self.assertEqual(Film.rebuild_log_stats(chunk_size=1), 2)
+        self.assertEqual(self.stats(self.film), (1, 1, 4.0))
+
+    def test_search_results_carry_stats(self):
+        """Test that search results include community stats without touching the logs"""
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=8)
+        self.client.login(username='testuser', password='testpass123')
+
+        with CaptureQueriesContext(connection) as queries:
+            films = self.client.get('/api/films/', {'q': 'past'}).json()['films']
+        self.assertEqual(films[0]['log_count'], 1)
+        self.assertEqual(films[0]['avg_rating'], 8.0)
+        self.assertFalse([q for q in queries.captured_queries if 'storylovers_filmlog' in q['sql']])
+        # Stat updates leave the search index alone
+        self.assertEqual(search_films('past'), [self.film])
+
+    def test_cached_search_stats_expire(self):
+        """Test that cached stats are served until the entry expires, then refreshed with a new ETag"""
+        self.client.login(username='testuser', password='testpass123')
+        first = self.client.get('/api/films/', {'q': 'past'})
+        self.assertEqual(first.json()['films'][0]['log_count'], 0)
+
+        FilmLog.objects.create(story_lover=self.story_lover, film=self.film, rating=8)
+        cached = self.client.get('/api/films/', {'q': 'past'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        with mock.patch('storylovers.search_cache.time') as clock:
+            clock.time.return_value = time.time() + search_cache.CACHE_TIMEOUT + 1
+            second = self.client.get('/api/films/', {'q': 'past'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['films'][0]['log_count'], 1)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+
+class DiaryEditTest(TestCase):
+    """Tests for editing and deleting diary logs and their derived data"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.story_lover = StoryLover.objects.create(user=self.user, display_name='Test')
+        self.client.force_login(self.user)
+        self.past_lives = Film.objects.create(
+            title='Past Lives', director='Celine Song', year=2023, genre='Drama', country='USA/Korea'
+        )
+        self.materialists = Film.objects.create(
+            title='Materialists', director='Celine Song', year=2025, genre='Romance', country='USA'
+        )
+        self.songs = Film.objects.create(
+            title='Songs from the Second Floor', director='Roy Andersson', year=2000, country='Sweden'
+        )
+
+    def log(self, film, rating=8):
+        return FilmLog.objects.create(story_lover=self.story_lover, film=film, rating=rating)
+
+    def flags(self, log):
+        log.refresh_from_db()
+        return log.is_new_director, log.is_rewatch
+
+    def assertDerivedDataConsistent(self):
+        """Compare everything maintained incrementally with a rebuild from the logs."""
+        logs = list(FilmLog.objects.filter(story_lover=self.story_lover).select_related('film').order_by(
+            'created_at', 'id'
+        ))
+        seen_films, seen_directors = set(), set()
+        for log in logs:
+            self.assertEqual(log.is_rewatch, log.film_id in seen_films)
+            self.assertEqual(log.is_new_director, log.film.director not in seen_directors)
+            seen_films.add(log.film_id)
+            seen_directors.add(log.film.director)
+
+        rollups = {(r.year, r.month): r.as_dict() for r in UserStatsRollup.objects.filter(story_lover=self.story_lover)}
+        quests = QuestProgress.objects.get(story_lover=self.story_lover).as_dict()
+        seen = sorted(SeenFilm.objects.filter(story_lover=self.story_lover).values_list('film_id', 'log_count'))
+        directors = sorted(SeenDirector.objects.filter(story_lover=self.story_lover).values_list('director', 'log_count'))
+        call_command('backfill_stats_rollups', stdout=StringIO())
+        call_command('backfill_quest_progress', stdout=StringIO())
+        call_command('backfill_seen_history', stdout=StringIO())
+        self.assertEqual(
+            {(r.year, r.month): r.as_dict() for r in UserStatsRollup.objects.filter(story_lover=self.story_lover)},
+            {key: rollup for key, rollup in rollups.items() if rollup['total_films']},
+        )
+        self.assertEqual(QuestProgress.objects.get(story_lover=self.story_lover).as_dict(), quests)
+        self.assertEqual(
+            sorted(SeenFilm.objects.filter(story_lover=self.story_lover).values_list('film_id', 'log_count')), seen
+        )
+        self.assertEqual(
+            sorted(SeenDirector.objects.filter(story_lover=self.story_lover).values_list('director', 'log_count')),
+            directors,
+        )
+        self.assertEqual(Film.rebuild_log_stats(), 0)
+
+    def test_film_catalog_edit_rekeys_derived_data(self):
+        """Test that changing a logged film's director, genre or year moves its logs' derived data"""
+        songs = self.log(self.songs)
+        first = self.log(self.past_lives)
+        same_director = self.log(self.materialists)
+
+        film = Film.objects.get(pk=self.past_lives.pk)
+        film.director = 'Roy Andersson'
+        film.genre = 'Comedy'
+        film.year = 1999
+        film.save()
+        self.assertEqual(self.flags(first), (False, False))
+        self.assertEqual(self.flags(same_director), (True, False))
+        self.assertDerivedDataConsistent()
+
+        songs.delete()
+        self.assertEqual(self.flags(first), (True, False))
+        first.delete()
+        self.assertFalse(SeenDirector.objects.filter(director='Roy Andersson').exists())
+        all_time = UserStatsRollup.objects.get(story_lover=self.story_lover, year=0, month=0)
+        self.assertEqual(list(all_time.directors), ['Celine Song'])
+        self.assertTrue(self.log(self.songs).is_new_director)
+        self.assertDerivedDataConsistent()
+
+    def test_delete_passes_flags_to_the_next_log(self):
+        """Test that deleting a first watch or new-director log flags the next one instead"""
+        first = self.log(self.past_lives)
+        rewatch = self.log(self.past_lives, rating=6)
+        same_director = self.log(self.materialists)
+        self.log(self.songs)
+        self.assertEqual(self.flags(rewatch), (False, True))
+        self.assertEqual(self.flags(same_director), (False, False))
+
+        response = self.client.delete(f'/api/filmlogs/{first.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flags(rewatch), (True, False))
+        self.assertEqual(self.flags(same_director), (False, False))
+        self.assertDerivedDataConsistent()
+
+        rewatch.delete()
+        self.assertEqual(self.flags(same_director), (True, False))
+        self.assertDerivedDataConsistent()
+
+    def test_delete_cost_is_independent_of_history(self):
+        """Test that a delete reads only the affected film and director, not the whole diary"""
+        def queries_for_delete(history):
+            FilmLog.objects.all().delete()
+            for i in range(history):
+                self.log(Film.objects.create(title=f'Film {i}', director=f'Director {i}', year=2000 + i))
+            first = self.log(self.past_lives)
+            self.log(self.past_lives)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.delete(f'/api/filmlogs/{first.id}/')
+            # The director's logs are found by film id through the
+            # (story_lover, film) index, not by joining every log to its film
+            self.assertFalse([
+                q for q in queries.captured_queries
+                if 'FROM "storylovers_filmlog"' in q['sql'] and '"storylovers_film"."director" =' in q['sql']
+            ])
+            return len(queries)
+
+        self.assertEqual(queries_for_delete(2), queries_for_delete(20))
+
+    def test_put_edits_rating_date_and_film(self):
+        """Test that editing a log moves its stats and re-derives flags around a film change"""
+        first = self.log(self.past_lives)
+        rewatch = self.log(self.past_lives)
+
+        response = self.client.put(
+            f'/api/filmlogs/{first.id}/',
+            json.dumps({'rating': 5, 'watched_at': '2024-03-01T20:00:00Z', 'review': 'Better the second time'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rating'], 5)
+        self.past_lives.refresh_from_db()
+        self.assertEqual(self.past_lives.avg_rating, 6.5)
+        self.assertTrue(UserStatsRollup.objects.filter(story_lover=self.story_lover, year=2024, month=3).exists())
+        self.assertDerivedDataConsistent()
+
+        response = self.client.put(
+            f'/api/filmlogs/{first.id}/', json.dumps({'film_id': self.songs.id}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flags(first), (True, False))
+        self.assertEqual(self.flags(rewatch), (True, False))
+        self.assertEqual(SeenFilm.objects.get(story_lover=self.story_lover, film=self.past_lives).log_count, 1)
+        self.assertDerivedDataConsistent()
+
+        bad = self.client.put(f'/api/filmlogs/{first.id}/', json.dumps({'rating': 11}), content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+        other = User.objects.create_user(username='other', password='testpass123')
+        StoryLover.objects.create(user=other, display_name='Other')
+        self.client.force_login(other)
+        self.assertEqual(self.client.delete(f'/api/filmlogs/{first.id}/').status_code, 404)
+
+    def test_methods_without_an_id_are_not_allowed(self):
+        """Test that PUT and DELETE on the collection and POST on an item return 405"""
+        log = self.log(self.past_lives)
+        for response in (
+            self.client.put('/api/filmlogs/', json.dumps({'rating': 5}), content_type='application/json'),
+            self.client.delete('/api/filmlogs/'),
+        ):
+            self.assertEqual(response.status_code, 405)
+            self.assertEqual(response['Allow'], 'GET, POST')
+        response = self.client.post(f'/api/filmlogs/{log.id}/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(FilmLog.objects.get(pk=log.pk).rating, 8)
+
+    async def test_async_put_and_delete(self):
+        """Test that the async diary view edits and deletes through the same path"""
+        first = await sync_to_async(self.log)(self.past_lives)
+        rewatch = await sync_to_async(self.log)(self.past_lives)
+        factory = AsyncRequestFactory()
+
+        request = factory.put(
+            f'/api/filmlogs/{first.id}/', json.dumps({'rating': 10}), content_type='application/json',
+        )
+        request.user = self.user
+        request.auser = AsyncMock(return_value=self.user)
+        request._dont_enforce_csrf_checks = True
+        response = await AsyncFilmLogView.as_view()(request, film_log_id=first.id)
+        self.assertEqual(response.status_code, 200)
+
+        request = factory.delete(f'/api/filmlogs/{first.id}/')
+        request.user = self.user
+        request.auser = AsyncMock(return_value=self.user)
+        request._dont_enforce_csrf_checks = True
+        response = await AsyncFilmLogView.as_view()(request, film_log_id=first.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await sync_to_async(self.flags)(rewatch), (True, False))
+        await sync_to_async(self.assertDerivedDataConsistent)()
@@ -0,0 +1,76 @@
+"""
+Trending films.
+
+FilmLog writes keep TrendingBucket's per-film hourly log counts current.
+``compute_trending``, run periodically by the ``compute_trending``
+command, sums the last week of buckets with an exponential decay (a log
+counts half as much every ``HALF_LIFE``) and replaces the TrendingFilm
+ranking with the top ``TRENDING_SIZE`` films. ``top_films`` serves that
+ranking from Django's cache, so the Discover page is one cache read, or
+one indexed query after a recompute, however many logs there are.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TrendingBucket, TrendingFilm
+from .search import serialize_film
+
+
+CACHE_KEY = 'trending:top'
+CACHE_TIMEOUT = getattr(settings, 'TRENDING_CACHE_TIMEOUT', 15 * 60)
+HALF_LIFE = timedelta(hours=36)
+TRENDING_SIZE = 100
+WINDOW = timedelta(days=7)
+
+
+def decayed_scores(now):
+    """``{film_id: (score, logs this week)}`` from the buckets of the last WINDOW."""
+    scores = defaultdict(lambda: [0.0, 0])
+    buckets = TrendingBucket.objects.filter(
+        hour__gt=now - WINDOW, hour__lte=now, log_count__gt=0,
+    ).values_list('film_id', 'hour', 'log_count').order_by()
+    for film_id, hour, log_count in buckets.iterator(chunk_size=5000):
+        totals = scores[film_id]
+        totals[0] += log_count * 0.5 ** ((now - hour) / HALF_LIFE)
+        totals[1] += log_count
+    return {film_id: tuple(totals) for film_id, totals in scores.items()}
+
+
+def compute_trending(now=None, size=TRENDING_SIZE):
+    """Rebuild the TrendingFilm ranking and prune expired buckets; returns the ranked count."""
+    now = now or timezone.now()
+    scores = decayed_scores(now)
+    ranking = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))[:size]
+    rows = [
+        TrendingFilm(film_id=film_id, rank=rank, score=score, week_count=week_count, computed_at=now)
+        for rank, (film_id, (score, week_count)) in enumerate(ranking, start=1)
+    ]
+    with transaction.atomic():
+        TrendingFilm.objects.all().delete()
+        TrendingFilm.objects.bulk_create(rows)
+        TrendingBucket.objects.filter(hour__lt=now - TrendingBucket.RETENTION).delete()
+    cache.delete(CACHE_KEY)
+    return len(rows)
+
+
+def serialize_trending(trending):
+    return {
+        **serialize_film(trending.film),
+        'rank': trending.rank,
+        'score': round(trending.score, 2),
+        'week_count': trending.week_count,
+    }
+
+
+def top_films(limit=TRENDING_SIZE):
+    """The first ``limit`` trending films, from the cache when it is warm."""
+    films = cache.get(CACHE_KEY)
+    if films is None:
+        films = [serialize_trending(trending) for trending in TrendingFilm.objects.select_related('film')]
+        cache.set(CACHE_KEY, films, CACHE_TIMEOUT)
+    return films[:limit]
@@ -2,39 +2,163 @@ import logging
 import json
 from django.shortcuts import render
 from django.views import View
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import get_random_string
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.contrib.auth.decorators import login_required
+from cinevous.metrics import JsonResponse
 from django.views.decorators.csrf import csrf_protect
-from .models import FilmLog, StoryLover, Film
+from . import imports
+from .drafts import PickRejected, StaleDraft, make_pick, serialize_pick, start_draft
+from .models import (
+    Draft, FantasyFilm, FilmLog, StoryLover, Film, FilmList, FilmListEntry, ImportJob, LeaderboardEntry, League,
+    LeagueMember, LeaguePick, QuestProgress, Rubric, RubricCategory, RubricRating, UserStatsRollup,
+)
+from .pagination import InvalidCursor, keyset_page, parse_limit
+from .recommendations import recommend
+from .search import serialize_film
+from .search_cache import cached_search_films, etag_for, get_generation, normalize_query
+from .trending import TRENDING_SIZE, top_films
+
+
+EXPORT_CHUNK_SIZE = 500
+BATCH_LIMIT = 1000
+LEAGUE_CODE_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+MAX_IMPORT_SIZE = 20 * 1024 * 1024
+SEARCH_LIMIT = 10
+SEARCH_MAX_AGE = 60
+TRENDING_MAX_AGE = 5 * 60
+DRAFT_POLL_TIMEOUT = 25
+
+
+def method_not_allowed(request, allowed):
+    """
+    A 405 for a method this URL does not take, such as a DELETE on a
+    collection or a POST on one of its items; views serving both URLs
+    call it when the id is missing or unexpected.
+    """
+    response = JsonResponse({'error': f'{request.method} is not allowed here.'}, status=405)
+    response['Allow'] = ', '.join(allowed)
+    return response
+
+
+def serialize_film_log(log):
+    return {
+        'id': log.id,
+        'title': log.film.title,
+        'rating': log.rating,
+        'review': log.review,
+        'mood': log.mood,
+        'watched_at': log.watched_at,
+        'country': log.film.country,
+        'director': log.film.director,
+        'year': log.film.year,
+        'weighted_score': log.weighted_score,
+    }
+
+
+def serialize_rubric(rubric):
+    categories = rubric.categories.all()
+    return {
+        'id': rubric.id,
+        'name': rubric.name,
+        'description': rubric.description,
+        'is_default': rubric.is_default,
+        'total_weight': rubric.total_weight,
+        'is_valid': rubric.is_valid,
+        'categories': [
+            {'id': category.id, 'name': category.name, 'weight': category.weight, 'order': category.order}
+            for category in categories
+        ],
+    }
+
+
+def serialize_film_list(film_list):
+    return {
+        'id': film_list.id,
+        'title': film_list.title,
+        'description': film_list.description,
+        'film_count': getattr(film_list, 'film_count', None),
+        'created_at': film_list.created_at,
+    }
+
+
+def serialize_list_entry(entry):
+    return {
+        'id': entry.id,
+        'position': entry.position,
+        'note': entry.note,
+        'added_at': entry.added_at,
+        'film': serialize_film(entry.film),
+    }
+
+
+def serialize_league(league):
+    return {
+        'id': league.id,
+        'name': league.name,
+        'code': league.code,
+        'season': league.season,
+        'current_phase': league.current_phase,
+        'draft_complete': league.draft_complete,
+        'member_count': getattr(league, 'member_count', None),
+    }
+
+
+def parse_film_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 @method_decorator([login_required, csrf_protect], name='dispatch')
 class FilmLogView(View):
-    def get(self, request):
+    def get(self, request, film_log_id=None):
         if request.method == 'GET':
-            story_lover = StoryLover.objects.get(id=request.user.story_lover.id)
+            story_lover = request.user.story_lover
             if not story_lover:
                 logging.error("StoryLover not found for user ID: %s", request.user.id)
                 return JsonResponse({'error': 'User not found.'}, status=404)
             
-            film_logs = FilmLog.objects.filter(story_lover=story_lover).select_related('film').order_by('-watched_at')
-            logs_data = []
-            for log in film_logs:
-                logs_data.append({
-                    'id': log.id,
-                    'title': log.film.title,
-                    'rating': log.rating,
-                    'review': log.review,
-                    'mood': log.mood,
-                    'watched_at': log.watched_at,
-                    'country': log.film.country,
-                    'director': log.film.director,
-                    'year': log.film.year,
-                })
-            return JsonResponse({'film_logs': logs_data}, status=200)
+            film_logs = FilmLog.objects.filter(story_lover=story_lover).select_related('film').with_weighted_score()
+            if film_log_id is not None:
+                log = film_logs.filter(id=film_log_id).first()
+                if log is None:
+                    return JsonResponse({'error': 'Film log not found.'}, status=404)
+                return JsonResponse(serialize_film_log(log), status=200)
+
+            # Full export: stream one JSON object per line instead of
+            # materializing the whole diary in memory.
+            if request.GET.get('format') == 'ndjson':
+                rows = film_logs.order_by('-watched_at', '-id').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+                response = StreamingHttpResponse(
+                    (json.dumps(serialize_film_log(log), cls=DjangoJSONEncoder) + '\n' for log in rows),
+                    content_type='application/x-ndjson',
+                )
+                response['Content-Disposition'] = 'attachment; filename="film_logs.ndjson"'
+                return response
+
+            try:
+                limit = parse_limit(request.GET.get('limit'))
+                page, next_cursor = keyset_page(film_logs, 'watched_at', request.GET.get('cursor'), limit)
+            except (InvalidCursor, ValidationError, ValueError) as e:
+                logging.error("Invalid film log pagination parameters: %s", e)
+                return JsonResponse({'error': 'Invalid pagination parameters.'}, status=400)
+
+            logs_data = [serialize_film_log(log) for log in page]
+            return JsonResponse({'film_logs': logs_data, 'next_cursor': next_cursor}, status=200)
     
-    def post(self, request):
+    def post(self, request, film_log_id=None):
+        if film_log_id is not None:
+            return method_not_allowed(request, ['GET', 'PUT', 'DELETE'])
         if request.method == 'POST':
             story_lover = StoryLover.objects.get(id=request.user.story_lover.id)
             if not story_lover:
@@ -42,6 +166,8 @@ class FilmLogView(View):
                 return JsonResponse({'error': 'User not found.'}, status=404)
             
             data = json.loads(request.body)
+            if isinstance(data, dict) and 'entries' in data:
+                return self.post_batch(story_lover, data['entries'])
 
             try:
                 film_id = data['film_id']
@@ -76,13 +202,123 @@ class FilmLogView(View):
             )
             return JsonResponse({'status': 'success', 'id': new_film_log.id, 'watched_at': new_film_log.watched_at}, status=201)
     
-    def put(self, request):
-        # Example PUT handler if needed
-        return JsonResponse({'status': 'PUT not implemented'}, status=501)  
-    
-    def delete(self, request):
-        # Example DELETE handler if needed
-        return JsonResponse({'status': 'DELETE not implemented'}, status=501)   
+    def post_batch(self, story_lover, entries):
+        """
+        Create many logs from ``{"entries": [...]}``. Valid entries are saved
+        together; invalid ones are reported by index and skipped.
+        """
+        if not isinstance(entries, list) or not entries:
+            return JsonResponse({'error': 'Entries must be a non-empty list.'}, status=400)
+        if len(entries) > BATCH_LIMIT:
+            return JsonResponse({'error': f'At most {BATCH_LIMIT} entries per batch.'}, status=400)
+
+        film_ids = [parse_film_id(entry.get('film_id')) for entry in entries if isinstance(entry, dict)]
+        films = Film.objects.in_bulk({film_id for film_id in film_ids if film_id is not None})
+
+        valid, indexes, errors = [], [], []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict) or 'film_id' not in entry or 'rating' not in entry:
+                errors.append({'index': index, 'error': 'Missing data.'})
+                continue
+            film = films.get(parse_film_id(entry['film_id']))
+            if film is None:
+                errors.append({'index': index, 'error': 'Film not found.'})
+                continue
+            try:
+                rating = int(entry['rating'])
+                if rating < 1 or rating > 10:
+                    raise ValueError("Rating out of bounds")
+            except (ValueError, TypeError):
+                errors.append({'index': index, 'error': 'Invalid rating value.'})
+                continue
+            valid.append({
+                'film': film,
+                'rating': rating,
+                'review': entry.get('review', ''),
+                'mood': entry.get('mood', ''),
+            })
+            indexes.append(index)
+
+        if not valid:
+            return JsonResponse({'status': 'error', 'created': [], 'errors': errors}, status=400)
+
+        logs = FilmLog.objects.create_batch(story_lover, valid)
+        created = [
+            {'index': index, 'id': log.id, 'watched_at': log.watched_at}
+            for index, log in zip(indexes, logs)
+        ]
+        return JsonResponse({'status': 'success', 'created': created, 'errors': errors}, status=201)
+
+    def put(self, request, film_log_id=None):
+        if film_log_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        return self.update_log(request.user, film_log_id, request.body)
+
+    def delete(self, request, film_log_id=None):
+        if film_log_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        return self.delete_log(request.user, film_log_id)
+
+    def update_log(self, user, film_log_id, body):
+        """
+        Apply any of ``{"film_id", "rating", "review", "mood", "watched_at"}``
+        to one of ``user``'s logs. FilmLog.save moves the derived data and
+        fixes the flags of the logs affected by a film change.
+        """
+        try:
+            log = FilmLog.objects.select_related('film', 'story_lover').get(
+                id=film_log_id, story_lover__user=user
+            )
+        except FilmLog.DoesNotExist:
+            return JsonResponse({'error': 'Film log not found.'}, status=404)
+        try:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise TypeError("Expected an object")
+        except (ValueError, TypeError) as e:
+            logging.error("Invalid film log update: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+
+        if 'film_id' in data:
+            try:
+                log.film = Film.objects.get(id=parse_film_id(data['film_id']))
+            except Film.DoesNotExist:
+                logging.error("Film not found with ID: %s", data['film_id'])
+                return JsonResponse({'error': 'Film not found.'}, status=404)
+        if 'rating' in data:
+            try:
+                log.rating = None if data['rating'] is None else int(data['rating'])
+                if log.rating is not None and not 1 <= log.rating <= 10:
+                    raise ValueError("Rating out of bounds")
+            except (ValueError, TypeError) as e:
+                logging.error(f"Invalid rating value: {data['rating']}. Error: {e}")
+                return JsonResponse({'error': 'Invalid rating value.'}, status=400)
+        if 'watched_at' in data:
+            watched_at = parse_datetime(str(data['watched_at']))
+            if watched_at is None:
+                return JsonResponse({'error': 'Invalid watched_at.'}, status=400)
+            if timezone.is_naive(watched_at):
+                watched_at = timezone.make_aware(watched_at)
+            log.watched_at = watched_at
+        log.review = data.get('review', log.review)
+        log.mood = data.get('mood', log.mood)
+        try:
+            log.clean_fields(exclude=['story_lover', 'film'])
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=400)
+
+        log.save()
+        return JsonResponse(serialize_film_log(log), status=200)
+
+    def delete_log(self, user, film_log_id):
+        try:
+            log = FilmLog.objects.select_related('film').get(id=film_log_id, story_lover__user=user)
+        except FilmLog.DoesNotExist:
+            return JsonResponse({'error': 'Film log not found.'}, status=404)
+        # The post_delete receiver updates the derived data in the same transaction
+        log.delete()
+        return JsonResponse({'status': 'success'}, status=200)
+
 
 @method_decorator([login_required, csrf_protect], name='dispatch')
 class FilmView(View):
@@ -95,22 +331,507 @@ class FilmView(View):
             if len(q) < 2:
                 return JsonResponse([], safe=False, status=200)
             
+            key = normalize_query(q)
+            generation = get_generation()
             try:
-                # Search films by title, limit to 10 results
-                films = Film.objects.filter(title__icontains=q)[:10]
+                # Ranked prefix search over title, director, country and genre
+                response_data = cached_search_films(key, generation, limit=SEARCH_LIMIT)
             except Exception as e:
                 logging.error("Error searching films: %s", e)
                 return JsonResponse({'error': 'Error searching films.'}, status=500)
-            
-            response_data = []
-            for film in films:
-                response_data.append({
-                    'id': film.id,
-                    'title': film.title,
-                    'director': film.director,
-                    'country': film.country,
-                    'year': film.year,
-                    'genre': film.genre,
-                    'decade': film.decade,
-                })
-            return JsonResponse({'films': response_data}, status=200)
+            etag = etag_for(generation, key, SEARCH_LIMIT, response_data)
+            if request.headers.get('If-None-Match') == etag:
+                response = HttpResponseNotModified()
+            else:
+                response = JsonResponse({'films': response_data}, status=200)
+
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, max_age=SEARCH_MAX_AGE)
+            return response
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class TrendingView(View):
+    def get(self, request):
+        try:
+            limit = parse_limit(request.GET.get('limit'), default=20, maximum=TRENDING_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid limit.'}, status=400)
+        response = JsonResponse({'films': top_films(limit)}, status=200)
+        patch_cache_control(response, private=True, max_age=TRENDING_MAX_AGE)
+        return response
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class RecommendationView(View):
+    def get(self, request):
+        try:
+            limit = parse_limit(request.GET.get('limit'), default=10, maximum=50)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid limit.'}, status=400)
+        return JsonResponse({'films': recommend(request.user.story_lover, limit)}, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class StatsView(View):
+    def get(self, request):
+        story_lover = request.user.story_lover
+        try:
+            year = int(request.GET.get('year') or timezone.now().year)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid year.'}, status=400)
+
+        # All-time, whole-year and monthly rollups come back in one query.
+        rollups = UserStatsRollup.objects.filter(
+            story_lover=story_lover, year__in=[UserStatsRollup.WHOLE_PERIOD, year]
+        )
+        empty = UserStatsRollup(story_lover=story_lover)
+        all_time = year_total = empty
+        months = {}
+        for rollup in rollups:
+            if rollup.year == UserStatsRollup.WHOLE_PERIOD:
+                all_time = rollup
+            elif rollup.month == UserStatsRollup.WHOLE_PERIOD:
+                year_total = rollup
+            else:
+                months[rollup.month] = rollup
+
+        return JsonResponse({
+            'year': year,
+            'all_time': all_time.as_dict(),
+            'year_totals': year_total.as_dict(),
+            'months': [
+                months.get(month, UserStatsRollup(story_lover=story_lover, year=year, month=month)).as_dict()
+                for month in range(1, 13)
+            ],
+        }, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class QuestView(View):
+    def get(self, request):
+        story_lover = request.user.story_lover
+        progress = QuestProgress.objects.filter(story_lover=story_lover).first()
+        if progress is None:
+            progress = QuestProgress(story_lover=story_lover)
+        return JsonResponse(progress.as_dict(), status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class ImportJobView(View):
+    def get(self, request, job_id):
+        try:
+            job = ImportJob.objects.get(id=job_id, story_lover=request.user.story_lover)
+        except ImportJob.DoesNotExist:
+            return JsonResponse({'error': 'Import not found.'}, status=404)
+        return JsonResponse(job.as_dict(), status=200)
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return JsonResponse({'error': 'Missing file.'}, status=400)
+        if upload.size > MAX_IMPORT_SIZE:
+            return JsonResponse({'error': 'File too large.'}, status=400)
+
+        job = ImportJob.objects.create(story_lover=request.user.story_lover, file=upload)
+        transaction.on_commit(lambda: imports.submit(job))
+        return JsonResponse(job.as_dict(), status=202)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class RubricView(View):
+    def get(self, request, rubric_id=None):
+        # One query for the rubrics and one for all of their categories
+        rubrics = Rubric.objects.filter(story_lover__user=request.user).prefetch_related('categories')
+        if rubric_id is not None:
+            rubrics = rubrics.filter(id=rubric_id)
+        return JsonResponse({'rubrics': [serialize_rubric(rubric) for rubric in rubrics]}, status=200)
+
+    def post(self, request, rubric_id=None):
+        if rubric_id is not None:
+            return method_not_allowed(request, ['GET', 'PUT', 'DELETE'])
+        rubric = Rubric(story_lover=request.user.story_lover)
+        return self.save_rubric(request, rubric, status=201)
+
+    def put(self, request, rubric_id=None):
+        if rubric_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        try:
+            rubric = Rubric.objects.get(id=rubric_id, story_lover__user=request.user)
+        except Rubric.DoesNotExist:
+            return JsonResponse({'error': 'Rubric not found.'}, status=404)
+        return self.save_rubric(request, rubric, status=200)
+
+    def delete(self, request, rubric_id=None):
+        if rubric_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        deleted, _ = Rubric.objects.filter(id=rubric_id, story_lover__user=request.user).delete()
+        if not deleted:
+            return JsonResponse({'error': 'Rubric not found.'}, status=404)
+        return JsonResponse({'status': 'success'}, status=200)
+
+    def save_rubric(self, request, rubric, status):
+        """Apply ``{"name", "description", "is_default", "categories": [...]}`` to ``rubric``."""
+        try:
+            data = json.loads(request.body)
+            rubric.name = data['name']
+            rubric.description = data.get('description', '')
+            rubric.is_default = bool(data.get('is_default', False))
+            categories = data['categories']
+            if not isinstance(categories, list) or not all(isinstance(c, dict) for c in categories):
+                raise TypeError("categories must be a list of objects")
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Invalid rubric data: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+
+        try:
+            rubric.save_with_categories(categories)
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=400)
+        except IntegrityError as e:
+            logging.error("Rubric save conflict: %s", e)
+            return JsonResponse({'error': 'A rubric or category with that name already exists.'}, status=400)
+        return JsonResponse(serialize_rubric(rubric), status=status)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class RubricRatingView(View):
+    def post(self, request, film_log_id):
+        """
+        Rate a log against a rubric: ``{"rubric_id": 1, "ratings": [{"category_id": 2,
+        "rating": 8}, ...]}``. Returns the resulting weighted score.
+        """
+        try:
+            data = json.loads(request.body)
+            rubric_id = int(data['rubric_id'])
+            ratings = {int(item['category_id']): item['rating'] for item in data['ratings']}
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Invalid rubric rating data: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        if not ratings:
+            return JsonResponse({'error': 'Ratings must be a non-empty list.'}, status=400)
+
+        try:
+            film_log = FilmLog.objects.get(id=film_log_id, story_lover__user=request.user)
+        except FilmLog.DoesNotExist:
+            return JsonResponse({'error': 'Film log not found.'}, status=404)
+
+        categories = RubricCategory.objects.filter(
+            rubric_id=rubric_id, rubric__story_lover__user=request.user, id__in=ratings,
+        ).in_bulk()
+        unknown = sorted(set(ratings) - set(categories))
+        if unknown:
+            return JsonResponse({'error': f'Unknown categories: {unknown}.'}, status=400)
+
+        try:
+            scores = RubricRating.record_many(
+                film_log, [(categories[category_id], rating) for category_id, rating in ratings.items()]
+            )
+        except ValidationError as e:
+            logging.error("Invalid rubric rating: %s", e)
+            return JsonResponse({'error': 'Invalid rating value.'}, status=400)
+
+        score = next((score.score for score in scores if score.rubric_id == rubric_id), None)
+        return JsonResponse({
+            'film_log_id': film_log.id,
+            'rubric_id': rubric_id,
+            'weighted_score': score,
+        }, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class FilmListView(View):
+    def get(self, request, list_id=None):
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            if list_id is None:
+                film_lists = FilmList.objects.filter(story_lover__user=request.user).annotate(film_count=Count('entries'))
+                page, next_cursor = keyset_page(film_lists, 'created_at', request.GET.get('cursor'), limit)
+                return JsonResponse({
+                    'lists': [serialize_film_list(film_list) for film_list in page],
+                    'next_cursor': next_cursor,
+                }, status=200)
+
+            try:
+                film_list = FilmList.objects.get(id=list_id, story_lover__user=request.user)
+            except FilmList.DoesNotExist:
+                return JsonResponse({'error': 'List not found.'}, status=404)
+            # One query per page of entries, film card data included
+            entries = FilmListEntry.objects.filter(film_list=film_list).select_related('film')
+            page, next_cursor = keyset_page(
+                entries, 'position', request.GET.get('cursor'), limit, parse=int, descending=False,
+            )
+        except (InvalidCursor, ValueError) as e:
+            logging.error("Invalid film list pagination parameters: %s", e)
+            return JsonResponse({'error': 'Invalid pagination parameters.'}, status=400)
+
+        return JsonResponse({
+            **serialize_film_list(film_list),
+            'entries': [serialize_list_entry(entry) for entry in page],
+            'next_cursor': next_cursor,
+        }, status=200)
+
+    def post(self, request, list_id=None):
+        if list_id is not None:
+            return method_not_allowed(request, ['GET', 'PUT', 'DELETE'])
+        try:
+            data = json.loads(request.body)
+            film_list = self.clean_list(FilmList(
+                story_lover=request.user.story_lover, title=data['title'], description=data.get('description', ''),
+            ), ['title', 'description'])
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Missing data in film list creation: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=400)
+        film_list.save()
+        return JsonResponse(serialize_film_list(film_list), status=201)
+
+    @staticmethod
+    def clean_list(film_list, fields):
+        """Check the client-supplied ``fields`` of ``film_list``; non-strings raise TypeError."""
+        for key in fields:
+            if not isinstance(getattr(film_list, key), str):
+                raise TypeError(f"{key} must be a string")
+        film_list.clean_fields(exclude=[f.name for f in FilmList._meta.fields if f.name not in fields])
+        return film_list
+
+    def put(self, request, list_id=None):
+        if list_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        try:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise TypeError("Expected an object")
+            fields = [key for key in ('title', 'description') if key in data]
+            film_list = self.clean_list(FilmList(**{key: data[key] for key in fields}), fields)
+        except (ValueError, TypeError) as e:
+            logging.error("Invalid film list update: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=400)
+        fields = {key: getattr(film_list, key) for key in fields}
+        updated = FilmList.objects.filter(id=list_id, story_lover__user=request.user).update(
+            updated_at=timezone.now(), **fields
+        )
+        if not updated:
+            return JsonResponse({'error': 'List not found.'}, status=404)
+        return JsonResponse({'status': 'success'}, status=200)
+
+    def delete(self, request, list_id=None):
+        if list_id is None:
+            return method_not_allowed(request, ['GET', 'POST'])
+        deleted, _ = FilmList.objects.filter(id=list_id, story_lover__user=request.user).delete()
+        if not deleted:
+            return JsonResponse({'error': 'List not found.'}, status=404)
+        return JsonResponse({'status': 'success'}, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class FilmListEntryView(View):
+    """
+    Add, move and remove films in a list. ``after`` is the id of the entry
+    to place the film after, or null for the start; leaving it out of an
+    add appends the film.
+    """
+
+    def get_after(self, film_list, data, exclude=None):
+        after_id = data['after']
+        if after_id is None:
+            return None
+        if after_id == exclude:
+            raise FilmListEntry.DoesNotExist("Cannot place an entry after itself")
+        return film_list.entries.get(id=after_id)
+
+    def post(self, request, list_id, entry_id=None):
+        if entry_id is not None:
+            return method_not_allowed(request, ['PATCH', 'DELETE'])
+        try:
+            film_list = FilmList.objects.get(id=list_id, story_lover__user=request.user)
+        except FilmList.DoesNotExist:
+            return JsonResponse({'error': 'List not found.'}, status=404)
+        try:
+            data = json.loads(request.body)
+            film = Film.objects.get(id=parse_film_id(data['film_id']))
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Missing data in list entry creation: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except Film.DoesNotExist:
+            return JsonResponse({'error': 'Film not found.'}, status=404)
+
+        try:
+            with transaction.atomic():
+                if 'after' in data:
+                    position = film_list.position_after(self.get_after(film_list, data))
+                else:
+                    position = film_list.end_position()
+                entry = FilmListEntry.objects.create(
+                    film_list=film_list, film=film, position=position, note=data.get('note', ''),
+                )
+        except (ValueError, TypeError) as e:
+            logging.error("Invalid position in list entry creation: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except FilmListEntry.DoesNotExist:
+            return JsonResponse({'error': 'Entry not found.'}, status=400)
+        except IntegrityError:
+            return JsonResponse({'error': 'Film is already in this list.'}, status=400)
+        return JsonResponse(serialize_list_entry(entry), status=201)
+
+    def patch(self, request, list_id, entry_id=None):
+        if entry_id is None:
+            return method_not_allowed(request, ['POST'])
+        try:
+            entry = FilmListEntry.objects.select_related('film_list', 'film').get(
+                id=entry_id, film_list_id=list_id, film_list__story_lover__user=request.user,
+            )
+        except FilmListEntry.DoesNotExist:
+            return JsonResponse({'error': 'Entry not found.'}, status=404)
+        try:
+            data = json.loads(request.body)
+            with transaction.atomic():
+                after = self.get_after(entry.film_list, data, exclude=entry.id)
+                entry.position = entry.film_list.position_after(after, exclude=entry.id)
+                if 'note' in data:
+                    entry.note = data['note']
+                entry.save(update_fields=['position', 'note'])
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Missing data in list entry move: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except FilmListEntry.DoesNotExist:
+            return JsonResponse({'error': 'Entry not found.'}, status=400)
+        return JsonResponse(serialize_list_entry(entry), status=200)
+
+    def delete(self, request, list_id, entry_id=None):
+        if entry_id is None:
+            return method_not_allowed(request, ['POST'])
+        deleted, _ = FilmListEntry.objects.filter(
+            id=entry_id, film_list_id=list_id, film_list__story_lover__user=request.user,
+        ).delete()
+        if not deleted:
+            return JsonResponse({'error': 'Entry not found.'}, status=404)
+        return JsonResponse({'status': 'success'}, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class LeagueView(View):
+    def get(self, request):
+        memberships = LeagueMember.objects.filter(story_lover__user=request.user).values('league_id')
+        leagues = League.objects.filter(id__in=memberships).annotate(member_count=Count('members'))
+        return JsonResponse({'leagues': [serialize_league(league) for league in leagues]}, status=200)
+
+    def post(self, request):
+        """Create a league with ``{"name", "season"}``, or join one with ``{"code"}``."""
+        story_lover = request.user.story_lover
+        try:
+            data = json.loads(request.body)
+            if 'code' in data:
+                league = League.objects.get(code=str(data['code']).upper())
+                LeagueMember.objects.get_or_create(league=league, story_lover=story_lover)
+                return JsonResponse(serialize_league(league), status=200)
+            name, season = data['name'], int(data['season'])
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Missing data in league creation: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+        except League.DoesNotExist:
+            return JsonResponse({'error': 'League not found.'}, status=404)
+
+        with transaction.atomic():
+            league = League.objects.create(
+                name=name, season=season, owner=story_lover,
+                code=get_random_string(6, allowed_chars=LEAGUE_CODE_CHARS),
+            )
+            LeagueMember.objects.create(league=league, story_lover=story_lover)
+        return JsonResponse(serialize_league(league), status=201)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class LeaderboardView(View):
+    def get(self, request, league_id):
+        try:
+            league = League.objects.get(id=league_id, members__story_lover__user=request.user)
+        except League.DoesNotExist:
+            return JsonResponse({'error': 'League not found.'}, status=404)
+        phase = request.GET.get('phase') or league.current_phase
+        if phase == League.COMPLETE:
+            phase = League.PHASES[-1]
+        if phase not in League.PHASES:
+            return JsonResponse({'error': 'Invalid phase.'}, status=400)
+
+        # A range scan of the stored snapshot, written by score_leagues
+        entries = LeaderboardEntry.objects.filter(league=league, phase=phase).select_related('member__story_lover')
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+            page, next_cursor = keyset_page(
+                entries, 'rank', request.GET.get('cursor'), limit, parse=int, descending=False,
+            )
+        except (InvalidCursor, ValueError) as e:
+            logging.error("Invalid leaderboard pagination parameters: %s", e)
+            return JsonResponse({'error': 'Invalid pagination parameters.'}, status=400)
+        return JsonResponse({
+            'league': serialize_league(league),
+            'phase': phase,
+            'standings': [entry.as_dict() for entry in page],
+            'next_cursor': next_cursor,
+        }, status=200)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class DraftView(View):
+    def get(self, request, league_id):
+        try:
+            draft = Draft.objects.get(league_id=league_id, league__members__story_lover__user=request.user)
+        except Draft.DoesNotExist:
+            return JsonResponse({'error': 'Draft not found.'}, status=404)
+        picks = LeaguePick.objects.filter(league_id=league_id).select_related('fantasy_film')
+        return JsonResponse({**draft.as_dict(), 'picks': [serialize_pick(pick) for pick in picks]}, status=200)
+
+    def post(self, request, league_id):
+        """The league owner opens the draft with ``{"rounds": 5}``."""
+        try:
+            league = League.objects.get(id=league_id, owner__user=request.user)
+        except League.DoesNotExist:
+            return JsonResponse({'error': 'League not found.'}, status=404)
+        try:
+            data = json.loads(request.body or '{}')
+            rounds = int(data.get('rounds', 5))
+            if rounds < 1:
+                raise ValueError("Rounds must be positive")
+            draft = start_draft(league, rounds=rounds)
+        except (ValueError, TypeError) as e:
+            logging.error("Could not start draft: %s", e)
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse(draft.as_dict(), status=201)
+
+
+@method_decorator([login_required, csrf_protect], name='dispatch')
+class DraftPickView(View):
+    def post(self, request, league_id):
+        """
+        Pick ``{"fantasy_film_id": 1, "version": 7}``. ``version`` is optional;
+        with it, a pick made against a stale view of the draft gets a 409.
+        """
+        try:
+            data = json.loads(request.body)
+            fantasy_film_id = int(data['fantasy_film_id'])
+            version = int(data['version']) if data.get('version') is not None else None
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error("Missing data in draft pick: %s", e)
+            return JsonResponse({'error': 'Missing data.'}, status=400)
+
+        try:
+            member = LeagueMember.objects.get(league_id=league_id, story_lover__user=request.user)
+            draft = Draft.objects.select_related('league').get(league_id=league_id)
+            fantasy_film = FantasyFilm.objects.get(id=fantasy_film_id)
+        except (LeagueMember.DoesNotExist, Draft.DoesNotExist):
+            return JsonResponse({'error': 'Draft not found.'}, status=404)
+        except FantasyFilm.DoesNotExist:
+            return JsonResponse({'error': 'Film not found.'}, status=404)
+
+        try:
+            pick = make_pick(draft, member, fantasy_film, expected_version=version)
+        except StaleDraft as e:
+            draft.refresh_from_db()
+            return JsonResponse({'error': str(e), 'draft': draft.as_dict()}, status=409)
+        except PickRejected as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse({'pick': serialize_pick(pick), 'draft': draft.as_dict()}, status=201)